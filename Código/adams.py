@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+
+# Tarea numérica - Ecuaciones Diferenciales Ordinarias
+
+# Nombre: Diego Alonso Sánchez Manríquez
+# RUT: 19.957.060-9
+
+# Módulo con el método multipaso predictor-corrector de Adams-
+# Bashforth-Moulton. No ejecuta nada al ser importado.
+
+#Librerías importadas
+import numpy as np #usada para resolver vectorialmente
+from integradores import campo #lado derecho del sistema con arreglos
+from runge_kutta import _cantidad_sistemas #sistemas integrados a la vez
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función _paso_RK4()
+
+  Motivación
+  - Dar los primeros pasos de Adams-Bashforth-Moulton, que necesita
+    las derivadas de los tres pasos anteriores para comenzar.
+
+  Parámetros
+  - y (array): estados (a,m,s) de forma (3,n)
+  - h (float): paso de tiempo
+  - cte (dict): diccionario con constantes usadas (como arreglos)
+  - derivadas (function): lado derecho, campo() o el de una red
+
+  Funcionamiento
+  - Se entrega el estado un paso después con el método de
+    Runge-Kutta 4 clásico (etapas acopladas).
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _paso_RK4(y,h,cte,derivadas=campo):
+
+    k1 = derivadas(y,cte)
+    k2 = derivadas(y+h/2*k1,cte)
+    k3 = derivadas(y+h/2*k2,cte)
+    k4 = derivadas(y+h*k3,cte)
+
+    return y + h/6*(k1+2*k2+2*k3+k4)
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función _predecir_corregir()
+
+  Motivación
+  - Dar un paso de Adams-Bashforth-Moulton de orden 4 a partir de
+    las derivadas guardadas.
+
+  Parámetros
+  - y (array): estado actual, de forma (3,n)
+  - h (float): paso de tiempo
+  - f0,f1,f2,f3 (array): derivadas en el paso actual y en los tres
+    anteriores
+  - cte (dict): diccionario con constantes usadas (como arreglos)
+  - derivadas (function): lado derecho, campo() o el de una red
+
+  Funcionamiento
+  - Predictor (Adams-Bashforth, 4 pasos):
+    y* = y + h/24*(55*f0 - 59*f1 + 37*f2 - 9*f3)
+  - Corrector (Adams-Moulton, 3 pasos):
+    y' = y + h/24*(9*f(y*) + 19*f0 - 5*f1 + f2)
+  - Se entregan el predicho, el corregido y f(y*).
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _predecir_corregir(y,h,f0,f1,f2,f3,cte,derivadas=campo):
+
+    prediccion = y + h/24*(55*f0 - 59*f1 + 37*f2 - 9*f3)
+    fp = derivadas(prediccion,cte)
+    correccion = y + h/24*(9*fp + 19*f0 - 5*f1 + f2)
+
+    return prediccion,correccion,fp
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función adams_bashforth_moulton()
+
+  Motivación
+  - Tener otro método de orden 4 que, a diferencia de Runge-Kutta 4,
+    evalúa el lado derecho solo una o dos veces por paso, reusando
+    las derivadas de los pasos anteriores.
+
+  Parámetros
+  - T (int): extremo superior del intervalo a analizar
+  - dt (float): paso de tiempo (el inicial si variable=True)
+  - cte (dict): diccionario con constantes usadas. Igual que en
+    runge_kutta(), pueden ser arreglos para integrar varios sistemas
+  - modo (str): 'PECE' (dos evaluaciones por paso, la derivada se
+    evalúa en el valor corregido) o 'PEC' (una evaluación, se reusa
+    la derivada del valor predicho)
+  - variable (bool): si es True, se ajusta el paso según el error
+  - tol (float): error tolerado por paso si variable=True
+  - red (Red): red compilada de redes.py, para integrar otro modelo
+    en lugar del de tres fases (opcional)
+
+  Funcionamiento
+  - Los tres primeros pasos se dan con Runge-Kutta 4. Luego cada
+    paso usa _predecir_corregir() con las derivadas guardadas en un
+    arreglo circular de 4 posiciones (la nueva reemplaza a la más
+    antigua), por lo que no se guarda más historia que esa.
+  - Con variable=True el error de cada paso se estima con Milne,
+    19/270*|y'-y*|. Si supera tol o no es finito (por ejemplo, nan
+    por una base negativa en m**alpha), se rechaza el paso, se
+    divide el paso por 2 y se vuelve a partir con Runge-Kutta 4. Lo
+    mismo ocurre si un paso de la partida no es finito. Si durante
+    10 pasos seguidos es menor que tol/50, el paso se duplica del
+    mismo modo. Los tiempos entregados no son equiespaciados, y el
+    último es exactamente T.
+  - Si el paso queda menor que dt*PASO_MINIMO, se lanza
+    FloatingPointError.
+  - Se entregan cuatro arreglos (t,a,m,s) como en runge_kutta().
+  - Con "red", igual que en runge_kutta(), se usan red.campo() y
+    red.iniciales() y se entrega el tiempo seguido de un arreglo por
+    especie, en el orden de red.especies.
+
+  Consideración
+  - Como la función entrega cuatro arreglos, se deben "recibir" con
+    una asignación múltiple de la forma t,a,m,s=adams_bashforth_moulton().
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def adams_bashforth_moulton(T,dt,cte,modo='PECE',variable=False,tol=1e-8,\
+                            red=None):
+
+    #Condiciones de los parámetros
+    assert type(T)==int
+    assert type(dt)==float
+    assert type(cte)==dict
+    assert modo in ('PECE','PEC')
+    assert tol>0
+
+    #Cantidad de sistemas
+    n = _cantidad_sistemas(cte)
+    ancho = 1 if n is None else n
+
+    #Lado derecho y cantidad de variables
+    derivadas = campo if red is None else red.campo
+    v = 3 if red is None else len(red.especies)
+
+    #Constantes como arreglos
+    cte = {x:np.asarray(y,dtype=float) for x,y in cte.items()}
+
+    #Condiciones iniciales
+    y = np.empty((v,ancho))
+    if red is None:
+        y[0] = cte['a0']; y[1] = cte['m0']; y[2] = 1-cte['a0']-cte['m0']
+    else:
+        for j,x in enumerate(red.iniciales(cte)):
+            y[j] = x
+
+    #Arreglo circular con las derivadas de los últimos 4 pasos
+    historia = np.empty((4,v,ancho))
+
+    if variable:
+        t,sol = _adams_variable(T,dt,y,historia,cte,modo,tol,derivadas)
+    else:
+        t,sol = _adams_fijo(T,dt,y,historia,cte,modo,derivadas)
+
+    #Se entregan las soluciones al sistema de EDO's
+    if n is None:
+        return (t,)+tuple(sol[:,j,0] for j in range(v))
+    return (t,)+tuple(sol[:,j] for j in range(v))
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ funciones _adams_fijo() _adams_variable()
+
+  Motivación
+  - Ciclos de adams_bashforth_moulton() con paso fijo y variable.
+
+  Parámetros
+  - T (int): extremo superior del intervalo a analizar
+  - dt (float): paso de tiempo
+  - y (array): condición inicial, de forma (3,n)
+  - historia (array): arreglo circular de forma (4,3,n)
+  - cte (dict): diccionario con constantes usadas (como arreglos)
+  - modo (str): 'PECE' o 'PEC'
+  - tol (float): error tolerado por paso
+  - derivadas (function): lado derecho, campo() o el de una red
+
+  Funcionamiento
+  - Se entregan los tiempos y un arreglo de forma (len(t),3,n) con
+    los estados (o con una fila por especie, con una red).
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+#Fracción de dt bajo la cual _adams_variable() deja de dividir el paso
+PASO_MINIMO = 2.0**-30
+
+def _adams_fijo(T,dt,y,historia,cte,modo,derivadas=campo):
+
+    #Cantidad de puntos
+    N = int(T/dt)
+
+    #Arreglo reservado para la solución
+    sol = np.empty((N+1,)+y.shape)
+    sol[0] = y
+    historia[0] = derivadas(y,cte)
+
+    #Arranque con Runge-Kutta 4
+    for i in range(min(3,N)):
+        y = _paso_RK4(y,dt,cte,derivadas)
+        sol[i+1] = y
+        historia[(i+1)%4] = derivadas(y,cte)
+
+    #Se aplica Adams-Bashforth-Moulton guardando los valores
+    for i in range(3,N):
+
+        _,y,fp = _predecir_corregir(y,dt,historia[i%4],historia[(i-1)%4],\
+                                    historia[(i-2)%4],historia[(i-3)%4],cte,\
+                                    derivadas)
+        sol[i+1] = y
+
+        #La nueva derivada reemplaza a la más antigua
+        historia[(i+1)%4] = derivadas(y,cte) if modo=='PECE' else fp
+
+    return np.arange(N+1)*dt,sol
+
+def _adams_variable(T,dt,y,historia,cte,modo,tol,derivadas=campo):
+
+    t = 0.0; h = dt
+    tiempos = [t]; estados = [y]
+
+    #Pasos guardados en la historia desde la última partida
+    guardados = 0
+    holgura = 0
+
+    while t<T:
+
+        #Paso demasiado pequeño
+        if h<dt*PASO_MINIMO:
+            raise FloatingPointError('paso menor que %g en t=%g' % (dt*PASO_MINIMO,t))
+
+        #El último paso llega justo a T, con Runge-Kutta 4
+        if t+h>=T-1e-12*T:
+            y = _paso_RK4(y,T-t,cte,derivadas)
+            t = float(T)
+            tiempos += [t]; estados += [y]
+            break
+
+        #Partida (o nueva partida) con Runge-Kutta 4
+        if guardados<4:
+            if guardados==0:
+                historia[0] = derivadas(y,cte)
+                guardados = 1
+            nuevo = _paso_RK4(y,h,cte,derivadas)
+            if not np.isfinite(nuevo).all():
+                h = h/2
+                guardados = 0
+                continue
+            y = nuevo
+            t = t + h
+            historia[guardados%4] = derivadas(y,cte)
+            guardados += 1
+            tiempos += [t]; estados += [y]
+            continue
+
+        #Paso predictor-corrector y su error
+        i = guardados-1
+        prediccion,correccion,fp = _predecir_corregir(y,h,historia[i%4],\
+                                   historia[(i-1)%4],historia[(i-2)%4],\
+                                   historia[(i-3)%4],cte,derivadas)
+        error = 19/270*np.max(np.abs(correccion-prediccion))
+
+        #Paso rechazado (o con nan), se vuelve a partir con la mitad
+        if not np.isfinite(error) or error>tol:
+            h = h/2
+            guardados = 0; holgura = 0
+            continue
+
+        #Paso aceptado
+        y = correccion
+        t = t + h
+        historia[guardados%4] = derivadas(y,cte) if modo=='PECE' else fp
+        guardados += 1
+        tiempos += [t]; estados += [y]
+
+        #Si el error es muy pequeño por varios pasos, se duplica el paso
+        holgura = holgura+1 if error<tol/50 else 0
+        if holgura>=10:
+            h = 2*h
+            guardados = 0; holgura = 0
+
+    return np.array(tiempos),np.array(estados)
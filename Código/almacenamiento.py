@@ -0,0 +1,418 @@
+# -*- coding: utf-8 -*-
+
+# Tarea numérica - Ecuaciones Diferenciales Ordinarias
+
+# Nombre: Diego Alonso Sánchez Manríquez
+# RUT: 19.957.060-9
+
+# Módulo con las formas de guardar en disco las soluciones de los
+# integradores y de volver a cargarlas. No ejecuta nada al ser
+# importado.
+
+#Librerías importadas
+import collections #usada para el historial de periodos
+import json #usada para guardar los datos de cada corrida
+import os #usada para crear carpetas y rutas
+import numpy as np #usada para los arreglos en disco
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función _escribir_cabecera()
+
+  Motivación
+  - Escribir (o reescribir) la cabecera de un archivo .npy de una
+    dimensión con n valores float64.
+
+  Parámetros
+  - archivo (file): archivo abierto en modo binario
+  - n (int): cantidad de valores guardados
+
+  Funcionamiento
+  - Se entrega el largo de la cabecera. numpy deja espacio para que
+    la forma crezca sin cambiar ese largo, por lo que se puede
+    reescribir sobre la anterior al agregar valores.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _escribir_cabecera(archivo,n):
+
+    archivo.seek(0)
+    np.lib.format.write_array_header_1_0(archivo,{'descr':'<f8',\
+                                         'fortran_order':False,'shape':(n,)})
+    return archivo.tell()
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ clase SalidaMemmap
+
+  Motivación
+  - Guardar las trayectorias (t,a,m,s) directamente en disco, para
+    que intervalos largos con dt pequeño no llenen la memoria.
+
+  Parámetros
+  - carpeta (str): carpeta donde se guardan t.npy, a.npy, m.npy, s.npy
+  - bloque (int): cantidad de pasos que se acumulan antes de escribir
+  - continuar (int): si se entrega, se reabre la carpeta conservando
+    solo los primeros "continuar" valores (usado por reanudar())
+
+  Funcionamiento
+  - agregar() guarda un punto y agregar_bloque() varios. Los valores
+    se acumulan en un bloque de tamaño fijo y se escriben al final de
+    cada archivo cuando se llena, por lo que la memoria usada no
+    depende del largo de la integración.
+  - vistas() entrega cuatro arreglos respaldados por los archivos
+    (np.memmap), que se leen solo en la parte que se usa.
+
+  Consideración
+  - Los archivos son .npy comunes, por lo que también se pueden
+    abrir después con np.load(ruta,mmap_mode='r').
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+class SalidaMemmap:
+
+    nombres = ('t','a','m','s')
+
+    def __init__(self,carpeta,bloque=65536,continuar=None):
+
+        #Condiciones de los parámetros
+        assert type(carpeta)==str
+        assert type(bloque)==int and bloque>0
+        assert continuar is None or (type(continuar)==int and continuar>0)
+
+        self.carpeta = carpeta
+        self.bloque = bloque
+        self.rutas = [os.path.join(carpeta,x+'.npy') for x in self.nombres]
+
+        #Bloque en memoria y cantidad de valores ya escritos
+        self._buffer = np.empty((4,bloque))
+        self._n = 0
+        self._guardados = 0
+
+        os.makedirs(carpeta,exist_ok=True)
+
+        #Archivos nuevos, sin valores
+        if continuar is None:
+            for ruta in self.rutas:
+                with open(ruta,'wb') as archivo:
+                    self._inicio = _escribir_cabecera(archivo,0)
+            self._ultimo = None
+            return
+
+        #Se recortan los archivos existentes a "continuar" valores
+        for ruta in self.rutas:
+            with open(ruta,'r+b') as archivo:
+                self._inicio = _escribir_cabecera(archivo,continuar)
+                archivo.truncate(self._inicio+8*continuar)
+        self._guardados = continuar
+        self._ultimo = tuple(float(np.load(r,mmap_mode='r')[-1]) for r in self.rutas)
+
+    @property
+    def largo(self):
+        return self._guardados + self._n
+
+    def ultimo(self):
+        return self._ultimo
+
+    def agregar(self,t,a,m,s):
+
+        #Se guarda el punto en el bloque
+        self._buffer[:,self._n] = (t,a,m,s)
+        self._ultimo = (t,a,m,s)
+        self._n += 1
+
+        #Bloque lleno
+        if self._n==self.bloque:
+            self.vaciar()
+
+    def agregar_bloque(self,t,a,m,s):
+
+        #Se vacía lo pendiente para escribir el bloque en orden
+        self.vaciar()
+        self._escribir(np.vstack((t,a,m,s)))
+        self._ultimo = (float(t[-1]),float(a[-1]),float(m[-1]),float(s[-1]))
+
+    def vaciar(self):
+
+        if self._n>0:
+            self._escribir(self._buffer[:,:self._n])
+            self._n = 0
+
+    def _escribir(self,valores):
+
+        n = self._guardados + valores.shape[1]
+
+        #Se agregan los valores al final y se actualiza la cabecera
+        for ruta,fila in zip(self.rutas,valores):
+            with open(ruta,'r+b') as archivo:
+                archivo.seek(0,os.SEEK_END)
+                archivo.write(np.ascontiguousarray(fila,dtype='<f8').tobytes())
+                assert _escribir_cabecera(archivo,n)==self._inicio
+
+        self._guardados = n
+
+    def vistas(self):
+
+        #Se escribe lo pendiente y se abren los archivos
+        self.vaciar()
+        return tuple(np.load(ruta,mmap_mode='r') for ruta in self.rutas)
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ clase SalidaAnillo
+
+  Motivación
+  - Encontrar el periodo límite sin guardar la trayectoria completa,
+    pues solo se necesitan los últimos ciclos. La memoria usada no
+    depende de T, por lo que sirve para corridas muy largas.
+
+  Parámetros
+  - largo (int): cantidad de estados recientes que se conservan
+  - umbral (float): fracción de la bajada desde el último máximo que
+    s debe volver a subir para contar un nuevo máximo
+  - historia (int): cantidad de periodos que se conservan en el
+    historial
+
+  Funcionamiento
+  - Se usa como "salida" de los integradores, igual que
+    SalidaMemmap. Los estados se escriben en un anillo de "largo"
+    posiciones, sobrescribiendo los más antiguos, y vistas() entrega
+    los últimos (t,a,m,s) en orden.
+  - En cada agregar() se revisa si el punto anterior es un máximo
+    local de s. Su tiempo se ubica con la parábola por sus vecinos,
+    como en periodo(refinar='parabola'). Para no contar jorobas
+    pequeñas, un máximo cuenta solo si s subió desde el mínimo del
+    ciclo al menos "umbral" veces lo que bajó desde el máximo
+    anterior.
+  - Con cada máximo que cuenta se termina un ciclo: se guarda su
+    periodo en el historial y el mínimo y el máximo de a, m y s en
+    él, y se reinician.
+  - resumen() entrega un diccionario con 'periodo' (el último, nan si
+    aún no hay dos máximos), 'historial' (periodos de los últimos
+    ciclos, para ver si convergió), 'maximo' ((t,s) del último
+    máximo) y 'extremos' (para 'a', 'm' y 's', (mínimo, máximo) en
+    el último ciclo completo).
+
+  Consideración
+  - Con puntos de control, el anillo se guarda completo en el punto
+    y reanudar() sigue desde una copia.
+  - Si el anillo guarda al menos dos máximos, 'periodo' es el mismo
+    que periodo(refinar='parabola') sobre los valores de vistas().
+    Sobre la trayectoria completa puede no serlo, pues periodo() deja
+    los máximos cercanos al mayor, que puede estar en el transiente.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+class SalidaAnillo:
+
+    carpeta = None
+
+    def __init__(self,largo=4096,umbral=0.5,historia=1000):
+
+        #Condiciones de los parámetros
+        assert type(largo)==int and largo>2
+        assert 0<umbral<=1
+        assert type(historia)==int and historia>0
+
+        self.bloque = largo
+        self.umbral = umbral
+
+        #Anillo y cantidad de valores recibidos
+        self._anillo = np.empty((4,largo))
+        self._total = 0
+        self._ultimo = None
+
+        #Seguimiento de los máximos y ciclos
+        self._previos = []
+        self._pico = None
+        self._ciclo = None
+        self.historial = collections.deque(maxlen=historia)
+        self.extremos = None
+
+    @property
+    def largo(self):
+        return self._total
+
+    def ultimo(self):
+        return self._ultimo
+
+    def agregar(self,t,a,m,s):
+
+        #Se guarda el punto sobre el más antiguo
+        self._anillo[:,self._total%self.bloque] = (t,a,m,s)
+        self._ultimo = (t,a,m,s)
+        self._total += 1
+
+        #Extremos del ciclo actual
+        if self._ciclo is None:
+            self._ciclo = {'a':[a,a],'m':[m,m],'s':[s,s]}
+        else:
+            for nombre,x in (('a',a),('m',m),('s',s)):
+                extremo = self._ciclo[nombre]
+                if x<extremo[0]: extremo[0] = x
+                if x>extremo[1]: extremo[1] = x
+
+        #Máximo local en el punto anterior
+        self._previos = (self._previos+[(t,s)])[-3:]
+        if len(self._previos)==3:
+            (t0,s0),(t1,s1),(t2,s2) = self._previos
+            if s0<s1 and s1>s2:
+                self._maximo(t0,s0,t1,s1,t2,s2)
+
+    def _maximo(self,t0,s0,t1,s1,t2,s2):
+
+        #Jorobas pequeñas
+        minimo = self._ciclo['s'][0]
+        if self._pico is not None and \
+           s1-minimo < self.umbral*(self._pico[1]-minimo):
+            return
+
+        #Vértice de la parábola por los tres puntos
+        d01 = (s1-s0)/(t1-t0); d12 = (s2-s1)/(t2-t1)
+        tp = (t0+t1)/2 - d01*(t2-t0)/(2*(d12-d01))
+
+        #Fin de un ciclo
+        if self._pico is not None:
+            self.historial.append(tp-self._pico[0])
+            self.extremos = {x:tuple(y) for x,y in self._ciclo.items()}
+        self._pico = (tp,s1)
+        self._ciclo = None
+
+    def agregar_bloque(self,t,a,m,s):
+
+        for x in zip(t,a,m,s):
+            self.agregar(*(float(y) for y in x))
+
+    def vaciar(self):
+        pass
+
+    def vistas(self):
+
+        #Últimos valores en orden
+        i = self._total%self.bloque
+        if self._total<=self.bloque:
+            return tuple(self._anillo[:,:self._total].copy())
+        return tuple(np.concatenate((self._anillo[:,i:],self._anillo[:,:i]),axis=1))
+
+    def resumen(self):
+
+        return {'periodo':self.historial[-1] if self.historial else float('nan'),
+                'historial':list(self.historial),'maximo':self._pico,
+                'extremos':self.extremos}
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función submuestra()
+
+  Motivación
+  - Graficar trayectorias muy largas sin leer todos sus valores.
+
+  Parámetros
+  - x (list o array): valores a submuestrear
+  - puntos (int): cantidad aproximada de valores que se quieren
+
+  Funcionamiento
+  - Se entrega x tomando un valor cada len(x)//puntos. Si x es un
+    memmap, el resultado es una vista y no se lee nada hasta usarlo.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def submuestra(x,puntos=100000):
+
+    #Condiciones de los parámetros
+    assert type(puntos)==int and puntos>0
+
+    return x[::max(1,len(x)//puntos)]
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ funciones exportar() importar()
+
+  Motivación
+  - Guardar el resultado de una integración junto a los datos con
+    que se obtuvo, para volver a analizarlo o graficarlo sin
+    integrar de nuevo.
+
+  Parámetros
+  - ruta (str): archivo .npz o carpeta donde se guarda el resultado
+  - t,a,m,s (list o array): solución entregada por un integrador
+  - cte (dict): diccionario con constantes usadas
+  - metodo (str): método usado ('EP', 'RK4', 'RKF', ...)
+  - dt (float): paso de tiempo usado
+  - T (int): extremo superior del intervalo
+  - periodo (float): periodo límite encontrado (opcional)
+
+  Funcionamiento
+  - Si la ruta termina en .npz, se guarda un único archivo
+    comprimido donde cada variable es una columna aparte, y los
+    datos de la corrida van como texto JSON en la columna 'meta'.
+  - En otro caso se guarda una carpeta con t.npy, a.npy, m.npy,
+    s.npy y meta.json (la misma forma que usa SalidaMemmap). Al
+    importarla, las variables se abren como np.memmap, sin copiar
+    nada a memoria.
+  - importar() entrega (t,a,m,s) y un diccionario con los datos.
+
+  Consideraciones
+  - Si t,a,m,s ya son las vistas de una SalidaMemmap en la misma
+    carpeta, solo se escribe meta.json.
+  - Los datos se pasan a tipos de Python antes de escribir el JSON,
+    por lo que las constantes pueden ser escalares de numpy (por
+    ejemplo np.float32) o arreglos, como los de runge_kutta(). Al
+    importar, los arreglos vuelven como listas.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def exportar(ruta,t,a,m,s,cte,metodo,dt,T,periodo=None):
+
+    #Condiciones de los parámetros
+    assert type(ruta)==str
+    assert type(cte)==dict
+    assert type(metodo)==str
+    assert len(t)==len(a)==len(m)==len(s)
+
+    #Datos de la corrida
+    meta = {'cte':{x:np.asarray(y).tolist() for x,y in cte.items()},
+            'metodo':metodo,'dt':np.asarray(dt).tolist(),
+            'T':np.asarray(T).tolist(),'periodo':np.asarray(periodo).tolist(),
+            'largo':len(t)}
+
+    #Archivo comprimido
+    if ruta.endswith('.npz'):
+        np.savez_compressed(ruta,meta=np.array(json.dumps(meta)),\
+                            **{x:np.asarray(y,dtype=float) for x,y in \
+                               zip(SalidaMemmap.nombres,(t,a,m,s))})
+        return
+
+    #Carpeta con un .npy por variable
+    os.makedirs(ruta,exist_ok=True)
+    for x,y in zip(SalidaMemmap.nombres,(t,a,m,s)):
+        destino = os.path.join(ruta,x+'.npy')
+        if isinstance(y,np.memmap) and y.filename is not None and \
+           os.path.abspath(y.filename)==os.path.abspath(destino):
+            continue
+        np.save(destino,np.asarray(y,dtype=float))
+
+    with open(os.path.join(ruta,'meta.json'),'w') as archivo:
+        json.dump(meta,archivo)
+
+def importar(ruta):
+
+    #Condiciones de los parámetros
+    assert type(ruta)==str
+
+    #Archivo comprimido
+    if ruta.endswith('.npz'):
+        with np.load(ruta) as datos:
+            meta = json.loads(str(datos['meta']))
+            return tuple(datos[x] for x in SalidaMemmap.nombres),meta
+
+    #Carpeta, se abren las variables sin cargarlas
+    with open(os.path.join(ruta,'meta.json')) as archivo:
+        meta = json.load(archivo)
+    return tuple(np.load(os.path.join(ruta,x+'.npy'),mmap_mode='r') \
+                 for x in SalidaMemmap.nombres),meta
@@ -0,0 +1,501 @@
+# -*- coding: utf-8 -*-
+
+# Tarea numérica - Ecuaciones Diferenciales Ordinarias
+
+# Nombre: Diego Alonso Sánchez Manríquez
+# RUT: 19.957.060-9
+
+# Módulo con las funciones para analizar las soluciones entregadas
+# por los integradores. No ejecuta nada al ser importado.
+
+#Librerías importadas
+import numpy as np #usada para recorrer las soluciones por bloques
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función periodo()
+
+  Motivación
+  - Encontrar el periodo límite de un sistema que tiende a tener un
+    equilibrio periódico, es decir, que tiende a ser periódica.
+
+  Parámetros
+  - t (list o array): valores tomados por el tiempo
+  - s (list o array): valores de s(t) en función del tiempo
+  - bloque (int): cantidad de valores que se leen a la vez
+  - refinar (str): 'parabola' o 'hermite' para ubicar cada máximo
+    entre los tiempos de la malla (opcional)
+  - ds (list o array): valores de ds/dt, usados por 'hermite'
+    (opcional, por ejemplo campo(np.vstack((a,m,s)),cte)[2])
+  - ciclos (int): cantidad de periodos que se promedian
+  - registro (dict): recibe 'picos' (tiempos de los máximos usados),
+    'ciclos' (periodos promediados) y 'error' (error estimado del
+    promedio) (opcional)
+
+  Funcionamiento
+  - Al llamar la función, se entrega el último periodo encontrado.
+    Esto considerando la hipótesis del enunciado, es decir, que el
+    sistema tiende a un equilibrio periódico).
+  - Sin refinar, cada máximo es un tiempo de la malla, por lo que el
+    periodo tiene un error del orden de dt. Con 'parabola' el máximo
+    es el vértice de la parábola por el punto y sus dos vecinos; con
+    'hermite' es el cero de la derivada del polinomio cúbico de
+    Hermite entre el punto y el vecino donde ds/dt cambia de signo
+    (si no se entrega ds, se estima con diferencias). En ambos casos
+    el error baja a un orden de dt**2 o menos.
+  - Con ciclos=k se entrega el promedio de los últimos k periodos,
+    (p[-1]-p[-1-k])/k, y registro['error'] es la desviación estándar
+    de esos periodos dividida por raíz de k (nan si k=1). Si hay
+    menos de k+1 máximos se promedian los que hay, y
+    registro['ciclos'] dice cuántos periodos se usaron.
+
+  Consideración
+  - Se buscan los mismos máximos locales que en los scripts, pero
+    recorriendo s por bloques, por lo que también sirve para las
+    vistas de SalidaMemmap sin cargarlas completas en memoria.
+  - Con los valores por omisión el resultado es el mismo de antes.
+  - Solo cuentan los máximos cercanos al mayor de todo s. Si el
+    transiente tiene un máximo más alto que los del ciclo límite
+    (por ejemplo con alpha=1.9), solo quedan ese máximo y el
+    siguiente: se entrega el primer periodo, con registro['ciclos']=1
+    y registro['error']=nan aunque se pidan más ciclos. En ese caso
+    se deben entregar t y s desde después del transiente.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def periodo(t,s,bloque=1048576,refinar=None,ds=None,ciclos=1,registro=None):
+
+    #Condiciones de los parámetros
+    assert len(t)==len(s)
+    assert type(bloque)==int and bloque>0
+    assert refinar in (None,'parabola','hermite')
+    assert ds is None or len(ds)==len(s)
+    assert type(ciclos)==int and ciclos>0
+
+    n = len(s)
+
+    #Máximo global, leído por bloques
+    maximo = max(np.max(s[i:i+bloque]) for i in range(0,n,bloque))
+
+    maximosLocales=[]
+
+    #Busca los máximos locales en el intervalo estudiado
+    for inicio in range(0,n-1,bloque):
+
+        fin = min(inicio+bloque,n-1)
+
+        #Valores del bloque y sus vecinos (s[-1] antecede a s[0])
+        centro = np.asarray(s[inicio:fin],dtype=float)
+        sig = np.asarray(s[inicio+1:fin+1],dtype=float)
+        if inicio==0:
+            ant = np.concatenate(([s[n-1]],np.asarray(s[0:fin-1],dtype=float)))
+        else:
+            ant = np.asarray(s[inicio-1:fin-1],dtype=float)
+
+        #Se encuentra máximo local
+        for k in np.nonzero((ant<centro)&(centro>sig))[0]:
+            if round(abs(maximo-centro[k]),1)==0:
+                maximosLocales+=[(t[inicio+k],centro[k],inicio+k)] # Se agrega
+
+    #Entrega el último intervalo suponiendo la hipótesis entregada
+    if refinar is None and ciclos==1 and registro is None:
+        return maximosLocales[-1][0]-maximosLocales[-2][0]
+
+    #Tiempos de los máximos usados, refinados si se pidió
+    usados = maximosLocales[-1-min(ciclos,len(maximosLocales)-1):]
+    assert len(usados)>=2
+    picos = [_refinar_maximo(t,s,i,refinar,ds) if refinar is not None \
+             else x for x,_,i in usados]
+    periodos = np.diff(picos)
+
+    if registro is not None:
+        registro['picos'] = picos
+        registro['ciclos'] = len(periodos)
+        registro['error'] = float(np.std(periodos,ddof=1)/np.sqrt(len(periodos))) \
+                            if len(periodos)>1 else float('nan')
+
+    return (picos[-1]-picos[0])/len(periodos)
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función _refinar_maximo()
+
+  Motivación
+  - Ubicar un máximo de s(t) entre los tiempos de la malla.
+
+  Parámetros
+  - t,s (list o array): tiempos y valores de s(t)
+  - i (int): índice del máximo local en la malla
+  - refinar (str): 'parabola' o 'hermite'
+  - ds (list o array): valores de ds/dt (o None)
+
+  Funcionamiento
+  - Se entrega el tiempo del máximo refinado. En los extremos de la
+    malla se entrega t[i] sin refinar.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _refinar_maximo(t,s,i,refinar,ds):
+
+    if i==0 or i==len(s)-1:
+        return float(t[i])
+
+    t0,t1,t2 = (float(x) for x in t[i-1:i+2])
+    s0,s1,s2 = (float(x) for x in s[i-1:i+2])
+
+    #Vértice de la parábola por los tres puntos
+    if refinar=='parabola':
+        d01 = (s1-s0)/(t1-t0); d12 = (s2-s1)/(t2-t1)
+        curvatura = (d12-d01)/(t2-t0)
+        if curvatura>=0:
+            return t1
+        return (t0+t1)/2 - d01/(2*curvatura)
+
+    #Pendientes (de ds o por diferencias)
+    if ds is not None:
+        d0,d1,d2 = (float(x) for x in ds[i-1:i+2])
+    else:
+        d1 = ((s2-s1)/(t2-t1)*(t1-t0)+(s1-s0)/(t1-t0)*(t2-t1))/(t2-t0)
+        d0 = (s1-s0)/(t1-t0); d2 = (s2-s1)/(t2-t1)
+
+    #Intervalo donde la pendiente pasa de positiva a negativa
+    if d1>0:
+        ta,tb,ya,yb,da,db = t1,t2,s1,s2,d1,d2
+    else:
+        ta,tb,ya,yb,da,db = t0,t1,s0,s1,d0,d1
+    h = tb-ta
+
+    #Derivada del cúbico de Hermite: A*x**2 + B*x + C, x en [0,1]
+    A = 6*ya + 3*h*da - 6*yb + 3*h*db
+    B = -6*ya - 4*h*da + 6*yb - 2*h*db
+    C = h*da
+    if abs(A)<1e-14*(abs(B)+abs(C)):
+        raices = [-C/B] if B!=0 else []
+    else:
+        D = B**2-4*A*C
+        raices = [] if D<0 else [(-B+r)/(2*A) for r in (np.sqrt(D),-np.sqrt(D))]
+    raices = [x for x in raices if 0<=x<=1]
+
+    return ta+h*min(raices) if raices else t1
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función periodo_conjunto()
+
+  Motivación
+  - Encontrar el periodo límite y la amplitud de muchos sistemas
+    integrados a la vez (por ejemplo con runge_kutta()), sin recorrer
+    cada columna con periodo().
+
+  Parámetros
+  - t (array): valores tomados por el tiempo, de largo N+1
+  - s (array): valores de s(t) de n sistemas, de forma (N+1,n)
+
+  Funcionamiento
+  - Los máximos locales se buscan en todas las columnas a la vez y
+    se filtran como en periodo(), dejando los cercanos al máximo
+    global de cada columna. Se entregan dos arreglos de largo n:
+    el último periodo (diferencia entre los dos últimos máximos) y
+    la amplitud de s en ese periodo (máximo menos mínimo).
+  - Las columnas con menos de dos máximos, o con valores nan, tienen
+    periodo y amplitud nan.
+
+  Consideración
+  - A diferencia de periodo(), no se consideran máximos en el primer
+    ni en el último valor.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def periodo_conjunto(t,s):
+
+    t = np.asarray(t,dtype=float)
+    s = np.asarray(s,dtype=float)
+
+    #Condiciones de los parámetros
+    assert s.ndim==2 and len(t)==len(s)
+
+    #Máximos locales cercanos al máximo global de cada columna
+    maximo = np.max(s,axis=0)
+    centro = s[1:-1]
+    picos = (s[:-2]<centro)&(centro>s[2:])&\
+            (np.round(np.abs(maximo-centro),1)==0)
+
+    #Últimos dos máximos de cada columna
+    filas = len(centro)
+    ultimo = filas-np.argmax(picos[::-1],axis=0)
+    hay = picos.any(axis=0)
+    picos[ultimo[hay]-1,np.nonzero(hay)[0]] = False
+    penultimo = filas-np.argmax(picos[::-1],axis=0)
+    hay = hay & picos.any(axis=0)
+
+    #Periodos y amplitudes (los índices ya corresponden a t y s)
+    periodos = np.where(hay,t[ultimo]-t[penultimo],np.nan)
+    indices = np.arange(len(s))[:,None]
+    dentro = (indices>=penultimo)&(indices<=ultimo)
+    amplitudes = np.max(np.where(dentro,s,-np.inf),axis=0) - \
+                 np.min(np.where(dentro,s,np.inf),axis=0)
+    amplitudes[~hay] = np.nan
+
+    return periodos,amplitudes
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función periodo_espectral()
+
+  Motivación
+  - Tener una forma de calcular el periodo que no dependa de que los
+    máximos del ciclo estén cerca del máximo global, como en
+    periodo(), para los recorridos donde nadie revisa cada caso
+    (ciclos con varias jorobas o un transiente con el máximo más
+    alto).
+
+  Parámetros
+  - t (list o array): valores tomados por el tiempo, con paso fijo
+  - x (list o array): valores de una variable (s(t) u otra), de
+    largo N+1 o de forma (N+1,n) para n sistemas
+  - cola (float): fracción final de los valores que se usa
+  - registro (dict): recibe 'frecuencias', 'espectro' y
+    'autocorrelacion' de la cola (opcional)
+
+  Funcionamiento
+  - Se toma la cola de x, se le resta su promedio y se calcula su
+    transformada de Fourier (con ceros agregados hasta el doble del
+    largo, para que la autocorrelación no sea circular). La
+    frecuencia de mayor potencia da un primer periodo P.
+  - La autocorrelación se obtiene de la misma transformada y en
+    cada desfase se divide por la raíz del producto de las energías
+    de los dos tramos que se comparan. Así vale 1 solo si un tramo
+    es múltiplo positivo del otro, por lo que su máximo queda en el
+    periodo aunque la cola no tenga un número entero de ciclos
+    (dividir solo por la cantidad de términos lo desplaza). Se busca su
+    máximo cerca de P y de sus múltiplos 2P, 3P y 4P (por si la
+    transformada encontró un armónico), se elige el primero cuya
+    autocorrelación es al menos 0.9 veces la mejor, y se ubica entre
+    los desfases de la malla con la parábola por sus vecinos.
+  - Se entregan el periodo y la confianza, que es la autocorrelación
+    normalizada en ese desfase (1 si la cola se repite exactamente,
+    cerca de 0 si no hay oscilación). Si x tiene n columnas, ambos
+    son arreglos de largo n. Si no hay oscilación se entrega nan.
+  - El costo es el de la transformada, del orden de N log N.
+
+  Consideración
+  - La cola debe tener al menos dos periodos, pues solo se buscan
+    desfases menores que la mitad de su largo.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def periodo_espectral(t,x,cola=0.5,registro=None):
+
+    t = np.asarray(t,dtype=float)
+    x = np.asarray(x,dtype=float)
+
+    #Condiciones de los parámetros
+    assert len(t)==len(x) and x.ndim in (1,2)
+    assert 0<cola<=1
+
+    #Cola de la solución, sin su promedio
+    inicio = len(t)-max(int(cola*len(t)),4)
+    dt = (t[-1]-t[inicio])/(len(t)-1-inicio)
+    y = x[inicio:].reshape(len(t)-inicio,-1)
+    y = y-y.mean(axis=0)
+    n = len(y)
+
+    #Espectro y autocorrelación con la misma transformada
+    X = np.fft.rfft(y,n=2*n,axis=0)
+    potencia = np.abs(X)**2
+    r = np.fft.irfft(potencia,axis=0)[:n//2]
+
+    #Energía de los dos tramos que se superponen en cada desfase
+    energia = np.cumsum(y**2,axis=0)
+    desfases = np.arange(n//2)
+    primero = energia[n-1-desfases]
+    segundo = energia[-1]-np.vstack((np.zeros((1,y.shape[1])),energia[:n//2-1]))
+    with np.errstate(invalid='ignore',divide='ignore'):
+        r = r/np.sqrt(primero*segundo)
+
+    if registro is not None:
+        registro['frecuencias'] = np.fft.rfftfreq(2*n,dt)
+        registro['espectro'] = potencia.reshape((len(X),)+x.shape[1:])
+        registro['autocorrelacion'] = r.reshape((len(r),)+x.shape[1:])
+
+    periodos = np.full(y.shape[1],np.nan)
+    confianzas = np.full(y.shape[1],np.nan)
+    for j in range(y.shape[1]):
+        if not np.isfinite(r[:,j]).all():
+            continue
+
+        #Primer periodo (en desfases) desde la transformada
+        k = 1+np.argmax(potencia[1:,j])
+        desfase = 2*n/k
+
+        #Máximo de la autocorrelación cerca del periodo y sus múltiplos
+        candidatos = []
+        for multiplo in (1,2,3,4):
+            centro = multiplo*desfase
+            a = max(int(0.75*centro),1); b = min(int(1.25*centro)+1,len(r)-1)
+            if a>=b:
+                break
+            i = a+np.argmax(r[a:b,j])
+            candidatos += [(i,r[i,j])]
+        if not candidatos:
+            continue
+        mejor = max(c for i,c in candidatos)
+        i,c = next((i,c) for i,c in candidatos if c>=0.9*mejor)
+
+        #Vértice de la parábola por los desfases vecinos
+        r0,r1,r2 = r[i-1,j],r[i,j],r[i+1,j]
+        curvatura = r0-2*r1+r2
+        delta = 0.5*(r0-r2)/curvatura if curvatura<0 else 0.0
+        periodos[j] = (i+delta)*dt
+        confianzas[j] = min(max(c,0.0),1.0)
+
+    if x.ndim==1:
+        return float(periodos[0]),float(confianzas[0])
+    return periodos,confianzas
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función _extrapolar()
+
+  Motivación
+  - Aplicar la extrapolación de Richardson a una cantidad calculada
+    con pasos dt, dt/2 y dt/4.
+
+  Parámetros
+  - q1,q2,q4 (float o array): cantidad con dt, dt/2 y dt/4
+
+  Funcionamiento
+  - Se entrega un diccionario con:
+    'valores': (q1,q2,q4)
+    'orden': orden observado p=log2(|q1-q2|/|q2-q4|)
+    'confiable': si p es finito y positivo
+    'error': error estimado de q4, |q4-q2|/(2**p-1)
+    'extrapolado': q4+(q4-q2)/(2**p-1)
+  - Si las diferencias son nulas el orden es nan, y si no decrecen
+    (p<=0, por ejemplo con d12==d24, donde 2**p-1 es 0) el orden no
+    es confiable. En ambos casos no se extrapola: 'extrapolado' es
+    q4 y 'error' es |q4-q2|.
+  - Si la cantidad es un arreglo, se usan las normas máximas de las
+    diferencias para el orden, y el resto se calcula por componente.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _extrapolar(q1,q2,q4):
+
+    q1 = np.asarray(q1,dtype=float)
+    q2 = np.asarray(q2,dtype=float)
+    q4 = np.asarray(q4,dtype=float)
+
+    #Diferencias entre pasos sucesivos
+    d12 = np.max(np.abs(q1-q2))
+    d24 = np.max(np.abs(q2-q4))
+
+    #Sin diferencias no hay orden que estimar
+    p = np.nan if d12==0 or d24==0 else np.log2(d12/d24)
+
+    #Solo se extrapola si las diferencias decrecen
+    confiable = bool(np.isfinite(p) and p>0)
+    factor = 2**p-1 if confiable else 1.0
+    extrapolado = q4+(q4-q2)/factor if confiable else q4
+
+    #Las cantidades escalares se entregan como float
+    def _valor(x):
+        return float(x) if np.ndim(x)==0 else x
+
+    return {'valores':tuple(_valor(x) for x in (q1,q2,q4)),'orden':float(p),\
+            'confiable':confiable,'error':_valor(np.abs(q4-q2)/factor),\
+            'extrapolado':_valor(extrapolado)}
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función richardson()
+
+  Motivación
+  - Saber si el periodo y el estado final obtenidos con un paso dt
+    ya convergieron, y obtener un valor más preciso sin tener que
+    usar un paso mucho más pequeño.
+
+  Parámetros
+  - integrador (function): método de paso fijo con la forma de
+    euler_progresivo(T,dt,cte,...)
+  - T (int): extremo superior del intervalo a analizar
+  - dt (float): paso más grande a usar
+  - cte (dict): diccionario con constantes usadas
+  - refinar (str): 'parabola' o 'hermite', igual que en periodo()
+  - ciclos (int): cantidad de periodos que se promedian, igual que
+    en periodo()
+  - **opciones: argumentos adicionales para el integrador (por
+    ejemplo positivo=True)
+
+  Funcionamiento
+  - Se integra con dt, dt/2 y dt/4 y se entrega un diccionario con
+    _extrapolar() aplicado al periodo ('periodo') y al estado (a,m,s)
+    en el último tiempo ('final'), y con 'error' en None.
+  - Si alguna corrida falla (por ejemplo, un valor complejo en
+    dmdt() con el paso más grande), 'periodo' y 'final' son None y
+    'error' tiene el motivo y el paso, igual que en comparar(). Si
+    solo falla periodo(), se entrega igualmente 'final'.
+
+  Consideraciones
+  - El periodo se obtiene con periodo(t,s,refinar=refinar,
+    ciclos=ciclos). Sin refinar, los máximos son tiempos de la malla
+    y el error del periodo tiene un término del orden de dt que
+    oculta el orden del método.
+  - Si por redondeo los tiempos finales no coinciden, el estado
+    final de cada corrida se interpola linealmente al menor de ellos.
+  - runge_kutta4() avanza cada variable por componente (ver
+    paso_estable() en integradores.py) y su orden observado es 1.
+    Con positivo=True o reducido=True usa las etapas acopladas, de
+    orden 4.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def richardson(integrador,T,dt,cte,refinar='parabola',ciclos=5,**opciones):
+
+    #Condiciones de los parámetros
+    assert callable(integrador)
+    assert type(T)==int
+    assert type(dt)==float
+    assert type(cte)==dict
+    assert refinar in ('parabola','hermite')
+
+    resultado = {'periodo':None,'final':None,'error':None}
+
+    #Corridas con dt, dt/2 y dt/4
+    corridas = []
+    for k in (1,2,4):
+        try:
+            corridas += [integrador(T,dt/k,cte,**opciones)]
+        except _FALLAS as e:
+            resultado['error'] = 'dt=%g, %s: %s' % (dt/k,type(e).__name__,e)
+            return resultado
+
+    #Estados finales en un tiempo común
+    tf = min(t[-1] for t,a,m,s in corridas)
+    finales = []
+    for t,a,m,s in corridas:
+        if abs(t[-1]-tf)<1e-9*max(1.0,abs(tf)):
+            finales += [(a[-1],m[-1],s[-1])]
+        else:
+            finales += [tuple(np.interp(tf,t,x) for x in (a,m,s))]
+    resultado['final'] = _extrapolar(*finales)
+
+    #Periodos, con los máximos ubicados entre los tiempos de la malla
+    try:
+        periodos = [periodo(t,s,refinar=refinar,ciclos=ciclos) \
+                    for t,a,m,s in corridas]
+    except _FALLAS as e:
+        resultado['error'] = 'periodo, %s: %s' % (type(e).__name__,e)
+        return resultado
+    resultado['periodo'] = _extrapolar(*periodos)
+
+    return resultado
+
+#Errores con que una corrida se informa como fallida
+_FALLAS = (AssertionError,IndexError,ValueError,FloatingPointError)
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+
+# Tarea numérica - Ecuaciones Diferenciales Ordinarias
+
+# Nombre: Diego Alonso Sánchez Manríquez
+# RUT: 19.957.060-9
+
+# Módulo para comparar métodos sobre varios casos corriendo todas las
+# integraciones a la vez, como en la parte E. Al ejecutarlo como
+# script se rehace el gráfico de la parte E.
+
+#Librerías importadas
+import time #usada para medir cada corrida
+from concurrent.futures import ProcessPoolExecutor, as_completed #procesos
+import matplotlib.pyplot as plt #usada para graficar
+from integradores import euler_progresivo, runge_kutta4, solucion_RKF
+from adams import adams_bashforth_moulton
+from analisis import periodo
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ diccionarios METODOS NOMBRES
+
+  Motivación
+  - Elegir los integradores por su nombre, que es lo que se envía a
+    cada proceso.
+
+  Funcionamiento
+  - METODOS asocia cada nombre a su integrador y NOMBRES al texto
+    usado en las leyendas de los gráficos.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+METODOS = {'EP':euler_progresivo,
+           'RK4':runge_kutta4,
+           'RKF':solucion_RKF,
+           'ABM':adams_bashforth_moulton}
+
+NOMBRES = {'EP':'Euler progresivo',
+           'RK4':'Runge-Kutta 4',
+           'RKF':'Runge-Kutta-Fehlberg',
+           'ABM':'Adams-Bashforth-Moulton'}
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función _correr()
+
+  Motivación
+  - Hacer una integración dentro de un proceso y devolver solo lo
+    necesario para la comparación, no la trayectoria completa.
+
+  Parámetros
+  - metodo (str): nombre del método en METODOS
+  - caso (str): nombre del caso
+  - T (int): extremo superior del intervalo a analizar
+  - dt (float): paso de tiempo
+  - cte (dict): diccionario con constantes usadas
+
+  Funcionamiento
+  - Se entrega un diccionario con 'metodo', 'caso', 'periodo',
+    'final' (estado (a,m,s) en el último tiempo), 'segundos' y
+    'error'. Si la corrida falla (por ejemplo si no se encuentran
+    dos máximos), 'periodo' es None y 'error' tiene el motivo.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _correr(metodo,caso,T,dt,cte):
+
+    resultado = {'metodo':metodo,'caso':caso,'periodo':None,'final':None,\
+                 'segundos':None,'error':None}
+
+    inicio = time.perf_counter()
+    try:
+        t,a,m,s = METODOS[metodo](T,dt,cte)
+        resultado['final'] = (float(a[-1]),float(m[-1]),float(s[-1]))
+        resultado['periodo'] = float(periodo(t,s))
+    except (AssertionError,IndexError,ValueError,FloatingPointError) as e:
+        resultado['error'] = '%s: %s' % (type(e).__name__,e)
+    resultado['segundos'] = time.perf_counter()-inicio
+
+    return resultado
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función comparar()
+
+  Motivación
+  - Hacer todas las integraciones de una comparación a la vez, en
+    lugar de una después de otra, para que el tiempo total sea
+    cercano al de la corrida más lenta.
+
+  Parámetros
+  - casos (dict): nombre de cada caso y su diccionario de constantes
+  - metodos (list): nombres de los métodos en METODOS
+  - T (int): extremo superior del intervalo a analizar
+  - dt (float): paso de tiempo
+  - procesos (int): cantidad de procesos (por omisión, los núcleos)
+
+  Funcionamiento
+  - Cada par (método, caso) se envía a un conjunto de procesos con
+    _correr(), y los resultados se entregan (con yield) a medida que
+    terminan, no en el orden en que se enviaron.
+
+  Consideración
+  - En Windows y macOS los procesos vuelven a importar el script que
+    llama a comparar(), por lo que la llamada debe estar dentro de
+    if __name__=='__main__':.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def comparar(casos,metodos=('EP','RK4','RKF'),T=100,dt=0.001,procesos=None):
+
+    #Condiciones de los parámetros
+    assert type(casos)==dict
+    assert all(x in METODOS for x in metodos)
+    assert type(T)==int
+    assert type(dt)==float
+
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+
+        #Se envían todas las corridas
+        pendientes = [ejecutor.submit(_correr,metodo,caso,T,dt,cte) \
+                      for caso,cte in casos.items() for metodo in metodos]
+
+        #Se entregan a medida que terminan
+        for futuro in as_completed(pendientes):
+            yield futuro.result()
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función tabla_periodos()
+
+  Motivación
+  - Ordenar los resultados de comparar() como las listas de periodos
+    de la parte E (una lista por método, en el orden de los casos).
+
+  Parámetros
+  - resultados (list): diccionarios entregados por comparar()
+  - casos (dict o list): casos, en el orden que se quiere
+
+  Funcionamiento
+  - Se entrega un diccionario con una lista de periodos por método.
+    Las corridas fallidas quedan como None.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def tabla_periodos(resultados,casos):
+
+    #Periodos por método y caso
+    periodos = {}
+    for r in resultados:
+        periodos.setdefault(r['metodo'],{})[r['caso']] = r['periodo']
+
+    return {x:[y.get(caso) for caso in casos] for x,y in periodos.items()}
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función graficar_periodos()
+
+  Motivación
+  - Graficar los periodos límites de cada método en función de una
+    constante de los casos, como en la parte E.
+
+  Parámetros
+  - tabla (dict): periodos entregados por tabla_periodos()
+  - casos (dict): nombre de cada caso y su diccionario de constantes
+  - clave (str): constante usada en el eje horizontal
+  - ruta (str): archivo donde se guarda la figura (opcional)
+
+  Funcionamiento
+  - Se entregan la figura y los ejes de matplotlib.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def graficar_periodos(tabla,casos,clave='alpha',ruta=None):
+
+    #Valores del eje horizontal
+    x = [cte[clave] for cte in casos.values()]
+
+    #Creación del lienzo
+    fig, ax = plt.subplots(figsize=(12,6))
+
+    #Gráficos (las corridas fallidas quedan como cortes)
+    for metodo,periodos in tabla.items():
+        ax.plot(x,[float('nan') if p is None else p for p in periodos],\
+                label="Periodos obtenidos usando "+NOMBRES[metodo])
+
+    #Etiquetas
+    ax.set_xlabel("Valor de $\\%s$" % clave if clave=='alpha' else clave,\
+                  labelpad=20)
+    ax.set_ylabel("Periodo límite (millones de años)",labelpad=20)
+
+    #Título
+    ax.set_title("Periodo límite en función de "+clave,\
+                 fontweight="bold", loc='center',pad=20)
+
+    #Configuraciones
+    ax.grid(True, which='major', axis='both')
+    ax.margins(0.1)
+
+    # Leyendas
+    ax.legend()
+
+    #Guardado de figura
+    if ruta is not None:
+        fig.savefig(ruta)
+
+    return fig,ax
+
+#%%
+
+#Gráfico de la parte E con todas las corridas a la vez
+if __name__=='__main__':
+
+    from escenarios import cargar_manifiesto #importa este módulo
+
+    #Casos, métodos y figura de la parte E del manifiesto
+    manifiesto = cargar_manifiesto()
+    parte = manifiesto['partes']['E']
+    casos = {x:manifiesto['casos'][x] for x in parte['casos']}
+    archivo = [x['archivo'] for x in parte['salidas'] if x['tipo']=='periodos'][0]
+
+    resultados = []
+    for r in comparar(casos,metodos=parte['metodos'],T=parte['T'],dt=parte['dt']):
+        print(r['metodo'],r['caso'],r['periodo'],'%.1f s' % r['segundos'])
+        resultados += [r]
+
+    graficar_periodos(tabla_periodos(resultados,casos),casos,\
+                      ruta='Imágenes/'+archivo)
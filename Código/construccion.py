@@ -0,0 +1,454 @@
+# -*- coding: utf-8 -*-
+
+# Tarea numérica - Ecuaciones Diferenciales Ordinarias
+
+# Nombre: Diego Alonso Sánchez Manríquez
+# RUT: 19.957.060-9
+
+# Módulo para construir los resultados de las partes A-E como nodos
+# (simulaciones, periodos y figuras) que solo se recalculan si sus
+# datos o su código cambiaron. Al ejecutarlo como script se
+# construyen todas las figuras.
+
+#Librerías importadas
+import hashlib #usada para las huellas de los nodos
+import inspect #usada para leer el código de las funciones
+import json #usada para las huellas de los datos
+import os #usada para las rutas
+import numpy as np #usada para guardar las trayectorias
+import matplotlib #usada para la huella de las figuras
+from matplotlib.figure import Figure #usada para graficar
+import analisis #usada para la huella de los periodos
+from integradores import guardar_punto_control, cargar_punto_control
+from comparacion import METODOS, NOMBRES #integradores por nombre
+from analisis import periodo
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ funciones _huella() _huella_modulo() _huella_archivo()
+
+  Motivación
+  - Resumir un dato de entrada de un nodo en un texto que cambia si
+    y solo si el dato cambia.
+
+  Parámetros
+  - valor: número, texto, lista, diccionario, arreglo o función
+  - modulo (module): módulo del que depende un nodo
+
+  Funcionamiento
+  - Las funciones se resumen con el código de todo su módulo (así
+    un cambio en un paso auxiliar de integradores.py también cuenta),
+    los arreglos con sus bytes, y el resto con json.
+  - _huella_modulo() resume un módulo de un solo archivo (como
+    analisis.py) con su código, y una librería instalada (un paquete,
+    como matplotlib) con su nombre y su versión.
+  - _huella_archivo() resume el contenido de un archivo escrito por
+    un nodo (por ejemplo una figura).
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _huella(valor):
+
+    if callable(valor):
+        codigo = inspect.getsource(inspect.getmodule(valor))
+        return valor.__name__+':'+hashlib.sha256(codigo.encode()).hexdigest()
+    if isinstance(valor,np.ndarray):
+        return hashlib.sha256(valor.tobytes()).hexdigest()
+    if isinstance(valor,dict):
+        return {x:_huella(y) for x,y in sorted(valor.items())}
+    if isinstance(valor,(list,tuple)):
+        return [_huella(x) for x in valor]
+    return valor
+
+def _huella_modulo(modulo):
+
+    #Paquete instalado, se usa su versión
+    if hasattr(modulo,'__path__'):
+        return modulo.__name__+':'+str(getattr(modulo,'__version__',None))
+
+    codigo = inspect.getsource(modulo)
+    return modulo.__name__+':'+hashlib.sha256(codigo.encode()).hexdigest()
+
+def _huella_archivo(ruta):
+
+    with open(ruta,'rb') as archivo:
+        return hashlib.sha256(archivo.read()).hexdigest()
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ clase Nodo
+
+  Motivación
+  - Representar un paso de la construcción (una simulación, un
+    periodo o una figura) junto a lo que necesita.
+
+  Parámetros
+  - nombre (str): nombre del nodo, para los mensajes
+  - funcion (function): función que calcula el resultado, recibe los
+    resultados de las dependencias y luego "argumentos"
+  - argumentos (dict): datos del nodo (opcional)
+  - dependencias (list): nodos cuyos resultados usa (opcional)
+  - archivo (str): archivo que escribe la función, para las figuras
+    (opcional). Se entrega a la función como ruta=archivo
+  - modulos (list): módulos que llama la función (por ejemplo
+    analisis o matplotlib), cuyo cambio también invalida el nodo
+    (opcional)
+
+  Funcionamiento
+  - clave() entrega la huella del nodo: el código de su función, las
+    huellas de sus módulos (ver _huella_modulo()), sus argumentos y
+    las claves de sus dependencias. Dos nodos con la misma clave dan
+    el mismo resultado, por lo que comparten el archivo guardado
+    aunque tengan otro nombre.
+  - Solo se usa el código de la función del nodo (no el de todo su
+    módulo), para que cambiar una figura no invalide las
+    simulaciones definidas en el mismo archivo. Por eso los módulos
+    que llama se declaran en "modulos".
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+class Nodo:
+
+    def __init__(self,nombre,funcion,argumentos=None,dependencias=(),\
+                 archivo=None,modulos=()):
+
+        #Condiciones de los parámetros
+        assert type(nombre)==str
+        assert callable(funcion)
+        assert archivo is None or type(archivo)==str
+
+        self.nombre = nombre
+        self.funcion = funcion
+        self.argumentos = argumentos or {}
+        self.dependencias = list(dependencias)
+        self.archivo = archivo
+        self.modulos = list(modulos)
+        self._clave = None
+
+    def clave(self):
+
+        if self._clave is None:
+            datos = {'codigo':inspect.getsource(self.funcion),
+                     'modulos':[_huella_modulo(x) for x in self.modulos],
+                     'argumentos':_huella(self.argumentos),
+                     'dependencias':[x.clave() for x in self.dependencias],
+                     'archivo':self.archivo}
+            texto = json.dumps(datos,sort_keys=True,default=repr)
+            self._clave = hashlib.sha256(texto.encode()).hexdigest()
+
+        return self._clave
+
+    def calcular(self,*entradas):
+
+        if self.archivo is None:
+            return self.funcion(*entradas,**self.argumentos)
+        return self.funcion(*entradas,ruta=self.archivo,**self.argumentos)
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función construir()
+
+  Motivación
+  - Obtener los resultados de una lista de nodos recalculando solo
+    los que quedaron desactualizados.
+
+  Parámetros
+  - nodos (list): nodos que se quieren construir
+  - carpeta (str): carpeta donde se guardan los resultados
+  - forzar (bool): recalcula todo aunque esté guardado
+
+  Funcionamiento
+  - El resultado de cada nodo se guarda en carpeta/clave.pkl (con
+    guardar_punto_control(), junto al nombre y la clave). Un nodo
+    está al día si ese archivo existe y, si escribe un archivo, si
+    este también existe y su huella (ver _huella_archivo()) es la
+    guardada al escribirlo. Así, si otro nodo con la misma ruta lo
+    sobrescribió (por ejemplo, al volver a una versión anterior de
+    una figura), se dibuja de nuevo.
+  - Los nodos al día no se cargan, salvo que un nodo desactualizado
+    necesite su resultado. Así, si solo cambió una figura, se cargan
+    sus simulaciones guardadas y se vuelve a dibujar solo esa.
+  - Se entrega la lista de nombres de los nodos recalculados.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def construir(nodos,carpeta='Resultados',forzar=False):
+
+    #Condiciones de los parámetros
+    assert type(carpeta)==str
+
+    os.makedirs(carpeta,exist_ok=True)
+
+    resultados = {}
+    recalculados = []
+
+    def _ruta(nodo):
+        return os.path.join(carpeta,nodo.clave()+'.pkl')
+
+    def _al_dia(nodo):
+        if forzar or not os.path.exists(_ruta(nodo)):
+            return False
+        if nodo.archivo is None:
+            return True
+
+        #El archivo debe ser el escrito por este nodo
+        return os.path.exists(nodo.archivo) and \
+               cargar_punto_control(_ruta(nodo)).get('archivo')==\
+               _huella_archivo(nodo.archivo)
+
+    def _obtener(nodo):
+
+        clave = nodo.clave()
+        if clave in resultados:
+            return resultados[clave]
+
+        #Resultado guardado
+        if _al_dia(nodo):
+            resultados[clave] = cargar_punto_control(_ruta(nodo))['resultado']
+            return resultados[clave]
+
+        #Se recalcula a partir de las dependencias
+        entradas = [_obtener(x) for x in nodo.dependencias]
+        resultados[clave] = nodo.calcular(*entradas)
+        guardar_punto_control({'nombre':nodo.nombre,'clave':clave,\
+                               'resultado':resultados[clave],\
+                               'archivo':None if nodo.archivo is None else \
+                               _huella_archivo(nodo.archivo)},_ruta(nodo))
+        recalculados.append(nodo.nombre)
+        return resultados[clave]
+
+    for nodo in nodos:
+        if not _al_dia(nodo):
+            _obtener(nodo)
+
+    return recalculados
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ funciones _simular() _periodo()
+
+  Motivación
+  - Funciones de los nodos de simulación y de periodo.
+
+  Funcionamiento
+  - _simular() entrega (t,a,m,s) como arreglos, que se guardan en
+    menos espacio que las listas.
+  - _periodo() entrega el periodo de periodo() de una trayectoria.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _simular(integrador,T,dt,cte):
+
+    return tuple(np.asarray(x,dtype=float) for x in integrador(T,dt,cte))
+
+def _periodo(trayectoria):
+
+    t,a,m,s = trayectoria
+    return float(periodo(t,s))
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ funciones _figura_A() _figura_B() _figura_C() _figura_periodos()
+
+  Motivación
+  - Las mismas figuras de graficarA(), graficarB(), graficarC() y de
+    los periodos en función de alpha de las partes C, D y E, como
+    funciones de nodos.
+
+  Funcionamiento
+  - Cada una recibe las trayectorias o los periodos de sus
+    dependencias, escribe la figura en "ruta" y la entrega.
+  - Se usa Figure en lugar de pyplot, pues pyplot guarda un estado
+    global y no se puede usar desde varios hilos a la vez.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _figura_A(trayectoria,caso,ruta):
+
+    t,a,m,s = trayectoria
+
+    #Creación del lienzo
+    fig = Figure(figsize=(12,6))
+    ax = fig.subplots()
+
+    #Gráficos
+    ax.plot(t,a,label="Fracción de masa de gas atómico $a(t)$")
+    ax.plot(t,m,label="Fracción de masa de gas molecular $m(s)$")
+    ax.plot(t,s,label="Fracción de masa de estrellas activas $s(t)$")
+
+    #Etiquetas
+    ax.set_xlabel("Tiempo (millones de años)",labelpad=20)
+    ax.set_ylabel("Fracción de masa",labelpad=20)
+
+    #Título
+    ax.set_title(f"Fracciones de masa del sistema a lo largo del tiempo ({caso})",\
+                  fontweight="bold", loc='center', pad=20)
+
+    #Leyendas
+    ax.legend(loc="center right")
+
+    #Configuraciones
+    ax.grid(True, which='major', axis='both')
+    ax.margins(0.1)
+
+    #Guardado de figura
+    fig.savefig(ruta)
+    return ruta
+
+def _figura_B(trayectoria,caso,ruta):
+
+    t,a,m,s = trayectoria
+
+    #Creación del lienzo
+    fig = Figure(figsize=(12,6))
+    ax = fig.subplots()
+
+    #Gráficos
+    ax.plot(a,m)
+
+    #Etiquetas
+    ax.set_xlabel("Fracción de masa de gas atómico a(t)",labelpad=20)
+    ax.set_ylabel("Fracción de masa de gas molecular m(t)",labelpad=20)
+
+    #Título
+    ax.set_title(f"Trayectoria de a y m en función del tiempo (plano de fases) ({caso})",\
+                 fontweight="bold", loc='center',pad=20)
+
+    #Configuraciones
+    ax.grid(True, which='major', axis='both')
+    ax.margins(0.1)
+
+    #Guardado de figura
+    fig.savefig(ruta)
+    return ruta
+
+def _figura_C(trayectoria,caso,ruta):
+
+    t,a,m,s = trayectoria
+
+    #Creación del lienzo
+    fig = Figure(figsize=(12,6))
+    ax = fig.subplots()
+
+    #Gráficos
+    ax.plot(t,s)
+
+    #Etiquetas
+    ax.set_xlabel("Tiempo (millones de años)",labelpad=20)
+    ax.set_ylabel("Fracción de masa de estrellas activas s(t)",labelpad=20)
+
+    #Título
+    ax.set_title(f"Fracción de masa de estrellas activas s(t) a lo largo del tiempo (alpha = {caso})",\
+                 fontweight="bold", loc='center',pad=20)
+
+    #Configuraciones
+    ax.grid(True, which='major', axis='both')
+    ax.margins(0.1)
+
+    #Guardado de figura
+    fig.savefig(ruta)
+    return ruta
+
+def _figura_periodos(*periodos,alphas,etiquetas,titulo,ruta):
+
+    #Creación del lienzo
+    fig = Figure(figsize=(12,6))
+    ax = fig.subplots()
+
+    #Gráficos (los periodos vienen seguidos, método por método)
+    n = len(alphas)
+    for i,etiqueta in enumerate(etiquetas):
+        ax.plot(alphas,periodos[i*n:(i+1)*n],label=etiqueta)
+
+    #Etiquetas
+    ax.set_xlabel("Valor de $\\alpha$",labelpad=20)
+    ax.set_ylabel("Periodo límite (millones de años)",labelpad=20)
+
+    #Título
+    ax.set_title(titulo,fontweight="bold", loc='center',pad=20)
+
+    #Configuraciones
+    ax.grid(True, which='major', axis='both')
+    ax.margins(0.1)
+
+    # Leyendas
+    if any(etiquetas):
+        ax.legend()
+
+    #Guardado de figura
+    fig.savefig(ruta)
+    return ruta
+
+#Figuras de trayectoria que se pueden pedir en el manifiesto
+FIGURAS = {'A':_figura_A,'B':_figura_B,'C':_figura_C}
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función nodos_partes()
+
+  Motivación
+  - Definir los nodos de las partes A-E con los casos, pasos de
+    tiempo y figuras del manifiesto (ver cargar_manifiesto() en
+    escenarios.py), el mismo que usa ejecutar_manifiesto().
+
+  Parámetros
+  - manifiesto (dict): diccionario entregado por cargar_manifiesto()
+  - imagenes (str): carpeta donde se guardan las figuras
+
+  Funcionamiento
+  - Se entrega la lista de nodos de figura. Las simulaciones y los
+    periodos quedan como sus dependencias. Las simulaciones iguales
+    de las partes D y E tienen la misma clave y se calculan una vez.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def nodos_partes(manifiesto,imagenes='Imágenes'):
+
+    figuras = []
+
+    for parte,datos in manifiesto['partes'].items():
+        periodos = []
+        for metodo in datos['metodos']:
+            for caso in datos['casos']:
+                sim = Nodo(f'{parte} simulación {metodo} ({caso})',_simular,\
+                           {'integrador':METODOS[metodo],'T':datos['T'],\
+                            'dt':datos['dt'],'cte':manifiesto['casos'][caso]})
+                periodos += [Nodo(f'{parte} periodo {metodo} ({caso})',\
+                                  _periodo,dependencias=[sim],modulos=[analisis])]
+
+                #Figuras de trayectoria
+                for salida in datos['salidas']:
+                    if salida['tipo']=='trayectoria':
+                        figuras += [Nodo(f'{parte} figura {metodo} ({caso})',\
+                                         FIGURAS[salida['figura']],{'caso':caso},[sim],\
+                                         os.path.join(imagenes,salida['archivo'].format(caso=caso)),\
+                                         [matplotlib])]
+
+        #Figuras de periodos
+        alphas = [manifiesto['casos'][x]['alpha'] for x in datos['casos']]
+        etiquetas = ["Periodos obtenidos usando "+NOMBRES[x] \
+                     if len(datos['metodos'])>1 else None for x in datos['metodos']]
+        for salida in datos['salidas']:
+            if salida['tipo']=='periodos':
+                figuras += [Nodo(f'{parte} figura de periodos',_figura_periodos,\
+                                 {'alphas':alphas,'etiquetas':etiquetas,\
+                                  'titulo':salida['titulo']},periodos,\
+                                 os.path.join(imagenes,salida['archivo']),[matplotlib])]
+
+    return figuras
+
+#%%
+
+#Construcción de todas las figuras del manifiesto
+if __name__=='__main__':
+
+    from escenarios import cargar_manifiesto #importa este módulo
+
+    for nombre in construir(nodos_partes(cargar_manifiesto())):
+        print('Recalculado:',nombre)
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+
+# Tarea numérica - Ecuaciones Diferenciales Ordinarias
+
+# Nombre: Diego Alonso Sánchez Manríquez
+# RUT: 19.957.060-9
+
+# Módulo para leer los casos, métodos y figuras de las partes desde un
+# manifiesto (escenarios.json) y correr cada simulación distinta una
+# sola vez. Al ejecutarlo como script se rehacen todas las figuras.
+
+#Librerías importadas
+import json #usada para leer el manifiesto y normalizar los trabajos
+import os #usada para las rutas
+from concurrent.futures import ProcessPoolExecutor, as_completed #procesos
+from comparacion import METODOS, NOMBRES #integradores por nombre
+from construccion import FIGURAS, _simular, _figura_periodos
+from etapas import _periodo_o_nada
+
+#Manifiesto de las partes, junto a este módulo
+MANIFIESTO = os.path.join(os.path.dirname(os.path.abspath(__file__)),'escenarios.json')
+
+#Costo aproximado de cada método, en veces el tiempo de un paso de EP
+#(medido con el caso 3, T=100 y dt=0.001), para ordenar los trabajos.
+#Los de paso fijo cuestan por paso. RKF tiene paso adaptativo, por lo
+#que su costo no depende de dt y se cuenta por millón de años
+COSTOS = {'EP':1,'RK4':4,'ABM':18}
+COSTOS_ADAPTATIVOS = {'RKF':150}
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función cargar_manifiesto()
+
+  Motivación
+  - Definir los casos una sola vez, en lugar de repetir caso1…caso6
+    y alpha13…alpha19 en cada script.
+
+  Parámetros
+  - ruta (str): archivo .json o .toml (por omisión, MANIFIESTO)
+
+  Funcionamiento
+  - El manifiesto tiene 'casos' (nombre: cte) y 'partes' (nombre:
+    datos). Los datos de cada parte son 'metodos' (nombres de
+    METODOS), 'T', 'dt', 'casos' (nombres) y 'salidas', una lista
+    de diccionarios con 'tipo' y 'archivo':
+    'trayectoria': una figura por método y caso, con 'figura' (A, B
+    o C) y el archivo con {caso} en lugar del nombre del caso
+    'periodos': el periodo en función de alpha, con 'titulo'
+  - Se revisa que todo lo nombrado exista y se entrega el manifiesto
+    como diccionario.
+
+  Consideración
+  - Los .toml se leen con tomllib, que viene con Python desde 3.11.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def cargar_manifiesto(ruta=MANIFIESTO):
+
+    #Condiciones de los parámetros
+    assert type(ruta)==str and ruta.endswith(('.json','.toml'))
+
+    if ruta.endswith('.json'):
+        with open(ruta,encoding='utf-8') as archivo:
+            manifiesto = json.load(archivo)
+    else:
+        import tomllib
+        with open(ruta,'rb') as archivo:
+            manifiesto = tomllib.load(archivo)
+
+    #Se revisa el contenido
+    casos = manifiesto['casos']
+    for parte in manifiesto['partes'].values():
+        assert all(x in METODOS for x in parte['metodos'])
+        assert all(x in casos for x in parte['casos'])
+        assert type(parte['T'])==int and type(parte['dt'])==float
+        for salida in parte['salidas']:
+            assert salida['tipo'] in ('trayectoria','periodos')
+            assert salida['tipo']=='periodos' or salida['figura'] in FIGURAS
+
+    return manifiesto
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ funciones planificar() _costo()
+
+  Motivación
+  - Juntar las simulaciones de todas las partes, quitando las
+    repetidas (por ejemplo, EP y RK4 con T=100 y dt=0.001 aparecen en
+    las partes D y E).
+
+  Parámetros
+  - manifiesto (dict): diccionario entregado por cargar_manifiesto()
+
+  Funcionamiento
+  - Cada simulación pedida se normaliza como (método, cte con sus
+    valores como float y sus llaves ordenadas, T, dt), en texto
+    json, y las que tienen el mismo texto se juntan en un trabajo.
+  - Se entrega la lista de trabajos, cada uno un diccionario con
+    'clave', 'metodo', 'T', 'dt', 'cte', 'costo' (ver _costo()) y
+    'usos' (lista de (parte, caso) que lo piden), ordenada de mayor
+    a menor costo. Así los trabajos largos empiezan primero y los
+    cortos llenan los procesos libres al final.
+  - _costo() entrega COSTOS del método por la cantidad de pasos
+    T/dt, o COSTOS_ADAPTATIVOS por T para RKF. Un método que no
+    está en ninguno se cuenta como EP.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def planificar(manifiesto):
+
+    trabajos = {}
+    for nombre,parte in manifiesto['partes'].items():
+        for metodo in parte['metodos']:
+            for caso in parte['casos']:
+                cte = manifiesto['casos'][caso]
+                clave = json.dumps([metodo,{x:float(y) for x,y in cte.items()},\
+                                    parte['T'],parte['dt']],sort_keys=True)
+                if clave not in trabajos:
+                    trabajos[clave] = {'clave':clave,'metodo':metodo,\
+                                       'T':parte['T'],'dt':parte['dt'],'cte':cte,\
+                                       'costo':_costo(metodo,parte['T'],parte['dt']),\
+                                       'usos':[]}
+                trabajos[clave]['usos'] += [(nombre,caso)]
+
+    return sorted(trabajos.values(),key=lambda x:-x['costo'])
+
+def _costo(metodo,T,dt):
+
+    #Paso adaptativo, no depende de dt
+    if metodo in COSTOS_ADAPTATIVOS:
+        return COSTOS_ADAPTATIVOS[metodo]*T
+
+    return COSTOS.get(metodo,1)*T/dt
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función ejecutar_manifiesto()
+
+  Motivación
+  - Rehacer todas las figuras de las partes corriendo cada
+    simulación distinta exactamente una vez.
+
+  Parámetros
+  - manifiesto (dict): diccionario entregado por cargar_manifiesto()
+  - procesos (int): cantidad de procesos (opcional, por omisión se
+    integra todo en el proceso actual)
+  - imagenes (str): carpeta donde se guardan las figuras
+
+  Funcionamiento
+  - Los trabajos de planificar() se envían en su orden a los
+    procesos. Cuando uno termina se calcula su periodo y se dibujan
+    las figuras de trayectoria que lo usan, y luego se descarta la
+    trayectoria. Al final se dibujan las figuras de periodos.
+  - Se entrega un diccionario con 'pedidas' y 'trabajos' (cantidad
+    de simulaciones pedidas y corridas), 'periodos' ((parte, método,
+    caso): periodo, o None si no se encuentra) y 'archivos' (figuras
+    guardadas).
+
+  Consideración
+  - Igual que en comparar(), en Windows y macOS la llamada debe estar
+    dentro de if __name__=='__main__':.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def ejecutar_manifiesto(manifiesto,procesos=None,imagenes='Imágenes'):
+
+    #Condiciones de los parámetros
+    assert type(imagenes)==str
+
+    os.makedirs(imagenes,exist_ok=True)
+    partes = manifiesto['partes']
+    trabajos = planificar(manifiesto)
+    periodos = {}
+    archivos = []
+
+    def _terminar(trabajo,trayectoria):
+
+        periodo = _periodo_o_nada(trayectoria)
+        for parte,caso in trabajo['usos']:
+            periodos[(parte,trabajo['metodo'],caso)] = periodo
+            for salida in partes[parte]['salidas']:
+                if salida['tipo']=='trayectoria':
+                    archivos.append(FIGURAS[salida['figura']](trayectoria,caso,\
+                        os.path.join(imagenes,salida['archivo'].format(caso=caso))))
+
+    #Se corren los trabajos, en este proceso o en varios
+    if procesos is None:
+        for trabajo in trabajos:
+            _terminar(trabajo,_simular(METODOS[trabajo['metodo']],\
+                      trabajo['T'],trabajo['dt'],trabajo['cte']))
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            futuros = {ejecutor.submit(_simular,METODOS[x['metodo']],\
+                       x['T'],x['dt'],x['cte']):x for x in trabajos}
+            for futuro in as_completed(futuros):
+                _terminar(futuros[futuro],futuro.result())
+
+    #Figuras de periodos
+    for nombre,parte in partes.items():
+        for salida in parte['salidas']:
+            if salida['tipo']!='periodos':
+                continue
+            alphas = [manifiesto['casos'][x]['alpha'] for x in parte['casos']]
+            etiquetas = ["Periodos obtenidos usando "+NOMBRES[x] \
+                         if len(parte['metodos'])>1 else None for x in parte['metodos']]
+            valores = [periodos[(nombre,x,y)] for x in parte['metodos'] \
+                       for y in parte['casos']]
+            archivos.append(_figura_periodos(*valores,alphas=alphas,\
+                            etiquetas=etiquetas,titulo=salida['titulo'],\
+                            ruta=os.path.join(imagenes,salida['archivo'])))
+
+    return {'pedidas':sum(len(x['usos']) for x in trabajos),\
+            'trabajos':len(trabajos),'periodos':periodos,'archivos':archivos}
+
+#%%
+
+#Todas las figuras de las partes A-E desde el manifiesto
+if __name__=='__main__':
+
+    resultado = ejecutar_manifiesto(cargar_manifiesto(),procesos=os.cpu_count())
+    print('Simulaciones pedidas:',resultado['pedidas'])
+    print('Simulaciones corridas:',resultado['trabajos'])
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+# Tarea numérica - Ecuaciones Diferenciales Ordinarias
+
+# Nombre: Diego Alonso Sánchez Manríquez
+# RUT: 19.957.060-9
+
+# Módulo para ejecutar integración, cálculo del periodo y guardado de
+# figuras como etapas que trabajan a la vez sobre casos distintos.
+# Al ejecutarlo como script se rehacen las figuras de la parte C.
+
+#Librerías importadas
+import asyncio #usada para coordinar las etapas
+import os #usada para contar los núcleos
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from analisis import periodo
+from construccion import FIGURAS, _simular
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función _periodo_o_nada()
+
+  Motivación
+  - Calcular el periodo en la etapa de periodos sin detenerla si un
+    caso no tiene dos máximos.
+
+  Parámetros
+  - trayectoria (tuple): (t,a,m,s) entregada por _simular()
+
+  Funcionamiento
+  - Se entrega el periodo de periodo(), o None si no se encuentra.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _periodo_o_nada(trayectoria):
+
+    t,a,m,s = trayectoria
+    try:
+        return float(periodo(t,s))
+    except IndexError:
+        return None
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función _etapa()
+
+  Motivación
+  - Tener una sola forma de escribir cada etapa: tomar trabajos de
+    una cola, procesarlos en un ejecutor y pasarlos a la siguiente.
+
+  Parámetros
+  - entrada (asyncio.Queue): cola de donde se toman los trabajos
+  - salida (asyncio.Queue): cola donde se dejan (o None en la última)
+  - ejecutor (Executor): procesos o hilos donde se hace el trabajo
+  - paso (function): función que recibe un trabajo (dict) y entrega
+    una tupla (función, argumentos) para el ejecutor y la llave del
+    trabajo donde guardar su resultado
+  - trabajadores (int): cantidad de trabajos procesados a la vez
+  - siguientes (int): cantidad de trabajadores de la etapa siguiente
+  - terminados (list): recibe los trabajos si es la última etapa
+
+  Funcionamiento
+  - Se lanzan "trabajadores" corrutinas que toman trabajos hasta
+    encontrar None (fin). Cuando todas terminan, se deja un None en
+    la salida por cada trabajador de la etapa siguiente.
+  - Como las colas tienen un largo máximo, una etapa rápida espera a
+    la siguiente en lugar de acumular trayectorias en memoria.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+async def _etapa(entrada,salida,ejecutor,paso,trabajadores,siguientes,\
+                 terminados):
+
+    ciclo = asyncio.get_running_loop()
+
+    async def _trabajador():
+        while True:
+            trabajo = await entrada.get()
+            if trabajo is None:
+                return
+            funcion,argumentos,llave = paso(trabajo)
+            trabajo[llave] = await ciclo.run_in_executor(ejecutor,funcion,*argumentos)
+            if salida is None:
+                terminados.append(trabajo)
+            else:
+                await salida.put(trabajo)
+
+    await asyncio.gather(*(_trabajador() for _ in range(trabajadores)))
+
+    #Fin de la etapa siguiente
+    if salida is not None:
+        for _ in range(siguientes):
+            await salida.put(None)
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función ejecutar()
+
+  Motivación
+  - Que mientras se dibuja un caso ya se esté integrando el siguiente,
+    para que el tiempo total sea el de la etapa más lenta y no la
+    suma de todas.
+
+  Parámetros
+  - trabajos (list): diccionarios con 'nombre', 'integrador', 'T',
+    'dt', 'cte' y, si se quiere una figura, 'figura' (función con la
+    forma de las de construccion.py), 'argumentos' (dict) y 'ruta'
+  - procesos (int): procesos para integrar (por omisión, los núcleos)
+  - limite (int): largo máximo de las colas entre etapas
+
+  Funcionamiento
+  - Hay tres etapas unidas por colas de largo "limite":
+    integración (en procesos, varias a la vez), cálculo del periodo
+    (en un hilo) y guardado de la figura (en un hilo).
+  - Se entrega la lista de trabajos terminados (en el orden en que
+    terminaron), cada uno con 'periodo' y, si tiene figura, 'ruta'.
+    Las trayectorias se descartan al terminar cada trabajo.
+
+  Consideración
+  - Igual que en comparar(), en Windows y macOS la llamada debe estar
+    dentro de if __name__=='__main__':.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def ejecutar(trabajos,procesos=None,limite=2):
+
+    #Condiciones de los parámetros
+    assert type(trabajos)==list
+    assert type(limite)==int and limite>0
+
+    return asyncio.run(_ejecutar(trabajos,procesos,limite))
+
+async def _ejecutar(trabajos,procesos,limite):
+
+    #Colas entre etapas
+    integrar = asyncio.Queue()
+    periodos = asyncio.Queue(maxsize=limite)
+    figuras = asyncio.Queue(maxsize=limite)
+    terminados = []
+
+    #Pasos de cada etapa
+    def _integrar(x):
+        return _simular,(x['integrador'],x['T'],x['dt'],x['cte']),'trayectoria'
+
+    def _periodo(x):
+        return _periodo_o_nada,(x['trayectoria'],),'periodo'
+
+    def _figura(x):
+        return _dibujar,(x,),'ruta'
+
+    #Integraciones a la vez
+    n = procesos or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=n) as procesador, \
+         ThreadPoolExecutor(max_workers=2) as hilos:
+
+        #Trabajos y fin de la etapa de integración
+        for trabajo in trabajos:
+            integrar.put_nowait(dict(trabajo))
+        for _ in range(n):
+            integrar.put_nowait(None)
+
+        await asyncio.gather(
+            _etapa(integrar,periodos,procesador,_integrar,n,1,terminados),
+            _etapa(periodos,figuras,hilos,_periodo,1,1,terminados),
+            _etapa(figuras,None,hilos,_figura,1,0,terminados))
+
+    return terminados
+
+def _dibujar(trabajo):
+
+    #Se descarta la trayectoria y se dibuja si se pidió
+    trayectoria = trabajo.pop('trayectoria')
+    if 'figura' not in trabajo:
+        return None
+    return trabajo['figura'](trayectoria,ruta=trabajo['ruta'],\
+                             **trabajo.get('argumentos',{}))
+
+#%%
+
+#Figuras de s(t) y periodos de la parte C con las etapas a la vez
+if __name__=='__main__':
+
+    from escenarios import cargar_manifiesto #importa este módulo
+    from comparacion import METODOS
+
+    #Casos y figuras de la parte C del manifiesto
+    manifiesto = cargar_manifiesto()
+    parte = manifiesto['partes']['C']
+    salida = [x for x in parte['salidas'] if x['tipo']=='trayectoria'][0]
+
+    trabajos = [{'nombre':f'{metodo} ({caso})','integrador':METODOS[metodo],\
+                 'T':parte['T'],'dt':parte['dt'],'cte':manifiesto['casos'][caso],\
+                 'figura':FIGURAS[salida['figura']],'argumentos':{'caso':caso},\
+                 'ruta':'Imágenes/'+salida['archivo'].format(caso=caso)} \
+                for metodo in parte['metodos'] for caso in parte['casos']]
+
+    for trabajo in ejecutar(trabajos):
+        print(trabajo['nombre'],trabajo['periodo'],trabajo['ruta'])
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+
+# Tarea numérica - Ecuaciones Diferenciales Ordinarias
+
+# Nombre: Diego Alonso Sánchez Manríquez
+# RUT: 19.957.060-9
+
+# Módulo con el retrato de fases completo en el plano (a,m), como
+# extensión de graficarB(). No ejecuta nada al ser importado.
+
+#Librerías importadas
+import numpy as np #usada para resolver vectorialmente
+import matplotlib.pyplot as plt #usada para graficar
+from integradores import campo, jacobiano #lado derecho y sus derivadas
+from runge_kutta import runge_kutta #integra muchos sistemas a la vez
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función campo_fases()
+
+  Motivación
+  - Evaluar el lado derecho en toda una malla del plano (a,m) con
+    una sola llamada, para dibujar flechas o líneas de flujo.
+
+  Parámetros
+  - cte (dict): diccionario con constantes usadas
+  - puntos (int): cantidad de puntos por eje
+
+  Funcionamiento
+  - Se entregan cuatro arreglos (A,M,dA,dM) de forma (puntos,puntos),
+    con s=1-a-m en cada punto. Fuera del triángulo a+m<=1 las
+    derivadas son nan, pues esos estados no tienen sentido físico.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def campo_fases(cte,puntos=25):
+
+    #Condiciones de los parámetros
+    assert type(cte)==dict
+    assert type(puntos)==int and puntos>1
+
+    #Malla del plano (a,m)
+    A,M = np.meshgrid(np.linspace(0,1,puntos),np.linspace(0,1,puntos))
+
+    #Se evalúa el sistema en todos los puntos a la vez
+    d = campo(np.stack((A,M,1-A-M)),cte)
+
+    #Fuera del triángulo no hay flujo
+    fuera = A+M>1+1e-12
+    d[:,fuera] = np.nan
+
+    return A,M,d[0],d[1]
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función nulclinas()
+
+  Motivación
+  - Obtener las curvas donde da/dt=0 y dm/dt=0.
+
+  Parámetros
+  - cte (dict): diccionario con constantes usadas
+  - puntos (int): cantidad de valores de m
+
+  Funcionamiento
+  - Con s=1-a-m ambas curvas se pueden despejar como a en función
+    de m:
+    da/dt=0: a = (1-m)/(1+k1*m**2)
+    dm/dt=0: a = k2*(1-m)/(k1*m**(2-alpha)+k2) (además de m=0)
+  - Se entrega un diccionario con los valores de 'm' y los de a en
+    cada curva, 'da' (da/dt=0) y 'dm' (dm/dt=0).
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def nulclinas(cte,puntos=400):
+
+    k1 = cte['k1']; k2 = cte['k2']; alpha = cte['alpha']
+
+    m = np.linspace(0,1,puntos)[1:]
+
+    return {'m':m,'da':(1-m)/(1+k1*m**2),\
+            'dm':k2*(1-m)/(k1*m**(2-alpha)+k2)}
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función puntos_fijos()
+
+  Motivación
+  - Encontrar los equilibrios del sistema en el plano (a,m) y saber
+    si atraen o repelen.
+
+  Parámetros
+  - cte (dict): diccionario con constantes usadas
+
+  Funcionamiento
+  - Las nulclinas de nulclinas() se cortan en m=1 (a=0) y en
+    m=k2**(-1/alpha), y la de da/dt corta a m=0 en a=1. Se entregan
+    los puntos dentro del triángulo como diccionarios con 'a', 'm',
+    's', 'valores' (valores propios del jacobiano reducido a (a,m),
+    con s=1-a-m) y 'tipo' ('atractor', 'repulsor', 'silla' o 'no
+    hiperbólico').
+
+  Consideración
+  - Si un valor propio tiene parte real nula (como en a=1, m=0,
+    donde uno es 0), la linealización no decide si el punto atrae o
+    repele, y el tipo es 'no hiperbólico'.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def puntos_fijos(cte):
+
+    k1 = cte['k1']; k2 = cte['k2']; alpha = cte['alpha']
+
+    #Equilibrios en los bordes y el interior
+    m_int = k2**(-1/alpha)
+    candidatos = [(1.0,0.0),(0.0,1.0),((1-m_int)/(1+k1*m_int**2),m_int)]
+
+    puntos = []
+    for a,m in candidatos:
+        if a<0 or m<0 or a+m>1+1e-12 or \
+           any(abs(a-p['a'])+abs(m-p['m'])<1e-12 for p in puntos):
+            continue
+
+        #Jacobiano reducido (regla de la cadena con s=1-a-m)
+        J = jacobiano(a,m,max(1-a-m,0.0),cte)
+        valores = np.linalg.eigvals(J[:2,:2]-J[:2,2:])
+
+        #Tipo según el signo de la parte real
+        if np.any(np.abs(valores.real)<=1e-12*max(np.abs(valores).max(),1)):
+            tipo = 'no hiperbólico'
+        elif np.all(valores.real<0):
+            tipo = 'atractor'
+        elif np.all(valores.real>0):
+            tipo = 'repulsor'
+        else:
+            tipo = 'silla'
+
+        puntos += [{'a':a,'m':m,'s':max(1-a-m,0.0),'valores':valores,'tipo':tipo}]
+
+    return puntos
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función retrato_fases()
+
+  Motivación
+  - Reunir todo lo necesario para el retrato de fases de un caso:
+    campo, trayectorias desde muchas condiciones iniciales,
+    nulclinas y puntos fijos.
+
+  Parámetros
+  - cte (dict): diccionario con constantes usadas (a0 y m0 no se
+    usan, se reemplazan por las condiciones iniciales)
+  - T (int): extremo superior del intervalo a analizar
+  - dt (float): paso de tiempo
+  - puntos (int): puntos por eje de campo_fases()
+  - condiciones (int): condiciones iniciales por eje
+  - tabla (str): tabla de runge_kutta()
+
+  Funcionamiento
+  - Las condiciones iniciales forman una malla dentro del triángulo
+    a+m<1 y se integran todas juntas con runge_kutta(), por lo que
+    cada paso cuesta casi lo mismo que para una sola trayectoria.
+  - Se entrega un diccionario con 'campo' (salida de campo_fases()),
+    'a' y 'm' (trayectorias, de forma (N+1,k)), 'nulclinas' y
+    'puntos_fijos'.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def retrato_fases(cte,T=50,dt=0.01,puntos=25,condiciones=6,tabla='rk4'):
+
+    #Condiciones de los parámetros
+    assert type(cte)==dict
+    assert type(T)==int
+    assert type(dt)==float
+    assert type(condiciones)==int and condiciones>0
+
+    #Condiciones iniciales dentro del triángulo
+    valores = np.linspace(0.05,0.9,condiciones)
+    a0,m0 = np.meshgrid(valores,valores)
+    dentro = a0+m0<0.95
+    iniciales = dict(cte)
+    iniciales['a0'] = a0[dentro]; iniciales['m0'] = m0[dentro]
+
+    #Todas las trayectorias a la vez
+    with np.errstate(invalid='ignore',over='ignore'):
+        t,a,m,s = runge_kutta(T,dt,iniciales,tabla)
+
+    return {'campo':campo_fases(cte,puntos),'a':a,'m':m,\
+            'nulclinas':nulclinas(cte),'puntos_fijos':puntos_fijos(cte)}
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función graficar_fases()
+
+  Motivación
+  - Graficar el retrato de fases de un caso en el plano (a,m), con
+    el mismo formato que graficarB().
+
+  Parámetros
+  - retrato (dict): diccionario entregado por retrato_fases()
+  - caso (str): nombre del caso
+  - estilo (str): 'flechas' (quiver) o 'lineas' (streamplot)
+  - ruta (str): archivo donde se guarda la figura (opcional)
+
+  Funcionamiento
+  - Se dibujan el campo, las trayectorias, las nulclinas (líneas
+    discontinuas) y los puntos fijos (círculos llenos si atraen,
+    vacíos si no). Se entregan la figura y los ejes de matplotlib.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def graficar_fases(retrato,caso,estilo='flechas',ruta=None):
+
+    #Condiciones de los parámetros
+    assert type(caso)==str
+    assert estilo in ('flechas','lineas')
+
+    #Creación del lienzo
+    fig, ax = plt.subplots(figsize=(12,6))
+
+    #Campo
+    A,M,dA,dM = retrato['campo']
+    if estilo=='flechas':
+        norma = np.hypot(dA,dM)
+        norma[norma==0] = 1
+        ax.quiver(A,M,dA/norma,dM/norma,color='0.6',angles='xy')
+    else:
+        ax.streamplot(A,M,dA,dM,color='0.6',density=1.2)
+
+    #Trayectorias
+    ax.plot(retrato['a'],retrato['m'],linewidth=0.8)
+
+    #Nulclinas
+    n = retrato['nulclinas']
+    ax.plot(n['da'],n['m'],'k--',label="da/dt = 0")
+    ax.plot(n['dm'],n['m'],'k-.',label="dm/dt = 0")
+    ax.plot([0,1],[0,0],'k-.')
+
+    #Puntos fijos (una entrada en la leyenda por tipo)
+    tipos = set()
+    for p in retrato['puntos_fijos']:
+        ax.plot(p['a'],p['m'],'o',color='k',markersize=9,\
+                markerfacecolor='k' if p['tipo']=='atractor' else 'w',\
+                label=None if p['tipo'] in tipos else "Punto fijo (%s)" % p['tipo'])
+        tipos.add(p['tipo'])
+
+    #Etiquetas
+    ax.set_xlabel("Fracción de masa de gas atómico a(t)",labelpad=20)
+    ax.set_ylabel("Fracción de masa de gas molecular m(t)",labelpad=20)
+
+    #Título
+    ax.set_title(f"Retrato de fases en el plano (a,m) ({caso})",\
+                 fontweight="bold", loc='center',pad=20)
+
+    #Configuraciones
+    ax.grid(True, which='major', axis='both')
+    ax.set_xlim(-0.05,1.05)
+    ax.set_ylim(-0.05,1.05)
+
+    # Leyendas
+    ax.legend()
+
+    #Guardado de figura
+    if ruta is not None:
+        fig.savefig(ruta)
+
+    return fig,ax
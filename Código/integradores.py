@@ -0,0 +1,1773 @@
+# -*- coding: utf-8 -*-
+
+# Tarea numérica - Ecuaciones Diferenciales Ordinarias
+
+# Nombre: Diego Alonso Sánchez Manríquez
+# RUT: 19.957.060-9
+
+# Módulo con los integradores compartidos por las partes A-E. A
+# diferencia de los scripts, no ejecuta nada al ser importado.
+
+#Librerías importadas
+import copy #usada para no modificar los puntos de control al reanudar
+import os #usada para reemplazar los puntos de control sin corromperlos
+import pickle #usada para guardar los puntos de control
+import numpy as np #usada para resolver vectorialmente
+from scipy.integrate import solve_ivp #usada para integrar con RKF
+from scipy.interpolate import PchipInterpolator #pendientes de SalidaDensa
+from almacenamiento import SalidaMemmap, SalidaAnillo #salidas de los integradores
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ funciones dadt() dmdt() dsdt()
+
+  Motivación
+  - Simplificar la llamada de las funciones del lado derecho de cada
+    EDO asociada al modelo simple de formación de estrellas.
+
+  Parámetros
+  - a (float): fracción de masa de gas atómico
+  - m (float): fracción de masa de gas molecular
+  - s (float): fracción de masa de estrellas activas
+  - cte (dict): diccionario con constantes usadas
+
+  Funcionamiento
+  - Al ingresar los parámetros, se entrega la evaluación de estos
+    en la respectiva función asociada a la EDO.
+
+  Consideraciones
+  - dadt() corresponde al lado derecho de la EDO asociada a da/dt
+  - dmdt() corresponde al lado derecho de la EDO asociada a dm/dt
+  - dsdt() corresponde al lado derecho de la EDO asociada a ds/dt
+
+  Nota: se despejó la función del lado derecho asociada a ds/dt a
+  partir de la relación entregada en el enunciado. Esto se hizo
+  así, ya que al usar directamente s=1-a-m se obtenían valores
+  complejos por errores de cómputo.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def dadt(a,m,s,cte):
+
+    #Condiciones de los parámetros
+    assert type(a)==float
+    assert type(m)==float
+    assert type(s)==float
+    assert type(cte)==dict
+
+    #Se entrega la evaluación
+    return s - a*cte['k1']*m**2
+
+def dmdt(a,m,s,cte):
+
+    #Condiciones de los parámetros
+    assert type(a)==float
+    assert type(m)==float
+    assert type(s)==float
+    assert type(cte)==dict
+
+    #Se entrega la evaluación
+    return a*cte['k1']*m**2 - cte['k2']*s*m**cte['alpha']
+
+def dsdt(m,s,cte):
+
+    #Condiciones de los parámetros
+    assert type(m)==float
+    assert type(s)==float
+    assert type(cte)==dict
+
+    #Se entrega la evaluación
+    return -s + cte['k2']*s*m**cte['alpha']
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función campo()
+
+  Motivación
+  - Evaluar el lado derecho de las tres EDO's de una vez y con
+    arreglos, para muchos estados o muchos sistemas a la vez.
+
+  Parámetros
+  - ams (array): estados (a,m,s), de forma (3,) o (3,n)
+  - cte (dict): diccionario con constantes usadas. Cada constante
+    puede ser un número o un arreglo de largo n (un valor por
+    sistema)
+  - out (array): arreglo donde se guarda el resultado (opcional)
+
+  Funcionamiento
+  - Se entrega un arreglo de la misma forma que ams con da/dt, dm/dt
+    y ds/dt en sus tres filas, igual que dadt(), dmdt() y dsdt().
+
+  Consideración
+  - Con arreglos, una base negativa en m**alpha entrega nan (no un
+    complejo), por lo que el error queda a la vista en la solución.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def campo(ams,cte,out=None):
+
+    #Condiciones de los parámetros
+    assert type(cte)==dict
+
+    #Se separan los valores
+    a,m,s = ams
+
+    if out is None:
+        out = np.empty(np.shape(ams))
+
+    #Flujos a->m y m->s
+    am = cte['k1']*a*m**2
+    ms = cte['k2']*s*m**cte['alpha']
+
+    #Se entrega la evaluación
+    out[0] = s - am
+    out[1] = am - ms
+    out[2] = ms - s
+    return out
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función jacobiano()
+
+  Motivación
+  - Obtener las derivadas parciales del lado derecho del sistema,
+    para estudiar su estabilidad local.
+
+  Parámetros
+  - a (float): fracción de masa de gas atómico
+  - m (float): fracción de masa de gas molecular
+  - s (float): fracción de masa de estrellas activas
+  - cte (dict): diccionario con constantes usadas
+
+  Funcionamiento
+  - Se entrega la matriz de 3x3 (np.array) cuya fila i y columna j
+    es la derivada de la EDO i (da/dt, dm/dt, ds/dt) respecto a la
+    variable j (a, m, s).
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def jacobiano(a,m,s,cte):
+
+    #Condiciones de los parámetros
+    assert type(cte)==dict
+
+    k1 = cte['k1']; k2 = cte['k2']; alpha = cte['alpha']
+
+    #Términos que se repiten
+    m_alpha = m**alpha
+    dm_alpha = alpha*m**(alpha-1) if m>0 else 0.0
+
+    #Se entrega la matriz
+    return np.array([[-k1*m**2, -2*k1*a*m, 1.0],
+                     [k1*m**2, 2*k1*a*m - k2*s*dm_alpha, -k2*m_alpha],
+                     [0.0, k2*s*dm_alpha, -1.0 + k2*m_alpha]])
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ funciones _paso_EP() _paso_RK4()
+
+  Motivación
+  - Separar un paso de cada método del ciclo que guarda los valores,
+    para poder retomar la integración desde cualquier punto.
+
+  Parámetros
+  - dt (float): paso de tiempo (medido en millones de años)
+  - a,m,s (float): estado actual del sistema
+  - cte (dict): diccionario con constantes usadas
+
+  Funcionamiento
+  - Se entrega el estado (a,m,s) un paso de tiempo después.
+
+  Nota: _paso_RK4() conserva la estructura por componente de
+  runge_kutta4() en los scripts, para obtener los mismos valores.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _paso_EP(dt,a,m,s,cte):
+    return (a + dt*dadt(a,m,s,cte),
+            m + dt*dmdt(a,m,s,cte),
+            s + dt*dsdt(m,s,cte))
+
+def _paso_RK4(dt,a,m,s,cte):
+
+    a1 = dadt(a,m,s,cte)
+    a2 = dadt(a+a1*dt/2,m+a1*dt/2,s+a1*dt/2,cte)
+    a3 = dadt(a+a2*dt/2,m+a2*dt/2,s+a2*dt/2,cte)
+    a4 = dadt(a+a3*dt/2,m+a3*dt/2,s+a3*dt/2,cte)
+
+    m1 = dmdt(a,m,s,cte)
+    m2 = dmdt(a+m1*dt/2,m+m1*dt/2,s+m1*dt/2,cte)
+    m3 = dmdt(a+m2*dt/2,m+m2*dt/2,s+m2*dt/2,cte)
+    m4 = dmdt(a+m3*dt/2,m+m3*dt/2,s+m3*dt/2,cte)
+
+    s1 = dsdt(m,s,cte)
+    s2 = dsdt(m+s1*dt/2,s+s1*dt/2,cte)
+    s3 = dsdt(m+s2*dt/2,s+s2*dt/2,cte)
+    s4 = dsdt(m+s3*dt/2,s+s3*dt/2,cte)
+
+    return (a + (a1+2*a2+2*a3+a4)*dt/6,
+            m + (m1+2*m2+2*m3+m4)*dt/6,
+            s + (s1+2*s2+2*s3+s4)*dt/6)
+
+#Pasos disponibles según el nombre del método
+_PASOS = {'EP':_paso_EP,'RK4':_paso_RK4}
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ funciones _proyectar() _paso_EP_reducido() _paso_RK4_reducido()
+
+  Motivación
+  - Integrar solo (a,m) usando la relación a+m+s=1, con una
+    reconstrucción de s que no produzca valores complejos.
+
+  Parámetros
+  - dt (float): paso de tiempo (medido en millones de años)
+  - a,m,s (float): estado actual del sistema, ya proyectado
+  - cte (dict): diccionario con constantes usadas
+
+  Funcionamiento
+  - _proyectar() lleva (a,m) al conjunto a,m,s>=0 con a+m+s=1: se
+    recortan a y m a [0,1], si a+m>1 se normalizan, y s=1-a-m. Así
+    m**alpha nunca recibe una base negativa.
+  - Los pasos evalúan solo dadt() y dmdt(), proyectan cada estado
+    intermedio antes de evaluar y entregan (a,m) sin proyectar, para
+    que el ciclo pueda medir la corrección hecha (la deriva de la
+    restricción).
+
+  Nota: la reconstrucción directa s=1-a-m se había descartado por
+  los valores complejos (ver dadt()). Con la proyección se evita.
+  Además, _paso_RK4_reducido() usa las etapas acopladas del método
+  clásico (cada etapa avanza a y m con sus propias pendientes), por
+  lo que no reproduce los valores de runge_kutta4() completo.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _proyectar(a,m):
+
+    #Estado válido, solo se reconstruye s
+    if a>=0.0 and m>=0.0 and a+m<=1.0:
+        return a,m,1.0-a-m
+
+    #Fracciones dentro de [0,1]
+    a = min(max(a,0.0),1.0)
+    m = min(max(m,0.0),1.0)
+
+    #Se normalizan si suman más que 1
+    if a+m>1.0:
+        total = a+m
+        a = a/total
+        m = m/total
+
+    return a,m,max(1.0-a-m,0.0)
+
+def _paso_EP_reducido(dt,a,m,s,cte):
+    return (a + dt*dadt(a,m,s,cte),
+            m + dt*dmdt(a,m,s,cte))
+
+def _paso_RK4_reducido(dt,a,m,s,cte):
+
+    def _f(a,m):
+        a,m,s = _proyectar(a,m)
+        return dadt(a,m,s,cte),dmdt(a,m,s,cte)
+
+    a1,m1 = dadt(a,m,s,cte),dmdt(a,m,s,cte)
+    a2,m2 = _f(a+a1*dt/2,m+m1*dt/2)
+    a3,m3 = _f(a+a2*dt/2,m+m2*dt/2)
+    a4,m4 = _f(a+a3*dt,m+m3*dt)
+
+    return (a + (a1+2*a2+2*a3+a4)*dt/6,
+            m + (m1+2*m2+2*m3+m4)*dt/6)
+
+#Pasos de la formulación reducida según el nombre del método
+_PASOS_REDUCIDOS = {'EP':_paso_EP_reducido,'RK4':_paso_RK4_reducido}
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ funciones _paso_EP_positivo() _paso_RK4_positivo()
+
+  Motivación
+  - Avanzar un paso sin que a, m o s se vuelvan negativos, para que
+    el paso de tiempo dependa de la precisión y no de evitar bases
+    negativas en m**alpha.
+
+  Parámetros
+  - dt (float): paso de tiempo (medido en millones de años)
+  - a,m,s (float): estado actual del sistema
+  - cte (dict): diccionario con constantes usadas
+  - registro (dict): si se entrega, se suman en 'rechazos' los
+    pasos que se tuvieron que dividir
+
+  Funcionamiento
+  - _paso_EP_positivo() es el método de Euler modificado de Patankar.
+    El sistema se escribe como los flujos s->a (s), a->m (k1*a*m**2)
+    y m->s (k2*s*m**alpha), y cada flujo se pondera por el cociente
+    entre el valor nuevo y el actual de la especie que lo pierde.
+    Queda un sistema lineal de 3x3 que se resuelve directamente y
+    cuya solución es positiva y conserva a+m+s para cualquier dt.
+  - _paso_RK4_positivo() usa las etapas acopladas del método clásico.
+    Si alguna etapa o el resultado tiene una fracción negativa, se
+    rechaza el paso y se repite como dos pasos de dt/2. Tras 20
+    divisiones se usa un paso de _paso_EP_positivo().
+
+  Consideración
+  - Como a+m+s se conserva y las tres son positivas, también quedan
+    en [0,1].
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _paso_EP_positivo(dt,a,m,s,cte,registro=None):
+
+    #Coeficientes de cada flujo (flujo*dt/especie que lo pierde)
+    c_sa = dt
+    c_am = dt*cte['k1']*m**2
+    c_ms = dt*cte['k2']*s*m**(cte['alpha']-1) if m>0.0 else 0.0
+
+    #Diagonal del sistema lineal
+    A = 1+c_am; M = 1+c_ms; S = 1+c_sa
+
+    #Se resuelve el sistema despejando s, luego m y luego a
+    s_nuevo = (s + c_ms/M*(m + c_am*a/A))/(S - c_ms*c_am*c_sa/(M*A))
+    a_nuevo = (a + c_sa*s_nuevo)/A
+    m_nuevo = (m + c_am*a_nuevo)/M
+
+    return a_nuevo,m_nuevo,s_nuevo
+
+def _paso_RK4_positivo(dt,a,m,s,cte,registro=None,divisiones=0):
+
+    def _f(a,m,s):
+        return dadt(a,m,s,cte),dmdt(a,m,s,cte),dsdt(m,s,cte)
+
+    def _dividir():
+
+        #Después de muchas divisiones se usa Patankar
+        if divisiones>=20:
+            return _paso_EP_positivo(dt,a,m,s,cte)
+
+        if registro is not None:
+            registro['rechazos'] = registro.get('rechazos',0)+1
+
+        #Dos pasos de dt/2
+        estado = _paso_RK4_positivo(dt/2,a,m,s,cte,registro,divisiones+1)
+        return _paso_RK4_positivo(dt/2,*estado,cte,registro,divisiones+1)
+
+    #Etapas acopladas, revisando que sean positivas antes de evaluar
+    a1,m1,s1 = _f(a,m,s)
+    etapa = (a+a1*dt/2,m+m1*dt/2,s+s1*dt/2)
+    if min(etapa)<0.0:
+        return _dividir()
+
+    a2,m2,s2 = _f(*etapa)
+    etapa = (a+a2*dt/2,m+m2*dt/2,s+s2*dt/2)
+    if min(etapa)<0.0:
+        return _dividir()
+
+    a3,m3,s3 = _f(*etapa)
+    etapa = (a+a3*dt,m+m3*dt,s+s3*dt)
+    if min(etapa)<0.0:
+        return _dividir()
+
+    a4,m4,s4 = _f(*etapa)
+    nuevo = (a + (a1+2*a2+2*a3+a4)*dt/6,
+             m + (m1+2*m2+2*m3+m4)*dt/6,
+             s + (s1+2*s2+2*s3+s4)*dt/6)
+    if min(nuevo)<0.0:
+        return _dividir()
+
+    return nuevo
+
+#Pasos que conservan la positividad según el nombre del método
+_PASOS_POSITIVOS = {'EP':_paso_EP_positivo,'RK4':_paso_RK4_positivo}
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ funciones guardar_punto_control() cargar_punto_control()
+
+  Motivación
+  - Guardar en disco el estado de una integración larga para no
+    repetir el trabajo ya hecho si se interrumpe o se extiende.
+
+  Parámetros
+  - punto (dict): punto de control entregado por un integrador
+  - ruta (str): archivo donde se guarda (o desde donde se carga)
+
+  Funcionamiento
+  - Un punto de control es un diccionario con las llaves:
+    'metodo' ('EP', 'RK4' o 'RKF'), 'cte', 'dt', 'T', 't' (último
+    tiempo), 'estado' (último (a,m,s)), 'control' (estado del
+    control de paso, solo para RKF) y 'trayectoria' (t,a,m,s).
+  - Si la trayectoria se guarda con SalidaMemmap, 'trayectoria' es
+    None y en su lugar se guardan 'salida' (carpeta) y 'largo'.
+  - Los integradores guardan la trayectoria en memoria en un archivo
+    aparte, ruta+'.tray', al que cada punto de control solo le agrega
+    los valores nuevos (ver _guardar_punto()). En el punto queda
+    'trayectoria' como None y 'diario' con el archivo, la cantidad de
+    valores y los bytes válidos; cargar_punto_control() la reconstruye.
+    Así el costo total de los puntos de control crece como N y no
+    como N**2.
+  - En 'opciones' se guardan las opciones del integrador (por
+    ejemplo 'reducido'), para reanudar de la misma forma.
+  - Se escribe primero a un archivo temporal y luego se reemplaza,
+    así un corte a mitad de escritura no daña el punto anterior.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def guardar_punto_control(punto,ruta):
+
+    #Condiciones de los parámetros
+    assert type(punto)==dict
+    assert type(ruta)==str
+
+    #Se escribe en un temporal y se reemplaza el archivo
+    with open(ruta+'.tmp','wb') as archivo:
+        pickle.dump(punto,archivo,protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(ruta+'.tmp',ruta)
+
+def cargar_punto_control(ruta):
+
+    #Condiciones de los parámetros
+    assert type(ruta)==str
+
+    with open(ruta,'rb') as archivo:
+        punto = pickle.load(archivo)
+
+    #Se reconstruye la trayectoria desde sus tramos, si se guardó aparte
+    diario = punto.get('diario')
+    if diario is not None and punto.get('trayectoria') is None:
+        tramos = []
+        with open(ruta+'.tray','rb') as archivo:
+            while archivo.tell()<diario['bytes']:
+                tramos += [pickle.load(archivo)]
+        punto['trayectoria'] = tuple(np.concatenate(tramos,axis=1)[:,:diario['largo']])
+
+    #Se entrega el diccionario guardado
+    return punto
+
+def _punto_control(metodo,T,dt,cte,trayectoria,control,salida,opciones):
+
+    punto = {'metodo':metodo,'cte':dict(cte),'dt':dt,'T':T,
+             'control':control,'trayectoria':trayectoria,
+             'opciones':dict(opciones)}
+
+    #Trayectoria en memoria
+    if salida is None:
+        t,a,m,s = trayectoria
+        punto['t'] = t[-1]; punto['estado'] = (a[-1],m[-1],s[-1])
+        return punto
+
+    #Trayectoria en disco, se escribe lo pendiente antes de guardar
+    salida.vaciar()
+    t,a,m,s = salida.ultimo()
+    punto['t'] = t; punto['estado'] = (a,m,s)
+    punto['salida'] = salida.carpeta; punto['largo'] = salida.largo
+    if isinstance(salida,SalidaAnillo):
+        punto['anillo'] = salida
+    return punto
+
+def _guardar_punto(punto,ruta,diario):
+
+    #Trayectoria en disco, ya escrita por la salida
+    if punto['trayectoria'] is None:
+        guardar_punto_control(punto,ruta)
+        return diario
+
+    #Si se cambió de archivo, se escribe la trayectoria completa
+    if diario is None or diario['archivo']!=ruta+'.tray':
+        diario = {'archivo':ruta+'.tray','largo':0,'bytes':0}
+
+    #Se agregan solo los valores nuevos, descartando lo escrito después
+    #del último punto de control
+    i = diario['largo']
+    tramo = np.array([x[i:] for x in punto['trayectoria']],dtype=float)
+    with open(diario['archivo'],'r+b' if diario['bytes']>0 else 'wb') as archivo:
+        archivo.seek(diario['bytes'])
+        archivo.truncate()
+        pickle.dump(tramo,archivo,protocol=pickle.HIGHEST_PROTOCOL)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+        diario = {'archivo':diario['archivo'],'largo':i+tramo.shape[1],\
+                  'bytes':archivo.tell()}
+
+    #El punto queda con el diario en lugar de la trayectoria
+    punto = dict(punto,trayectoria=None,diario=diario)
+    guardar_punto_control(punto,ruta)
+    return diario
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ clase FallaNumerica y funciones _tolerancias() _salud()
+                                    _salud_conjunto() _vigilar_RKF()
+                                    _fallar()
+
+  Motivación
+  - Detener una corrida apenas su solución deja de tener sentido
+    (por ejemplo, m negativo hace que m**alpha sea complejo o nan),
+    en lugar de seguir miles de pasos inútiles y fallar después en
+    periodo().
+
+  Parámetros
+  - a,m,s (float): estado después de un paso
+  - y (array): estados de n sistemas, de forma (3,n) (o con una fila
+    por especie, para las redes de redes.py)
+  - vigilar (float o tuple): opción "vigilar" de los integradores
+  - rango (float): cuánto pueden salir a, m y s de [0,1]
+  - deriva (float): cuánto puede alejarse a+m+s de 1 (o None para
+    no revisarlo)
+  - negativos (array): para cada sistema, si alguna etapa del último
+    paso tuvo una fracción negativa (opcional)
+
+  Funcionamiento
+  - _tolerancias() entrega (rango,deriva) a partir de "vigilar": un
+    número es solo el rango, y una tupla (rango,deriva) agrega la
+    revisión de a+m+s.
+  - _salud() entrega el motivo de la falla ('complejo', 'nan',
+    'inf', 'fuera' o 'deriva') o None si el estado está bien.
+  - _salud_conjunto() hace lo mismo para n sistemas a la vez y
+    entrega un arreglo de largo n con el índice del motivo en
+    MOTIVOS, o -1 si el sistema está bien. Con arreglos reales,
+    m**alpha de una base negativa entrega nan en lugar de un
+    complejo, por lo que un nan de un sistema con alguna etapa
+    negativa (ver "negativos") se informa como 'complejo'. Si y es
+    complejo, se informan así los sistemas con parte imaginaria.
+  - _vigilar_RKF() revisa con _salud_conjunto() los tiempos
+    entregados por solve_ivp (t, y de forma (3,n)) y lanza
+    FallaNumerica en el primero que falla. Su 'paso' es el índice de
+    ese tiempo.
+  - _fallar() guarda el diagnóstico en registro['falla'] (si se
+    entrega registro) y lanza FallaNumerica.
+  - FallaNumerica es la excepción lanzada por los integradores. Su
+    atributo "diagnostico" es un diccionario con 'motivo', 'metodo',
+    't', 'paso' y 'estado' (el (a,m,s) que falló). Como hereda de
+    FloatingPointError, la atrapan los mismos except que ya
+    consideran errores de cómputo (por ejemplo en comparar()).
+
+  Consideración
+  - El rango y la deriva van por separado, pues runge_kutta4() usa
+    etapas por componente que no conservan a+m+s: con dt=0.001 la
+    deriva llega a 0.08 en soluciones sanas de las partes D y E, y
+    a alcanza 1.04. Con ese método conviene un rango de 0.05, y la
+    deriva solo se revisa si se pide.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+MOTIVOS = ('complejo','nan','inf','fuera','deriva')
+
+class FallaNumerica(FloatingPointError):
+
+    def __init__(self,diagnostico):
+        super().__init__('%s en t=%g (paso %d)' % (diagnostico['motivo'],\
+                         diagnostico['t'],diagnostico['paso']))
+        self.diagnostico = diagnostico
+
+def _tolerancias(vigilar):
+
+    if vigilar is None:
+        return None
+    if np.ndim(vigilar)==0:
+        assert vigilar>0
+        return float(vigilar),None
+
+    rango,deriva = vigilar
+    assert rango>0 and (deriva is None or deriva>0)
+    return rango,deriva
+
+def _salud(a,m,s,rango,deriva=None):
+
+    if isinstance(a,complex) or isinstance(m,complex) or isinstance(s,complex):
+        return 'complejo'
+
+    #Revisión rápida (nan no cumple ninguna comparación)
+    tope = 1+rango
+    if -rango<=a<=tope and -rango<=m<=tope and -rango<=s<=tope and \
+       (deriva is None or abs(a+m+s-1)<=deriva):
+        return None
+
+    #Motivo, del más grave al menos grave
+    if a!=a or m!=m or s!=s:
+        return 'nan'
+    if abs(a)==np.inf or abs(m)==np.inf or abs(s)==np.inf:
+        return 'inf'
+    if min(a,m,s)<-rango or max(a,m,s)>tope:
+        return 'fuera'
+    return 'deriva'
+
+def _salud_conjunto(y,rango,deriva=None,negativos=None):
+
+    motivo = np.full(y.shape[1],-1)
+
+    #Sistemas con parte imaginaria
+    complejo = np.zeros(y.shape[1],dtype=bool)
+    if np.iscomplexobj(y):
+        complejo = (y.imag!=0).any(axis=0)
+        y = y.real
+
+    #Revisión rápida, fila por fila (nan no cumple ninguna comparación)
+    with np.errstate(invalid='ignore'):
+        menor = y[0].copy(); mayor = y[0].copy()
+        for fila in y[1:]:
+            np.minimum(menor,fila,out=menor)
+            np.maximum(mayor,fila,out=mayor)
+        bien = (menor>=-rango) & (mayor<=1+rango) & ~complejo
+        if deriva is not None:
+            bien &= np.abs(y.sum(axis=0)-1)<=deriva
+    if bien.all():
+        return motivo
+
+    #Motivo de los que fallan, del más grave al menos grave
+    malos = np.nonzero(~bien)[0]
+    x = y[:,malos]
+    nan = np.isnan(x).any(axis=0)
+    complejo = complejo[malos]
+    if negativos is not None:
+        complejo = complejo | (nan & negativos[malos])
+    with np.errstate(invalid='ignore'):
+        fuera = (x<-rango).any(axis=0) | (x>1+rango).any(axis=0)
+    motivo[malos] = np.select([complejo,nan,np.isinf(x).any(axis=0),fuera],\
+                              [0,1,2,3],4)
+    return motivo
+
+def _vigilar_RKF(t,y,tolerancias,registro):
+
+    #Se revisan todos los tiempos entregados de una vez
+    motivo = _salud_conjunto(y,*tolerancias)
+    if (motivo<0).all():
+        return
+
+    #Primer tiempo con falla
+    j = int(np.argmax(motivo>=0))
+    _fallar(MOTIVOS[motivo[j]],'RKF',float(t[j]),j,\
+            tuple(float(x) for x in y[:,j]),registro)
+
+def _fallar(motivo,metodo,t,paso,estado,registro):
+
+    diagnostico = {'motivo':motivo,'metodo':metodo,'t':t,'paso':paso,\
+                   'estado':estado}
+    if registro is not None:
+        registro['falla'] = diagnostico
+    raise FallaNumerica(diagnostico)
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ funciones _inicio() _avanzar()
+
+  Motivación
+  - Ciclo común a Euler progresivo y Runge-Kutta 4, que agrega
+    valores a la trayectoria entregada hasta completar N pasos.
+  - _inicio() pasa la condición inicial a la salida en disco, si se
+    usa, antes de comenzar el ciclo.
+
+  Parámetros
+  - metodo (str): 'EP' o 'RK4'
+  - T (int): extremo superior del intervalo a analizar
+  - dt (float): paso de tiempo (medido en millones de años)
+  - cte (dict): diccionario con constantes usadas
+  - trayectoria (tuple): listas (t,a,m,s) ya calculadas
+  - N (int): cantidad total de pasos
+  - cada (int): pasos entre puntos de control (o None)
+  - ruta (str): archivo de los puntos de control (o None)
+  - salida (SalidaMemmap o SalidaAnillo): si se entrega, los valores
+    se guardan en ella en lugar de en las listas, y trayectoria es
+    None
+  - opciones (dict): opciones del integrador ('reducido',
+    'positivo', 'vigilar' o 'vigilar_cada')
+  - registro (dict): si se entrega, se guarda en él la deriva máxima
+    de la restricción a+m+s=1 ('deriva'), si 'positivo', la
+    cantidad de pasos divididos ('rechazos') y, si la corrida se
+    detiene, el diagnóstico ('falla')
+  - diario (dict): archivo y largo de la trayectoria ya guardada por
+    el último punto de control (o None)
+
+  Consideración
+  - Sin la formulación reducida, la deriva es |a+m+s-1|. Con ella,
+    es la corrección hecha por _proyectar() en cada paso.
+  - Con 'vigilar' (ver _tolerancias()) el estado se revisa con
+    _salud() cada 'vigilar_cada' pasos (1 si no se entrega) y en el
+    último, y ante la primera falla se lanza FallaNumerica con el
+    estado que falló, su tiempo y su paso. Un AssertionError dentro
+    del paso (un valor complejo en dmdt()) se informa como
+    'complejo' en cualquier paso, con el estado desde el que se dio
+    el paso.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _inicio(trayectoria,salida):
+
+    #Sin salida en disco se usan las listas
+    if salida is None:
+        return trayectoria
+
+    #Se pasa la condición inicial a la salida
+    assert isinstance(salida,(SalidaMemmap,SalidaAnillo)) and salida.largo==0
+    salida.agregar(*(float(x[0]) for x in trayectoria))
+    return None
+
+def _avanzar(metodo,T,dt,cte,trayectoria,N,cada,ruta,salida=None,\
+             opciones=None,registro=None,diario=None):
+
+    opciones = opciones or {}
+    reducido = opciones.get('reducido',False)
+    positivo = opciones.get('positivo',False)
+    tolerancias = _tolerancias(opciones.get('vigilar'))
+    revisar = opciones.get('vigilar_cada',1)
+    deriva = 0.0
+
+    #Paso según la formulación
+    if reducido:
+        paso = _PASOS_REDUCIDOS[metodo]
+    elif positivo:
+        paso = _PASOS_POSITIVOS[metodo]
+    else:
+        paso = _PASOS[metodo]
+
+    #Último estado calculado
+    if salida is None:
+        t,a,m,s = trayectoria
+        ti,ai,mi,si = t[-1],a[-1],m[-1],s[-1]
+        inicio = len(t)-1
+    else:
+        ti,ai,mi,si = salida.ultimo()
+        inicio = salida.largo-1
+
+    #Se aplica el método guardando los valores
+    for i in range(inicio,N):
+        anterior = (ai,mi,si)
+
+        try:
+            #Formulación reducida, con s reconstruido
+            if reducido:
+                ar,mr = paso(dt,ai,mi,si,cte)
+                ai,mi,si = _proyectar(ar,mr)
+                if registro is not None:
+                    deriva = max(deriva,abs(ar-ai)+abs(mr-mi))
+
+            #Formulación con las tres ecuaciones
+            else:
+                if positivo:
+                    ai,mi,si = paso(dt,ai,mi,si,cte,registro)
+                else:
+                    ai,mi,si = paso(dt,ai,mi,si,cte)
+                if registro is not None:
+                    deriva = max(deriva,abs(ai+mi+si-1))
+            motivo = None
+            if tolerancias is not None and ((i+1)%revisar==0 or i+1==N):
+                motivo = _salud(ai,mi,si,*tolerancias)
+
+        #Valor complejo en una etapa del paso que parte de "anterior"
+        except AssertionError:
+            if tolerancias is None:
+                raise
+            _fallar('complejo',metodo,ti,i,anterior,registro)
+
+        ti = ti + dt
+
+        #Falla de la solución
+        if motivo is not None:
+            _fallar(motivo,metodo,ti,i+1,(ai,mi,si),registro)
+
+        if salida is None:
+            t += [ti]
+            a += [ai]
+            m += [mi]
+            s += [si]
+        else:
+            salida.agregar(ti,ai,mi,si)
+
+        #Punto de control periódico
+        if cada is not None and (i+1)%cada==0 and i+1<N:
+            diario = _guardar_punto(_punto_control(metodo,T,dt,cte,\
+                     trayectoria,None,salida,opciones),ruta,diario)
+
+    #Punto de control final, para poder extender el intervalo
+    if ruta is not None:
+        _guardar_punto(_punto_control(metodo,T,dt,cte,\
+                       trayectoria,None,salida,opciones),ruta,diario)
+
+    #Deriva de la restricción
+    if registro is not None:
+        registro['deriva'] = max(registro.get('deriva',0.0),deriva)
+
+    #Se entregan las soluciones al sistema de EDO's
+    if salida is not None:
+        return salida.vistas()
+    return trayectoria
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ clase Trayectoria
+
+  Motivación
+  - Entregar junto a la solución el paso de tiempo con que se
+    obtuvo, que con dt='auto' no se conoce antes de integrar.
+
+  Parámetros
+  - valores (tuple): listas o arreglos (t,a,m,s)
+  - dt (float): paso de tiempo usado
+
+  Funcionamiento
+  - Es una tupla de cuatro elementos, por lo que se recibe igual que
+    antes con t,a,m,s=euler_progresivo(), y además tiene el atributo
+    "dt".
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+class Trayectoria(tuple):
+
+    def __new__(cls,valores,dt=None):
+        trayectoria = super().__new__(cls,valores)
+        trayectoria.dt = dt
+        return trayectoria
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función euler_progresivo()
+
+  Motivación
+  - Utilizar el método de Euler (progresivo) para resolver el sistema
+    de EDO's asociado a las funciones a(t), m(t) y s(t).
+
+  Parámetros
+  - T (int): extremo superior del intervalo a analizar
+  - dt (float o 'auto'): paso de tiempo (medido en millones de años)
+  - cte (dict): diccionario con constantes usadas
+  - cada (int): pasos entre puntos de control (opcional)
+  - ruta (str): archivo donde se guardan los puntos de control
+    (opcional)
+  - salida (SalidaMemmap o SalidaAnillo): guarda la trayectoria en
+    disco o solo sus últimos valores (opcional)
+  - reducido (bool): integra solo (a,m) y reconstruye s=1-a-m
+    (opcional)
+  - positivo (bool): usa un paso que mantiene a,m,s en [0,1]
+    (opcional)
+  - registro (dict): recibe la deriva de a+m+s=1 y el dt usado
+    (opcional)
+  - denso (bool): guarda en registro['denso'] una SalidaDensa de la
+    solución, con pendientes='datos' (opcional)
+  - vigilar (float o tuple): tolerancia del rango, o (rango,
+    deriva), para detener la corrida si la solución falla (opcional)
+  - vigilar_cada (int): pasos entre revisiones de "vigilar"
+    (opcional)
+
+  Funcionamiento
+  - Al llamar la función, se entregan cuatro listas (t,a,m,s) que
+    corresponden a la solución numérica del sistema de EDO's.
+  - Con dt='auto' se usa el paso entregado por paso_estable() con
+    corridas piloto de hasta 20 millones de años, validado con la
+    misma formulación (reducido o positivo) que se pidió. El paso
+    usado queda en el atributo "dt" de la solución (ver
+    Trayectoria) y en registro['dt'].
+  - Si se entrega "ruta", se guarda un punto de control cada "cada"
+    pasos y otro al terminar. Con reanudar() se continúa desde él.
+  - Si se entrega "salida", los valores se escriben en disco a medida
+    que se calculan y se entregan sus vistas (np.memmap) en lugar de
+    listas. Con una SalidaAnillo se conservan solo los últimos
+    valores, y el periodo se obtiene con salida.resumen().
+  - Con reducido=True se evalúan solo dadt() y dmdt() sobre el estado
+    proyectado por _proyectar(), y s se reconstruye en cada paso. Se
+    entregan igualmente las cuatro listas.
+  - Con positivo=True se usa el método de Euler modificado de
+    Patankar (ver _paso_EP_positivo()), que nunca entrega fracciones
+    negativas, sea cual sea dt.
+  - Con denso=True la solución en cualquier tiempo se obtiene
+    después con registro['denso'](t) (ver SalidaDensa).
+  - Con "vigilar", si algún estado es complejo, nan o infinito, si
+    a, m o s salen de [0,1] en más del rango o, si se entrega la
+    deriva, si a+m+s se aleja de 1 en más de ella, se detiene la
+    corrida con FallaNumerica, cuyo diagnóstico también queda en
+    registro['falla']. El estado se revisa en cada paso, o cada
+    vigilar_cada pasos y en el último si se entrega (una revisión
+    cuesta cerca de un tercio de un paso de EP).
+
+  Consideración
+  - Como la función entrega cuatro listas, se deben "recibir" con
+    una asignación múltiple de la forma t,a,m,s=euler_progresivo().
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def euler_progresivo(T,dt,cte,cada=None,ruta=None,salida=None,reducido=False,\
+                     positivo=False,registro=None,denso=False,vigilar=None,\
+                     vigilar_cada=1):
+
+    #Condiciones de los parámetros
+    assert type(T)==int
+    assert type(dt)==float or dt=='auto'
+    assert type(cte)==dict
+    assert cada is None or (type(cada)==int and cada>0 and ruta is not None)
+    assert not (reducido and positivo)
+    assert not denso or registro is not None
+    assert vigilar is None or _tolerancias(vigilar) is not None
+    assert type(vigilar_cada)==int and vigilar_cada>0
+
+    #Paso automático, validado con la misma formulación
+    if dt=='auto':
+        dt = paso_estable(cte,'EP',min(T,20),opciones={'reducido':reducido,\
+                                                       'positivo':positivo})
+    if registro is not None:
+        registro['dt'] = dt
+
+    #Cantidad de puntos
+    N = int(T/dt)
+
+    #Condiciones iniciales
+    t0 = 0; a0 = cte['a0']; m0 = cte['m0']; s0 = 1-a0-m0
+
+    #Creación de las listas donde se guardan las soluciones
+    t = [t0]; a = [a0]; m = [m0]; s = [s0]
+
+    #Se aplica Euler (progresivo) guardando los valores
+    t,a,m,s = _avanzar('EP',T,dt,cte,_inicio((t,a,m,s),salida),N,cada,ruta,\
+                       salida,{'reducido':reducido,'positivo':positivo,\
+                               'vigilar':vigilar,'vigilar_cada':vigilar_cada},\
+                       registro)
+
+    #Solución en cualquier tiempo (orden 1, pendientes de los puntos)
+    if denso:
+        registro['denso'] = SalidaDensa(t,a,m,s,cte,pendientes='datos')
+
+    return Trayectoria((t,a,m,s),dt)
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función runge_kutta4()
+
+  Motivación
+  - Utilizar el método Runge-Kutta de orden 4 para resolver el
+    sistema de EDO's asociado a las funciones a(t), m(t) y s(t).
+
+  Parámetros
+  - T (int): extremo superior del intervalo a analizar
+  - dt (float o 'auto'): paso de tiempo (medido en millones de años)
+  - cte (dict): diccionario con constantes usadas
+  - cada (int): pasos entre puntos de control (opcional)
+  - ruta (str): archivo donde se guardan los puntos de control
+    (opcional)
+  - salida (SalidaMemmap o SalidaAnillo): guarda la trayectoria en
+    disco o solo sus últimos valores (opcional)
+  - reducido (bool): integra solo (a,m) y reconstruye s=1-a-m
+    (opcional)
+  - positivo (bool): usa un paso que mantiene a,m,s en [0,1]
+    (opcional)
+  - registro (dict): recibe la deriva de a+m+s=1 y el dt usado
+    (opcional)
+  - denso (bool): guarda en registro['denso'] una SalidaDensa de la
+    solución, con pendientes='campo' si positivo o reducido es True
+    y 'datos' si no (opcional)
+  - vigilar (float o tuple): tolerancia del rango, o (rango,
+    deriva), para detener la corrida si la solución falla (opcional)
+  - vigilar_cada (int): pasos entre revisiones de "vigilar"
+    (opcional)
+
+  Funcionamiento
+  - Al llamar la función, se entregan cuatro listas (t,a,m,s) que
+    corresponden a la solución numérica del sistema de EDO's.
+  - El paso automático, los puntos de control, la salida en disco,
+    la formulación reducida, la solución densa y "vigilar" funcionan
+    igual que en euler_progresivo().
+  - Con positivo=True se usan las etapas acopladas del método
+    clásico y se divide el paso cuando alguna fracción queda
+    negativa (ver _paso_RK4_positivo()).
+
+  Consideración
+  - Como la función entrega cuatro listas, se deben "recibir" con
+    una asignación múltiple de la forma t,a,m,s=runge_kutta4().
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def runge_kutta4(T,dt,cte,cada=None,ruta=None,salida=None,reducido=False,\
+                 positivo=False,registro=None,denso=False,vigilar=None,\
+                 vigilar_cada=1):
+
+    #Condiciones de los parámetros
+    assert type(T)==int
+    assert type(dt)==float or dt=='auto'
+    assert type(cte)==dict
+    assert cada is None or (type(cada)==int and cada>0 and ruta is not None)
+    assert not (reducido and positivo)
+    assert not denso or registro is not None
+    assert vigilar is None or _tolerancias(vigilar) is not None
+    assert type(vigilar_cada)==int and vigilar_cada>0
+
+    #Paso automático, validado con la misma formulación
+    if dt=='auto':
+        dt = paso_estable(cte,'RK4',min(T,20),opciones={'reducido':reducido,\
+                                                        'positivo':positivo})
+    if registro is not None:
+        registro['dt'] = dt
+
+    #Cantidad de puntos
+    N = int(T/dt)
+
+    #Condiciones iniciales
+    t0 = 0; a0 = cte['a0']; m0 = cte['m0']; s0 = 1-a0-m0
+
+    #Creación de las listas donde se guardan las soluciones
+    t = [t0]; a = [a0]; m = [m0]; s = [s0]
+
+    #Se aplica Runge-Kutta 4 guardando los valores
+    t,a,m,s = _avanzar('RK4',T,dt,cte,_inicio((t,a,m,s),salida),N,cada,ruta,\
+                       salida,{'reducido':reducido,'positivo':positivo,\
+                               'vigilar':vigilar,'vigilar_cada':vigilar_cada},\
+                       registro)
+
+    #Solución en cualquier tiempo (las etapas acopladas son de orden 4)
+    if denso:
+        registro['denso'] = SalidaDensa(t,a,m,s,cte,pendientes='campo' \
+                            if positivo or reducido else 'datos')
+
+    return Trayectoria((t,a,m,s),dt)
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ clase SalidaDensa
+
+  Motivación
+  - Evaluar una solución de paso fijo en cualquier tiempo, para
+    integrar con un dt grande y aun así graficar o buscar máximos en
+    una malla fina.
+
+  Parámetros
+  - t,a,m,s (list o array): solución entregada por un integrador
+  - cte (dict): diccionario con constantes usadas
+  - pendientes (str): 'campo' (derivadas del sistema) o 'datos'
+    (derivadas estimadas de los mismos puntos)
+
+  Funcionamiento
+  - Al crearla se obtiene la derivada en todos los puntos, de modo
+    que en cada intervalo [t[i],t[i+1]] se conoce el estado y su
+    derivada en ambos extremos, y se usa el polinomio cúbico de
+    Hermite que coincide con ellos.
+  - Con 'campo' las derivadas son las de campo() en cada punto. Con
+    'datos' son las del interpolador monótono de Fritsch y Carlson
+    (scipy.interpolate.PchipInterpolator), que no agrega máximos ni
+    mínimos entre los puntos.
+  - Al llamarla con tiempos tq (número o arreglo) se entrega un
+    arreglo de forma (3,)+forma de tq con (a,m,s), igual que la
+    solución continua de solucion_RKF(). El intervalo de cada tiempo
+    se busca con np.searchsorted(), por lo que cada consulta cuesta
+    del orden de log N.
+  - derivada(tq) entrega las derivadas del polinomio en tq (por
+    ejemplo, para periodo() con refinar='hermite').
+  - malla(dt) entrega cuatro arreglos (t,a,m,s) con paso dt, con la
+    misma forma que la salida de los integradores, para usarlos en
+    periodo() o en las funciones que grafican.
+
+  Consideración
+  - Fuera de [t[0],t[-1]] se extrapola con el primer o el último
+    polinomio.
+  - La precisión en los puntos es la del integrador; entre ellos el
+    error del polinomio es del orden de dt**4 con 'campo'. Con
+    'datos' es del orden de dt**2, pues las pendientes se aplanan
+    cerca de los máximos y mínimos.
+  - 'campo' solo sirve si los puntos son tan precisos como el
+    polinomio. Con un método de orden 1 y dt grande (por ejemplo
+    euler_progresivo() con positivo=True, alpha=1.3 y dt=0.05) la
+    derivada del sistema no concuerda con la pendiente entre puntos
+    vecinos, el polinomio sube y baja cerca de cada máximo, y
+    periodo() sobre malla() mide la distancia entre dos de esos
+    máximos falsos (0.021 en lugar de 39.45). Por eso
+    euler_progresivo() y runge_kutta4() con etapas por componente
+    (ambos de orden 1) usan 'datos'.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+class SalidaDensa:
+
+    def __init__(self,t,a,m,s,cte,pendientes='campo'):
+
+        #Condiciones de los parámetros
+        assert len(t)==len(a)==len(m)==len(s) and len(t)>1
+        assert type(cte)==dict
+        assert pendientes in ('campo','datos')
+
+        self.t = np.asarray(t,dtype=float)
+        self.y = np.vstack((a,m,s)).astype(float)
+        if pendientes=='campo':
+            self.f = campo(self.y,cte)
+        else:
+            self.f = PchipInterpolator(self.t,self.y,axis=1).derivative()(self.t)
+
+    def _intervalo(self,tq):
+
+        #Índice del intervalo y posición dentro de él
+        i = np.clip(np.searchsorted(self.t,tq,side='right')-1,0,len(self.t)-2)
+        h = self.t[i+1]-self.t[i]
+        return i,h,(tq-self.t[i])/h
+
+    def __call__(self,tq):
+
+        tq = np.asarray(tq,dtype=float)
+        i,h,x = self._intervalo(tq)
+
+        #Bases de Hermite
+        h00 = (1+2*x)*(1-x)**2
+        h10 = x*(1-x)**2
+        h01 = x**2*(3-2*x)
+        h11 = x**2*(x-1)
+
+        return h00*self.y[:,i] + h*h10*self.f[:,i] + \
+               h01*self.y[:,i+1] + h*h11*self.f[:,i+1]
+
+    def derivada(self,tq):
+
+        tq = np.asarray(tq,dtype=float)
+        i,h,x = self._intervalo(tq)
+
+        #Derivadas de las bases de Hermite
+        d00 = 6*x*(x-1)
+        d10 = (1-x)*(1-3*x)
+        d11 = x*(3*x-2)
+
+        return d00*(self.y[:,i]-self.y[:,i+1])/h + \
+               d10*self.f[:,i] + d11*self.f[:,i+1]
+
+    def malla(self,dt):
+
+        #Condiciones de los parámetros
+        assert type(dt)==float and dt>0
+
+        t = np.arange(int(round((self.t[-1]-self.t[0])/dt))+1)*dt + self.t[0]
+        a,m,s = self(t)
+        return t,a,m,s
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ funciones _F() _F_reducido() _J() _J_reducido()
+               _proyectar_arreglos()
+
+  Motivación
+  - Función vectorial de a,m,s usada por solve_ivp.
+  - _F_reducido() es la versión de la formulación reducida, que
+    recibe solo (a,m) y reconstruye s como en _proyectar().
+  - _J() y _J_reducido() son sus jacobianos, para que los métodos
+    implícitos de solve_ivp no los aproximen por diferencias.
+
+  Parámetros
+  - t (float): tiempo (no se usa, el sistema es autónomo)
+  - ams (array): vector de estado (a,m,s), o (a,m) si es reducida.
+    _F() y _F_reducido() también reciben la forma (3,k) o (2,k),
+    con k estados a la vez (vectorized=True en solve_ivp)
+  - k1,k2,alpha (float): constantes del modelo
+
+  Consideración
+  - _proyectar_arreglos() hace lo mismo que _proyectar() sobre
+    arreglos, y se usa para reconstruir s en la solución de RKF.
+  - _completar() entrega la solución (a,m,s) de solve_ivp, ya
+    reconstruida si es reducida, y la deriva máxima en ella.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _F(t,ams,k1,k2,alpha):
+
+    #Se separan los valores
+    a,m,s = ams
+
+    #Términos que se repiten
+    am = k1*a*m**2
+    ms = k2*s*m**alpha
+
+    #Se entrega el arreglo
+    return np.array([s - am, #función asociada a da/dt
+                     am - ms, #función asociada a dm/dt
+                     ms - s]) #función asociada a ds/dt
+
+def _F_reducido(t,am,k1,k2,alpha):
+
+    #Se reconstruye el estado completo
+    if np.ndim(am)==1:
+        a,m,s = _proyectar(float(am[0]),float(am[1]))
+    else:
+        a,m,s = _proyectar_arreglos(am[0],am[1])
+
+    #Se entrega el arreglo
+    return np.array([s - a*k1*m**2, #función asociada a da/dt
+                     a*k1*m**2 - k2*s*m**alpha]) #función asociada a dm/dt
+
+def _J(t,ams,k1,k2,alpha):
+
+    return jacobiano(*(float(x) for x in ams),\
+                     {'k1':k1,'k2':k2,'alpha':alpha})
+
+def _J_reducido(t,am,k1,k2,alpha):
+
+    #Jacobiano completo en el estado reconstruido
+    a,m,s = _proyectar(float(am[0]),float(am[1]))
+    J = jacobiano(a,m,s,{'k1':k1,'k2':k2,'alpha':alpha})
+
+    #Regla de la cadena con s=1-a-m
+    return J[:2,:2] - J[:2,2:]
+
+def _proyectar_arreglos(a,m):
+
+    #Fracciones dentro de [0,1]
+    a = np.clip(a,0.0,1.0)
+    m = np.clip(m,0.0,1.0)
+
+    #Se normalizan si suman más que 1
+    total = np.maximum(a+m,1.0)
+    a = a/total
+    m = m/total
+
+    return a,m,np.maximum(1.0-a-m,0.0)
+
+def _completar(y,reducido):
+
+    #Formulación con las tres ecuaciones
+    if not reducido:
+        return y,float(np.max(np.abs(y.sum(axis=0)-1),initial=0.0))
+
+    #Se reconstruye s y se mide la corrección hecha
+    a,m,s = _proyectar_arreglos(y[0],y[1])
+    d = np.max(np.abs(y[0]-a)+np.abs(y[1]-m),initial=0.0)
+    return np.vstack((a,m,s)),float(d)
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función _argumentos_ivp()
+
+  Motivación
+  - Reunir los argumentos de solve_ivp que dependen de las opciones
+    de solucion_RKF(), para usarlos igual al integrar de una vez o
+    por tramos.
+
+  Parámetros
+  - cte (dict): diccionario con constantes usadas
+  - opciones (dict): opciones de solucion_RKF() ('reducido',
+    'metodo', 'rtol', 'atol', 'paso_max')
+  - red (Red): red compilada de redes.py (opcional)
+
+  Funcionamiento
+  - Se entrega un diccionario con fun, method, rtol, atol, max_step
+    y args. Las opciones que falten toman los valores por omisión de
+    solve_ivp, por lo que los puntos de control antiguos se reanudan
+    igual que antes.
+  - Para los métodos implícitos se agregan jac (el analítico) y
+    vectorized=True. Los explícitos no usan ninguno de los dos, y
+    con vectorized=True cada evaluación pasaría por un arreglo (n,1)
+    adicional.
+  - Con "red", fun y jac son red.campo() y red.jacobiano().
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _argumentos_ivp(cte,opciones,red=None):
+
+    reducido = opciones.get('reducido',False)
+    metodo = opciones.get('metodo','RK45')
+
+    argumentos = {'fun':_F_reducido if reducido else _F,
+                  'method':metodo,
+                  'rtol':opciones.get('rtol',1e-3),
+                  'atol':opciones.get('atol',1e-6),
+                  'max_step':opciones.get('paso_max',np.inf),
+                  'args':(cte["k1"],cte["k2"],cte["alpha"])}
+
+    #Lado derecho de una red
+    if red is not None:
+        argumentos['fun'] = lambda t,y: red.campo(y,cte)
+        argumentos['args'] = ()
+
+    #Solo los métodos implícitos usan el jacobiano
+    if metodo in _IMPLICITOS:
+        argumentos['jac'] = _J_reducido if reducido else _J
+        if red is not None:
+            argumentos['jac'] = lambda t,y: red.jacobiano(y,cte)
+        argumentos['vectorized'] = True
+
+    return argumentos
+
+#Métodos de solve_ivp que usan el jacobiano
+_IMPLICITOS = ('Radau','BDF','LSODA')
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función _avanzar_RKF()
+
+  Motivación
+  - Integrar con solve_ivp por tramos de "cada" pasos, guardando un
+    punto de control al final de cada tramo.
+
+  Parámetros
+  - T (int): extremo superior del intervalo a analizar
+  - dt (float): separación de los tiempos guardados
+  - cte (dict): diccionario con constantes usadas
+  - trayectoria (tuple): arreglos (t,a,m,s) ya calculados
+  - h (float): último paso aceptado por solve_ivp (o None)
+  - N (int): cantidad total de pasos
+  - cada (int): pasos entre puntos de control (o None)
+  - ruta (str): archivo de los puntos de control (o None)
+  - salida (SalidaMemmap o SalidaAnillo): igual que en _avanzar()
+  - opciones (dict): igual que en _avanzar()
+  - registro (dict): igual que en _avanzar()
+  - diario (dict): igual que en _avanzar()
+
+  Nota: el paso interno de solve_ivp no se entrega, por lo que se
+  usa la separación entre sus dos penúltimos tiempos (el último
+  paso se recorta para calzar con el final del tramo).
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _avanzar_RKF(T,dt,cte,trayectoria,h,N,cada,ruta,salida=None,\
+                 opciones=None,registro=None,diario=None):
+
+    opciones = opciones or {}
+    reducido = opciones.get('reducido',False)
+    tolerancias = _tolerancias(opciones.get('vigilar'))
+    deriva = 0.0
+
+    #Último estado calculado
+    if salida is None:
+        t,a,m,s = trayectoria
+        i = len(t)-1
+        ultimo = (a[-1],m[-1],s[-1])
+    else:
+        i = salida.largo-1
+        ultimo = salida.ultimo()[1:]
+
+    #Largo de cada tramo (con salida en disco, a lo más un bloque)
+    tramo = cada if cada is not None else max(N-i,1)
+    if salida is not None:
+        tramo = min(tramo,salida.bloque)
+
+    while i<N:
+
+        #Tiempos a guardar en el tramo
+        j = min(i+tramo,N)
+        ti = np.arange(i,j+1)*dt
+
+        #Se integra el tramo partiendo del último paso aceptado
+        ams = solve_ivp(t_span=(ti[0],ti[-1]),\
+              y0=list(ultimo[:2] if reducido else ultimo),\
+              dense_output=True,\
+              first_step=None if h is None else min(h,ti[-1]-ti[0]),\
+              **_argumentos_ivp(cte,opciones))
+
+        #Estado del control de paso
+        pasos = np.diff(ams.t)
+        h = float(pasos[-2] if len(pasos)>1 else pasos[-1])
+
+        #Se agregan los valores del tramo
+        y = ams.sol(ti[1:])
+        y,d = _completar(y,reducido)
+        deriva = max(deriva,d)
+        if tolerancias is not None:
+            _vigilar_RKF(ti[1:],y,tolerancias,registro)
+        ultimo = tuple(y[:,-1])
+        if salida is None:
+            t = np.concatenate((t,ti[1:]))
+            a = np.concatenate((a,y[0]))
+            m = np.concatenate((m,y[1]))
+            s = np.concatenate((s,y[2]))
+            trayectoria = (t,a,m,s)
+        else:
+            salida.agregar_bloque(ti[1:],y[0],y[1],y[2])
+        i = j
+
+        #Punto de control al final del tramo
+        if ruta is not None:
+            diario = _guardar_punto(_punto_control('RKF',T,dt,cte,\
+                     trayectoria,{'h':h},salida,opciones),ruta,diario)
+
+    #Deriva de la restricción
+    if registro is not None:
+        registro['deriva'] = max(registro.get('deriva',0.0),deriva)
+
+    #Se entregan las soluciones al sistema de EDO's
+    if salida is not None:
+        return salida.vistas()
+    return trayectoria
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ funciones solucion_RKF() _solucion_red() _malla()
+
+  Motivación
+  - Implementar el método de Runge-Kutta-Fehlberg al modelo simple
+    de formación de estrellas. Para esto se usa la función solve_ivp
+    de la librería scipy para resolver el sistema de EDO's asociado a
+    las funciones a(t), m(t) y s(t).
+
+  Parámetros
+  - T (int): extremo superior del intervalo a analizar
+  - dt (float): paso de tiempo (medido en millones de años)
+  - cte (dict): diccionario con constantes usadas
+  - cada (int): pasos entre puntos de control (opcional)
+  - ruta (str): archivo donde se guardan los puntos de control
+    (opcional)
+  - salida (SalidaMemmap o SalidaAnillo): guarda la trayectoria en
+    disco o solo sus últimos valores (opcional)
+  - reducido (bool): integra solo (a,m) y reconstruye s=1-a-m
+    (opcional)
+  - registro (dict): recibe la deriva de a+m+s=1 y, si denso=True,
+    la solución continua en 'denso' (opcional)
+  - metodo (str): método de solve_ivp ('RK45', 'DOP853', 'LSODA',
+    'Radau', 'BDF', ...)
+  - rtol, atol (float): tolerancias relativa y absoluta
+  - denso (bool): pide a solve_ivp la solución continua
+  - paso_max (float): paso interno máximo
+  - vigilar (float o tuple): igual que en euler_progresivo()
+    (opcional)
+  - red (Red): red compilada de redes.py, para integrar otro modelo
+    en lugar del de tres fases (opcional)
+
+  Funcionamiento
+  - Al llamar la función, se entregan cuatro listas (t,a,m,s) que
+    corresponden a la solución numérica del sistema de EDO's.
+  - Si dt es un número, se entregan los N+1 múltiplos de dt entre 0
+    y T (con N=int(T/dt)), igual que al integrar por tramos, al
+    reanudar y en euler_progresivo(). Si dt es None, se entregan
+    solo los pasos que dio solve_ivp, sin evaluar la solución en una
+    malla fina; con denso=True la solución en cualquier tiempo se
+    obtiene después con registro['denso'](t).
+  - Si se entrega "ruta" o "salida", se integra por tramos de "cada"
+    pasos con _avanzar_RKF() y los tiempos guardados son múltiplos
+    de dt (que no puede ser None).
+  - Con reducido=True solve_ivp integra solo (a,m) con _F_reducido()
+    y s se reconstruye al final con _proyectar_arreglos().
+  - El lado derecho entrega arreglos de numpy y, con los métodos
+    implícitos ('Radau', 'BDF', 'LSODA'), se evalúa de forma
+    vectorial y se entrega el jacobiano analítico, por lo que no se
+    aproxima por diferencias.
+  - Con reducido=True, registro['denso'] entrega solo (a,m).
+  - Con "vigilar" se revisan los tiempos entregados (todos, o los de
+    cada tramo al integrar por tramos) con _vigilar_RKF(), y ante la
+    primera falla se lanza FallaNumerica, igual que en
+    euler_progresivo().
+  - Con "red" se usan red.campo(), red.jacobiano() y
+    red.iniciales(), y se entrega el tiempo seguido de un arreglo por
+    especie, en el orden de red.especies. La
+    formulación reducida, los puntos de control y la salida en disco
+    son propios del modelo de tres fases, y no se aceptan con una
+    red.
+
+  Consideración
+  - Como la función entrega cuatro listas, se deben "recibir" con
+    una asignación múltiple de la forma t,a,m,s=solucion_RKF().
+
+  Nota: A diferencia de los métodos implementados anteriormente,
+  este resuelve el sistema de manera vectorial para asegurar el
+  correcto funcionamiento de solve_ivp, pues trabaja con vectores.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def solucion_RKF(T,dt,cte,cada=None,ruta=None,salida=None,reducido=False,\
+                 registro=None,metodo='RK45',rtol=1e-3,atol=1e-6,\
+                 denso=False,paso_max=np.inf,vigilar=None,red=None):
+
+    #Condiciones de los parámetros
+    assert type(T)==int
+    assert dt is None or type(dt)==float
+    assert type(cte)==dict
+    assert cada is None or (type(cada)==int and cada>0 and ruta is not None)
+    assert type(metodo)==str
+    assert rtol>0 and atol>0 and paso_max>0
+    assert not denso or registro is not None
+    assert vigilar is None or _tolerancias(vigilar) is not None
+    assert red is None or not (reducido or ruta is not None or salida is not None)
+
+    #Opciones del método, guardadas también en los puntos de control
+    opciones = {'reducido':reducido,'metodo':metodo,'rtol':rtol,\
+                'atol':atol,'paso_max':paso_max,'vigilar':vigilar}
+
+    #Una red se integra aparte
+    if red is not None:
+        return _solucion_red(T,dt,cte,opciones,registro,denso,red)
+
+    #Vector de estado
+    ams0 = [cte["a0"],cte["m0"],1-cte["a0"]-cte["m0"]]
+
+    #Con puntos de control o salida en disco se integra por tramos
+    if ruta is not None or salida is not None:
+        assert dt is not None
+        trayectoria = tuple(np.array([x],dtype=float) for x in [0]+ams0)
+        return _avanzar_RKF(T,dt,cte,_inicio(trayectoria,salida),\
+                            None,int(T/dt),cada,ruta,salida,\
+                            opciones,registro)
+
+    #Múltiplos de dt entre 0 y T, si se pidieron
+    t = _malla(T,dt)
+
+    #Se aplica solve_ivp guardando los valores en el vector ams
+    ams = solve_ivp(t_span=(0,T if t is None else t[-1]),\
+          y0=ams0[:2] if reducido else ams0,\
+          t_eval=t,dense_output=denso,**_argumentos_ivp(cte,opciones))
+
+    #Se reconstruye s si es necesario
+    y,deriva = _completar(ams.y,reducido)
+    if vigilar is not None:
+        _vigilar_RKF(ams.t,y,_tolerancias(vigilar),registro)
+    if registro is not None:
+        registro['deriva'] = deriva
+        if denso:
+            registro['denso'] = ams.sol
+
+    #Se extraen las soluciones del vector
+    t,a,m,s = ams.t,y[0],y[1],y[2]
+
+    #Se entregan las soluciones al sistema de EDO's
+    return t,a,m,s
+
+def _solucion_red(T,dt,cte,opciones,registro,denso,red):
+
+    #Múltiplos de dt entre 0 y T, si se pidieron
+    t = _malla(T,dt)
+
+    #Se aplica solve_ivp con el lado derecho de la red
+    ams = solve_ivp(t_span=(0,T if t is None else t[-1]),\
+          y0=red.iniciales(cte),t_eval=t,\
+          dense_output=denso,**_argumentos_ivp(cte,opciones,red))
+
+    if opciones['vigilar'] is not None:
+        _vigilar_RKF(ams.t,ams.y,_tolerancias(opciones['vigilar']),registro)
+    if registro is not None:
+        total = ams.y.sum(axis=0)
+        registro['deriva'] = float(np.max(np.abs(total-total[0]),initial=0.0))
+        if denso:
+            registro['denso'] = ams.sol
+
+    #Se entregan el tiempo y las especies
+    return (ams.t,)+tuple(ams.y)
+
+def _malla(T,dt):
+
+    #Los mismos tiempos que _avanzar_RKF() (None si no se pidieron)
+    if dt is None:
+        return None
+    return np.arange(int(T/dt)+1)*dt
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ funciones paso_estable() _error_paso() _piloto()
+
+  Motivación
+  - Elegir el mayor paso de tiempo con que un método de paso fijo es
+    estable y preciso para un caso, en lugar de fijarlo a mano en
+    cada parte.
+
+  Parámetros
+  - cte (dict): diccionario con constantes usadas
+  - metodo (str): 'EP' o 'RK4'
+  - T_piloto (int): largo de las corridas piloto
+  - seguridad (float): factor con que se multiplica el paso estable
+  - opciones (dict): opciones del integrador ('reducido' o
+    'positivo'), para validar el paso con el mismo paso del método
+    (opcional)
+  - tolerancia (float): diferencia máxima en a, m y s entre las
+    corridas con dt y con dt/2
+  - pasos_ciclo (int): pasos mínimos por oscilación
+
+  Funcionamiento
+  - Se hace una corrida piloto con solve_ivp y en cada uno de sus
+    pasos se calculan los valores propios del jacobiano.
+  - Para cada valor propio real negativo lambda se busca el mayor h
+    tal que h*lambda está en la región de estabilidad del método, es
+    decir, que el factor de amplificación cumple |R(h*lambda)|<=1,
+    con R(z)=1+z (EP) o R(z)=1+z+z**2/2+z**3/6+z**4/24 (RK4).
+  - Los valores propios complejos (las oscilaciones del ciclo) o de
+    parte real positiva (su crecimiento) no se pueden estabilizar
+    achicando el paso, pero sí resolver: se pide |lambda|*h<=
+    2*pi/pasos_ciclo, es decir, al menos pasos_ciclo pasos en cada
+    oscilación de periodo 2*pi/|lambda|.
+  - El menor de esos h multiplicado por "seguridad" se valida con
+    _error_paso(): se integran T_piloto millones de años con el paso
+    del propio método usando dt y dt/2, y el error es la mayor
+    diferencia entre ambas en los tiempos comunes (infinito si
+    alguna falla). Mientras supere la tolerancia, el paso se divide
+    por 2.
+  - Se entrega el paso validado.
+
+  Consideraciones
+  - Las etapas por componente de runge_kutta4() avanzan cada variable
+    con un incremento h*D*J*y, donde D es diagonal e igual a la
+    identidad más términos de orden h. Su región de estabilidad es
+    entonces la de EP, y solo con positivo o reducido (etapas
+    acopladas) se usa la de RK4. Por lo mismo su error es de orden
+    dt, y la validación lleva el caso 3 a un paso del orden de 1e-4.
+  - Que el paso sea estable no impide que, cerca de m=0, un paso
+    deje m negativo (con alpha=1.3 y m0=0.2, el paso estable de EP
+    da un m**alpha complejo). Por eso se valida con el método real.
+  - Si tras 20 divisiones el paso sigue fallando, se lanza
+    FloatingPointError.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def paso_estable(cte,metodo,T_piloto=20,seguridad=0.9,opciones=None,\
+                 tolerancia=1e-2,pasos_ciclo=20):
+
+    #Condiciones de los parámetros
+    assert type(cte)==dict
+    assert metodo in _ESTABILIDAD
+    assert type(T_piloto)==int and T_piloto>0
+    assert 0<seguridad<=1
+    assert tolerancia>0
+    assert type(pasos_ciclo)==int and pasos_ciclo>0
+
+    opciones = opciones or {}
+    acopladas = opciones.get('reducido',False) or opciones.get('positivo',False)
+
+    #Corrida piloto (los intentos con m<0 los rechaza el control de paso)
+    ams0 = [cte["a0"],cte["m0"],1-cte["a0"]-cte["m0"]]
+    with np.errstate(invalid='ignore'):
+        piloto = solve_ivp(fun=_F,t_span=(0,T_piloto),y0=ams0,method="RK45",\
+                 args=(cte["k1"],cte["k2"],cte["alpha"]))
+
+    #Valores propios a lo largo de la corrida
+    valores = np.concatenate([np.linalg.eigvals(jacobiano(*np.maximum(y,0.0),cte))\
+                              for y in piloto.y.T])
+    valores = valores[np.abs(valores)>1e-10]
+
+    #Radios de la región de estabilidad en la dirección de cada valor
+    R = _ESTABILIDAD[metodo if acopladas else 'EP']
+    r = np.linspace(0,4,4001)[1:]
+    z = r[None,:]*(valores/np.abs(valores))[:,None]
+    fuera = np.abs(R(z))>1+1e-12
+    radios = np.where(fuera.any(axis=1),r[np.argmax(fuera,axis=1)-1],r[-1])
+
+    #Los valores reales negativos limitan por estabilidad, y el resto
+    #por la cantidad de pasos en cada oscilación
+    reales = (np.abs(valores.imag)<=1e-10) & (valores.real<0)
+    radios[~reales] = 2*np.pi/pasos_ciclo
+    dt = float(seguridad*np.min(radios/np.abs(valores))) if len(valores)>0 else 0.1
+
+    #Se valida con el método real, dividiendo el paso si falla
+    for _ in range(20):
+        if _error_paso(dt,cte,metodo,opciones,T_piloto)<=tolerancia:
+            return dt
+        dt = dt/2
+
+    raise FloatingPointError('no se encontró un paso válido para %s' % metodo)
+
+def _error_paso(dt,cte,metodo,opciones,T_piloto):
+
+    #Corridas con dt y dt/2
+    y = _piloto(dt,cte,metodo,opciones,T_piloto)
+    mitad = _piloto(dt/2,cte,metodo,opciones,T_piloto)
+    if y is None or mitad is None:
+        return np.inf
+
+    #Diferencia en los tiempos comunes
+    n = min(y.shape[1],(mitad.shape[1]+1)//2)
+    return float(np.max(np.abs(y[:,:n]-mitad[:,:2*n:2])))
+
+def _piloto(dt,cte,metodo,opciones,T_piloto):
+
+    reducido = opciones.get('reducido',False)
+    positivo = opciones.get('positivo',False)
+
+    #Paso según la formulación
+    if reducido:
+        paso = _PASOS_REDUCIDOS[metodo]
+    elif positivo:
+        paso = _PASOS_POSITIVOS[metodo]
+    else:
+        paso = _PASOS[metodo]
+
+    a = float(cte['a0']); m = float(cte['m0']); s = 1.0-a-m
+    y = [(a,m,s)]
+
+    #Un estado complejo falla en dadt() o en la conversión
+    try:
+        for _ in range(int(T_piloto/dt)):
+            if reducido:
+                a,m,s = _proyectar(*paso(dt,a,m,s,cte))
+            else:
+                a,m,s = paso(dt,a,m,s,cte)
+            y += [(a,m,s)]
+        y = np.array(y,dtype=float).T
+    except (AssertionError,TypeError):
+        return None
+
+    return y if np.isfinite(y).all() else None
+
+#Factor de amplificación de cada método de paso fijo
+_ESTABILIDAD = {'EP':lambda z: 1+z,
+                'RK4':lambda z: 1+z+z**2/2+z**3/6+z**4/24}
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función reanudar()
+
+  Motivación
+  - Continuar una integración desde un punto de control, sin volver
+    a calcular desde t=0 lo que ya se había calculado.
+
+  Parámetros
+  - punto (dict o str): punto de control o archivo que lo contiene
+  - T_nuevo (int): nuevo extremo superior del intervalo
+  - cada (int): pasos entre puntos de control (opcional)
+  - ruta (str): archivo donde se guardan los nuevos puntos de
+    control (opcional)
+  - registro (dict): igual que en los integradores (opcional)
+
+  Funcionamiento
+  - Se retoma el método, el paso, las constantes y el control de
+    paso guardados, y se agregan a la trayectoria guardada los
+    valores hasta T_nuevo. Se entregan (t,a,m,s) completos.
+  - Si la trayectoria estaba en disco, se reabre la misma carpeta
+    descartando lo escrito después del punto de control. Si estaba en
+    una SalidaAnillo, se sigue desde una copia de la guardada.
+
+  Consideración
+  - Para EP y RK4 el resultado es idéntico al de una sola corrida
+    hasta T_nuevo, pues se repite exactamente la misma recurrencia.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def reanudar(punto,T_nuevo,cada=None,ruta=None,registro=None):
+
+    #Se carga el punto de control si se entregó un archivo
+    if type(punto)==str:
+        punto = cargar_punto_control(punto)
+
+    #Condiciones de los parámetros
+    assert type(punto)==dict
+    assert type(T_nuevo)==int
+    assert cada is None or (type(cada)==int and cada>0 and ruta is not None)
+
+    #Datos guardados
+    metodo = punto['metodo']; dt = punto['dt']; cte = punto['cte']
+    opciones = punto.get('opciones',{})
+
+    #Cantidad de puntos hasta el nuevo extremo
+    N = int(T_nuevo/dt)
+
+    #Se reabre la salida en disco o se copia la trayectoria para no
+    #modificar el punto de control
+    if punto.get('salida') is not None:
+        salida = SalidaMemmap(punto['salida'],continuar=punto['largo'])
+        trayectoria = None
+    elif punto.get('anillo') is not None:
+        salida = copy.deepcopy(punto['anillo'])
+        trayectoria = None
+    elif metodo=='RKF':
+        salida = None
+        trayectoria = tuple(np.array(x,dtype=float) for x in punto['trayectoria'])
+    else:
+        salida = None
+        trayectoria = tuple(np.asarray(x,dtype=float).tolist() for x in punto['trayectoria'])
+
+    #Si se sigue en el mismo archivo, solo se agregan los valores nuevos
+    diario = punto.get('diario')
+
+    if metodo=='RKF':
+        return _avanzar_RKF(T_nuevo,dt,cte,trayectoria,\
+                            punto['control']['h'],N,cada,ruta,salida,\
+                            opciones,registro,diario)
+
+    return _avanzar(metodo,T_nuevo,dt,cte,trayectoria,N,cada,ruta,salida,\
+                    opciones,registro,diario)
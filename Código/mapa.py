@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+
+# Tarea numérica - Ecuaciones Diferenciales Ordinarias
+
+# Nombre: Diego Alonso Sánchez Manríquez
+# RUT: 19.957.060-9
+
+# Módulo para recorrer un plano de dos constantes (por ejemplo
+# alpha y k2) y clasificar el comportamiento en cada punto. No
+# ejecuta nada al ser importado.
+
+#Librerías importadas
+import json #usada para guardar los datos del mapa
+import os #usada para crear carpetas y rutas
+import numpy as np #usada para resolver vectorialmente
+from concurrent.futures import ProcessPoolExecutor, as_completed #procesos
+import matplotlib.pyplot as plt #usada para graficar
+from runge_kutta import runge_kutta #integra muchos sistemas a la vez
+from analisis import periodo_conjunto #periodos de muchos sistemas
+
+#Regímenes de cada punto del plano
+REGIMENES = ('equilibrio','periódico','divergente')
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función _tesela()
+
+  Motivación
+  - Integrar los puntos de una tesela del plano como un solo
+    conjunto y guardar su resultado apenas termina.
+
+  Parámetros
+  - carpeta (str): carpeta del mapa
+  - i,j (int): índices de la tesela
+  - cte (dict): constantes de los puntos de la tesela (arreglos)
+  - forma (tuple): forma de la tesela (filas, columnas)
+  - T (int): extremo superior del intervalo a analizar
+  - dt (float): paso de tiempo
+  - tabla (str): tabla de runge_kutta()
+  - umbral (float): amplitud mínima para considerar una oscilación
+
+  Funcionamiento
+  - Se guarda tesela_i_j.npz con 'periodo', 'amplitud' y 'regimen'
+    (índice en REGIMENES), cada uno con la forma de la tesela. Se
+    escribe primero un archivo temporal que luego se renombra, para
+    que una tesela interrumpida no quede como terminada.
+  - Un punto es divergente si su solución tiene valores nan o
+    infinitos, periódico si tiene periodo y amplitud mayor que
+    "umbral", y en equilibrio en otro caso.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _tesela(carpeta,i,j,cte,forma,T,dt,tabla,umbral):
+
+    with np.errstate(invalid='ignore',over='ignore'):
+        t,a,m,s = runge_kutta(T,dt,cte,tabla)
+
+    #Periodos, amplitudes y regímenes
+    periodos,amplitudes = periodo_conjunto(t,s)
+    divergentes = ~np.isfinite(s).all(axis=0)
+    periodicos = ~np.isnan(periodos) & (amplitudes>umbral) & ~divergentes
+    regimen = np.where(divergentes,2,np.where(periodicos,1,0))
+
+    #Se guarda la tesela terminada
+    ruta = _ruta_tesela(carpeta,i,j)
+    with open(ruta+'.tmp','wb') as archivo:
+        np.savez(archivo,periodo=periodos.reshape(forma),\
+                 amplitud=amplitudes.reshape(forma),\
+                 regimen=regimen.reshape(forma))
+    os.replace(ruta+'.tmp',ruta)
+
+    return i,j
+
+def _ruta_tesela(carpeta,i,j):
+
+    return os.path.join(carpeta,'tesela_%d_%d.npz' % (i,j))
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función mapa_parametros()
+
+  Motivación
+  - Ver en qué regiones de un plano de dos constantes el sistema
+    tiende a un equilibrio periódico, y con qué periodo y amplitud,
+    en lugar de probar combinaciones a mano como en la parte A.
+
+  Parámetros
+  - carpeta (str): carpeta donde se guardan las teselas
+  - cte (dict): diccionario con las constantes que no cambian
+  - eje_x, eje_y (tuple): (nombre de la constante, valores)
+  - T (int): extremo superior del intervalo a analizar
+  - dt (float): paso de tiempo
+  - tesela (int): lado de cada tesela (puntos integrados a la vez)
+  - procesos (int): cantidad de procesos (opcional, por omisión se
+    integra todo en el proceso actual)
+  - tabla (str): tabla de runge_kutta()
+  - umbral (float): amplitud mínima para considerar una oscilación
+
+  Funcionamiento
+  - El plano se divide en teselas de tesela x tesela puntos, que se
+    integran por separado (en varios procesos si se pide) y se
+    guardan en la carpeta apenas terminan. Si la carpeta ya tiene
+    teselas de un mapa con los mismos datos, solo se integran las
+    que faltan, por lo que un recorrido interrumpido se retoma
+    llamando de nuevo a la función.
+  - Se entrega el mapa completo con armar_mapa().
+
+  Consideración
+  - Los datos del mapa se guardan en mapa.json, y se revisa que
+    coincidan antes de retomar. Si no coinciden se lanza ValueError
+    con los datos distintos, sin tocar las teselas guardadas.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def mapa_parametros(carpeta,cte,eje_x,eje_y,T=100,dt=0.01,tesela=16,\
+                    procesos=None,tabla='rk4',umbral=1e-3):
+
+    #Condiciones de los parámetros
+    assert type(carpeta)==str
+    assert type(cte)==dict
+    assert eje_x[0]!=eje_y[0]
+    assert type(T)==int
+    assert type(dt)==float
+    assert type(tesela)==int and tesela>0
+
+    x = np.asarray(eje_x[1],dtype=float)
+    y = np.asarray(eje_y[1],dtype=float)
+
+    #Datos del mapa, para saber si se puede retomar
+    datos = {'cte':{k:v for k,v in cte.items() if k not in (eje_x[0],eje_y[0])},
+             'eje_x':[eje_x[0],x.tolist()],'eje_y':[eje_y[0],y.tolist()],
+             'T':T,'dt':dt,'tesela':tesela,'tabla':tabla,'umbral':umbral}
+    os.makedirs(carpeta,exist_ok=True)
+    ruta = os.path.join(carpeta,'mapa.json')
+    if os.path.exists(ruta):
+        with open(ruta) as archivo:
+            previos = json.load(archivo)
+        distintos = sorted(k for k in set(datos)|set(previos) \
+                           if previos.get(k)!=datos.get(k))
+        if distintos:
+            raise ValueError('%s es de un mapa con otros datos: %s' \
+                             % (ruta,', '.join(distintos)))
+    else:
+        with open(ruta,'w') as archivo:
+            json.dump(datos,archivo)
+
+    #Teselas que faltan
+    pendientes = []
+    for i in range(0,len(y),tesela):
+        for j in range(0,len(x),tesela):
+            if os.path.exists(_ruta_tesela(carpeta,i//tesela,j//tesela)):
+                continue
+            X,Y = np.meshgrid(x[j:j+tesela],y[i:i+tesela])
+            puntos = dict(datos['cte'])
+            puntos[eje_x[0]] = X.ravel(); puntos[eje_y[0]] = Y.ravel()
+            pendientes += [(carpeta,i//tesela,j//tesela,puntos,X.shape,\
+                            T,dt,tabla,umbral)]
+
+    #Se integran las teselas, en este proceso o en varios
+    if procesos is None:
+        for p in pendientes:
+            _tesela(*p)
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            for futuro in as_completed([ejecutor.submit(_tesela,*p) \
+                                        for p in pendientes]):
+                futuro.result()
+
+    return armar_mapa(carpeta)
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función armar_mapa()
+
+  Motivación
+  - Juntar las teselas guardadas en un solo mapa.
+
+  Parámetros
+  - carpeta (str): carpeta del mapa
+
+  Funcionamiento
+  - Se entrega un diccionario con 'x' e 'y' (nombre y valores de
+    cada eje) y 'periodo', 'amplitud' y 'regimen', de forma
+    (len(valores de y), len(valores de x)). Los puntos de teselas que
+    aún no se integran quedan como nan (y regimen -1).
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def armar_mapa(carpeta):
+
+    with open(os.path.join(carpeta,'mapa.json')) as archivo:
+        datos = json.load(archivo)
+
+    x = np.array(datos['eje_x'][1]); y = np.array(datos['eje_y'][1])
+    tesela = datos['tesela']
+
+    #Mapa vacío
+    mapa = {'x':(datos['eje_x'][0],x),'y':(datos['eje_y'][0],y),
+            'periodo':np.full((len(y),len(x)),np.nan),
+            'amplitud':np.full((len(y),len(x)),np.nan),
+            'regimen':np.full((len(y),len(x)),-1)}
+
+    #Se copian las teselas guardadas
+    for i in range(0,len(y),tesela):
+        for j in range(0,len(x),tesela):
+            ruta = _ruta_tesela(carpeta,i//tesela,j//tesela)
+            if not os.path.exists(ruta):
+                continue
+            with np.load(ruta) as valores:
+                for nombre in ('periodo','amplitud','regimen'):
+                    mapa[nombre][i:i+tesela,j:j+tesela] = valores[nombre]
+
+    return mapa
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función graficar_mapa()
+
+  Motivación
+  - Mostrar el régimen, el periodo y la amplitud en el plano de las
+    dos constantes.
+
+  Parámetros
+  - mapa (dict): diccionario entregado por armar_mapa()
+  - ruta (str): archivo donde se guarda la figura (opcional)
+
+  Funcionamiento
+  - Se dibujan tres mapas de calor lado a lado. Los puntos sin
+    periodo quedan en blanco en los dos últimos. Se entregan la
+    figura y los ejes de matplotlib.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def graficar_mapa(mapa,ruta=None):
+
+    (nombre_x,x),(nombre_y,y) = mapa['x'],mapa['y']
+    extension = (x[0],x[-1],y[0],y[-1])
+
+    #Creación del lienzo
+    fig, axs = plt.subplots(1,3,figsize=(18,6))
+
+    #Régimen
+    imagen = axs[0].imshow(np.ma.masked_less(mapa['regimen'],0),\
+             origin='lower',extent=extension,aspect='auto',\
+             cmap=plt.get_cmap('viridis',len(REGIMENES)),\
+             vmin=-0.5,vmax=len(REGIMENES)-0.5)
+    barra = fig.colorbar(imagen,ax=axs[0],ticks=range(len(REGIMENES)))
+    barra.ax.set_yticklabels(REGIMENES)
+    axs[0].set_title("Régimen",fontweight="bold",pad=20)
+
+    #Periodo y amplitud
+    for ax,nombre,titulo in ((axs[1],'periodo',"Periodo límite (millones de años)"),\
+                             (axs[2],'amplitud',"Amplitud de s(t)")):
+        imagen = ax.imshow(np.ma.masked_invalid(mapa[nombre]),origin='lower',\
+                           extent=extension,aspect='auto')
+        fig.colorbar(imagen,ax=ax)
+        ax.set_title(titulo,fontweight="bold",pad=20)
+
+    #Etiquetas
+    for ax in axs:
+        ax.set_xlabel(nombre_x,labelpad=20)
+        ax.set_ylabel(nombre_y,labelpad=20)
+
+    #Guardado de figura
+    if ruta is not None:
+        fig.savefig(ruta)
+
+    return fig,axs
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+
+# Tarea numérica - Ecuaciones Diferenciales Ordinarias
+
+# Nombre: Diego Alonso Sánchez Manríquez
+# RUT: 19.957.060-9
+
+# Módulo para estudiar el periodo y la amplitud cuando las constantes
+# y las condiciones iniciales son inciertas (método de Monte Carlo).
+# No ejecuta nada al ser importado.
+
+#Librerías importadas
+import numpy as np #usada para resolver vectorialmente
+from concurrent.futures import ProcessPoolExecutor #usada para los procesos
+from scipy.stats import qmc #usada para el muestreo
+import matplotlib.pyplot as plt #usada para graficar
+from runge_kutta import runge_kutta #integra muchos sistemas a la vez
+from analisis import periodo_conjunto #periodos de muchos sistemas
+
+#Constantes del modelo
+CONSTANTES = ('k1','k2','alpha','a0','m0')
+
+#Cuantiles entregados
+CUANTILES = (0.05,0.25,0.5,0.75,0.95)
+
+#Tipos de las constantes fijas
+_FIJOS = (int,float,np.integer,np.floating)
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función muestrear()
+
+  Motivación
+  - Obtener valores de las constantes repartidos de forma pareja
+    según sus distribuciones, con menos muestras que un muestreo
+    aleatorio simple para la misma precisión.
+
+  Parámetros
+  - distribuciones (dict): para cada constante de CONSTANTES, un
+    número (valor fijo), una tupla o lista (mínimo, máximo)
+    (distribución uniforme) o una distribución de scipy.stats (con
+    método ppf)
+  - n (int): cantidad de muestras
+  - muestreo (str): 'lhs' (hipercubo latino) o 'sobol'
+  - semilla (int): semilla del muestreo (opcional)
+
+  Funcionamiento
+  - Se generan n puntos en el cubo unitario, uno por cada constante
+    que no es fija, y se transforman con la inversa de la función de
+    distribución de cada una. Se entrega un diccionario cte cuyas
+    constantes son arreglos de largo n (o números si son fijas), que
+    se puede entregar directamente a runge_kutta().
+
+  Consideración
+  - Sobol reparte mejor los puntos si n es una potencia de 2.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def muestrear(distribuciones,n,muestreo='lhs',semilla=None):
+
+    #Condiciones de los parámetros
+    assert type(distribuciones)==dict
+    assert set(distribuciones)==set(CONSTANTES)
+    assert type(n)==int and n>0
+    assert muestreo in ('lhs','sobol')
+
+    #Constantes que varían
+    variables = [x for x in CONSTANTES \
+                 if not isinstance(distribuciones[x],_FIJOS)]
+
+    #Cada una es un intervalo o una distribución
+    for x in variables:
+        d = distribuciones[x]
+        if isinstance(d,(tuple,list)):
+            assert len(d)==2 and d[0]<=d[1], x
+        else:
+            assert hasattr(d,'ppf'), x
+
+    #Puntos en el cubo unitario
+    if muestreo=='lhs':
+        muestreador = qmc.LatinHypercube(d=max(len(variables),1),seed=semilla)
+    else:
+        muestreador = qmc.Sobol(d=max(len(variables),1),seed=semilla)
+    u = muestreador.random(n)
+
+    #Se transforma cada columna según su distribución
+    cte = {x:distribuciones[x] for x in CONSTANTES}
+    for j,x in enumerate(variables):
+        d = distribuciones[x]
+        if isinstance(d,(tuple,list)):
+            cte[x] = d[0] + (d[1]-d[0])*u[:,j]
+        else:
+            cte[x] = d.ppf(u[:,j])
+
+    return cte
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función _bloque()
+
+  Motivación
+  - Integrar un grupo de muestras como un solo conjunto, dentro del
+    mismo proceso o en uno aparte.
+
+  Parámetros
+  - cte (dict): constantes del grupo (arreglos de igual largo)
+  - T (int): extremo superior del intervalo a analizar
+  - dt (float): paso de tiempo
+  - tabla (str): tabla de runge_kutta()
+  - precision (str): precisión de runge_kutta()
+
+  Funcionamiento
+  - Se entregan los periodos y las amplitudes de periodo_conjunto().
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _bloque(cte,T,dt,tabla,precision):
+
+    with np.errstate(invalid='ignore',over='ignore'):
+        t,a,m,s = runge_kutta(T,dt,cte,tabla,precision)
+
+    return periodo_conjunto(t,s)
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función monte_carlo()
+
+  Motivación
+  - Ver cómo se reparten el periodo límite y la amplitud de s(t)
+    cuando k1, k2, alpha, a0 y m0 no se conocen con exactitud.
+
+  Parámetros
+  - distribuciones (dict): igual que en muestrear()
+  - n (int): cantidad de muestras
+  - T (int): extremo superior del intervalo a analizar
+  - dt (float): paso de tiempo
+  - muestreo (str): 'lhs' o 'sobol'
+  - bloque (int): cantidad de muestras integradas a la vez
+  - procesos (int): cantidad de procesos (opcional, por omisión se
+    integra todo en el proceso actual)
+  - tabla (str): tabla de runge_kutta()
+  - precision (str): precisión de runge_kutta()
+  - semilla (int): semilla del muestreo (opcional)
+
+  Funcionamiento
+  - Las muestras se integran con runge_kutta() en grupos de "bloque"
+    sistemas, para que las etapas de un paso quepan en la memoria
+    caché y la trayectoria de cada grupo en la memoria. Con
+    "procesos" los grupos se reparten en procesos aparte.
+  - Se entrega un diccionario con 'cte' (las muestras), 'periodo' y
+    'amplitud' (arreglos de largo n, nan si la muestra no tiene
+    periodo o es inválida), 'validas' (a0+m0<=1 y con periodo) y
+    'cuantiles' (para cada una de las dos, un diccionario con los
+    CUANTILES de las muestras válidas).
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def monte_carlo(distribuciones,n,T=100,dt=0.01,muestreo='lhs',bloque=256,\
+                procesos=None,tabla='rk4',precision='float64',semilla=None):
+
+    #Condiciones de los parámetros
+    assert type(T)==int
+    assert type(dt)==float
+    assert type(bloque)==int and bloque>0
+
+    #Muestras, todas como arreglos de largo n
+    cte = muestrear(distribuciones,n,muestreo,semilla)
+    cte = {x:np.broadcast_to(np.asarray(y,dtype=float),(n,)) \
+           for x,y in cte.items()}
+
+    #Grupos de muestras
+    grupos = [{x:y[i:i+bloque] for x,y in cte.items()} \
+              for i in range(0,n,bloque)]
+    argumentos = (T,dt,tabla,precision)
+
+    #Se integran los grupos, en este proceso o en varios
+    if procesos is None:
+        partes = [_bloque(g,*argumentos) for g in grupos]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            partes = list(ejecutor.map(_bloque,grupos,\
+                          *([x]*len(grupos) for x in argumentos)))
+
+    periodos = np.concatenate([p for p,A in partes])
+    amplitudes = np.concatenate([A for p,A in partes])
+
+    #Muestras válidas
+    validas = (cte['a0']+cte['m0']<=1) & ~np.isnan(periodos)
+    periodos[~validas] = np.nan
+    amplitudes[~validas] = np.nan
+
+    #Cuantiles
+    cuantiles = {}
+    for nombre,x in (('periodo',periodos),('amplitud',amplitudes)):
+        q = np.quantile(x[validas],CUANTILES) if validas.any() \
+            else np.full(len(CUANTILES),np.nan)
+        cuantiles[nombre] = {x:float(y) for x,y in zip(CUANTILES,q)}
+
+    return {'cte':cte,'periodo':periodos,'amplitud':amplitudes,\
+            'validas':validas,'cuantiles':cuantiles}
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función graficar_distribuciones()
+
+  Motivación
+  - Graficar los histogramas del periodo y la amplitud obtenidos
+    con monte_carlo().
+
+  Parámetros
+  - resultado (dict): diccionario entregado por monte_carlo()
+  - intervalos (int): cantidad de barras de cada histograma
+  - ruta (str): archivo donde se guarda la figura (opcional)
+
+  Funcionamiento
+  - Se dibujan los dos histogramas lado a lado, con líneas en la
+    mediana y en los cuantiles 5% y 95%. Se entregan la figura y los
+    ejes de matplotlib.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def graficar_distribuciones(resultado,intervalos=50,ruta=None):
+
+    #Creación del lienzo
+    fig, axs = plt.subplots(1,2,figsize=(12,6))
+
+    etiquetas = {'periodo':"Periodo límite (millones de años)",
+                 'amplitud':"Amplitud de s(t)"}
+
+    for ax,nombre in zip(axs,('periodo','amplitud')):
+
+        #Histograma de las muestras válidas
+        ax.hist(resultado[nombre][resultado['validas']],bins=intervalos)
+
+        #Cuantiles
+        q = resultado['cuantiles'][nombre]
+        for x,estilo in ((0.05,':'),(0.5,'--'),(0.95,':')):
+            ax.axvline(q[x],color='k',linestyle=estilo,\
+                       label="Cuantil %d%%" % round(100*x))
+
+        #Etiquetas
+        ax.set_xlabel(etiquetas[nombre],labelpad=20)
+        ax.set_ylabel("Cantidad de muestras",labelpad=20)
+
+        #Configuraciones
+        ax.grid(True, which='major', axis='both')
+        ax.margins(0.1)
+
+        # Leyendas
+        ax.legend()
+
+    #Título
+    fig.suptitle("Distribución del periodo y la amplitud (%d muestras)" \
+                 % resultado['validas'].sum(),fontweight="bold")
+
+    #Guardado de figura
+    if ruta is not None:
+        fig.savefig(ruta)
+
+    return fig,axs
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+
+# Tarea numérica - Ecuaciones Diferenciales Ordinarias
+
+# Nombre: Diego Alonso Sánchez Manríquez
+# RUT: 19.957.060-9
+
+# Módulo para definir modelos con más fases (por ejemplo gas ionizado
+# o masa de remanentes) como una red de reacciones, sin editar las
+# funciones del modelo de tres fases. No ejecuta nada al ser
+# importado.
+#
+# Una red se integra con runge_kutta() (cualquier tabla, incluidas
+# 'euler' y 'rk4'), adams_bashforth_moulton() y solucion_RKF(), que
+# reciben red=. euler_progresivo() y runge_kutta4() avanzan a, m y s
+# por componente con dadt(), dmdt() y dsdt(), y sensibilidad() usa
+# las derivadas respecto a k1, k2 y alpha, por lo que siguen siendo
+# solo del modelo de tres fases.
+
+#Librerías importadas
+import numpy as np #usada para resolver vectorialmente
+from integradores import solucion_RKF #usada para integrar con RKF
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ diccionario MODELO
+
+  Motivación
+  - Escribir el modelo de la tarea como red, para comparar con
+    campo() y como ejemplo de la forma de una red.
+
+  Funcionamiento
+  - Una red es un diccionario con 'especies' (nombres, en el orden
+    del vector de estado) y 'reacciones', cada una con 'de' y 'a'
+    (especie que pierde y que gana masa), 'tasa' (nombre de una
+    constante de cte o un número) y 'exponentes' (para cada especie
+    de la que depende la tasa, un número o el nombre de una
+    constante). La reacción traspasa
+    tasa * producto de especie**exponente
+    de la primera especie a la segunda, por lo que la masa total se
+    conserva.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+MODELO = {'especies':['a','m','s'],
+          'reacciones':[{'de':'a','a':'m','tasa':'k1','exponentes':{'a':1,'m':2}},
+                        {'de':'m','a':'s','tasa':'k2','exponentes':{'s':1,'m':'alpha'}},
+                        {'de':'s','a':'a','tasa':1,'exponentes':{'s':1}}]}
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ clase Red
+
+  Motivación
+  - Obtener, a partir de una red, un lado derecho y un jacobiano tan
+    rápidos como campo() y jacobiano(), que sirvan para runge_kutta(),
+    adams_bashforth_moulton() y solucion_RKF().
+
+  Parámetros
+  - red (dict): red con la forma de MODELO
+
+  Funcionamiento
+  - Al crearla se escribe el código de dos funciones con una línea
+    por reacción y una por especie (por ejemplo, para MODELO, las
+    mismas operaciones de campo()), y se compila una sola vez. El
+    código queda en el atributo "codigo".
+  - campo(y,cte,out=None) recibe y de forma (especies,...) y entrega
+    las derivadas con la misma forma, igual que campo().
+  - jacobiano(y,cte) entrega un arreglo de forma
+    (especies,especies,...) cuya fila i y columna j es la derivada de
+    la EDO i respecto a la especie j.
+  - iniciales(cte) entrega las condiciones iniciales: cada especie x
+    toma cte[x+'0'], y a lo más una especie sin valor toma 1 menos la
+    suma de las demás (como s0=1-a0-m0).
+
+  Consideración
+  - Las constantes pueden ser arreglos de largo n, como en
+    runge_kutta(), para integrar n sistemas a la vez.
+  - Al enviarla a otro proceso solo se copia la red, y el código se
+    vuelve a compilar allá.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+class Red:
+
+    def __init__(self,red):
+
+        #Condiciones de los parámetros
+        assert type(red)==dict
+        especies = list(red['especies'])
+        assert len(set(especies))==len(especies)
+        for r in red['reacciones']:
+            assert r['de'] in especies and r['a'] in especies and r['de']!=r['a']
+            assert all(x in especies for x in r['exponentes'])
+
+        self.red = red
+        self.especies = especies
+
+        #Constantes usadas, en el orden en que aparecen
+        self.constantes = []
+        for r in red['reacciones']:
+            for x in [r['tasa']]+list(r['exponentes'].values()):
+                if type(x)==str and x not in self.constantes:
+                    self.constantes.append(x)
+
+        self.codigo = self._escribir()
+        espacio = {'np':np}
+        exec(compile(self.codigo,'<red>','exec'),espacio)
+        self.campo = espacio['campo']
+        self.jacobiano = espacio['jacobiano']
+
+    def __getstate__(self):
+        return {'red':self.red}
+
+    def __setstate__(self,estado):
+        self.__init__(estado['red'])
+
+    def _valor(self,x):
+
+        #Constante de cte o número
+        if type(x)==str:
+            return 'c%d' % self.constantes.index(x)
+        return repr(x)
+
+    def _producto(self,tasa,exponentes,sin=None):
+
+        #Factores de la tasa, omitiendo la especie "sin"
+        factores = [] if tasa==1 else [self._valor(tasa)]
+        for x,p in exponentes.items():
+            i = self.especies.index(x)
+            if x==sin or p==0:
+                continue
+            factores += ['y%d' % i if p==1 else 'y%d**%s' % (i,self._valor(p))]
+        return '*'.join(factores) or '1.0'
+
+    def _escribir(self):
+
+        n = len(self.especies)
+        reacciones = self.red['reacciones']
+        variables = ','.join('y%d' % i for i in range(n))
+        constantes = ''.join("    c%d = cte[%r]\n" % (i,x) \
+                             for i,x in enumerate(self.constantes))
+
+        #Tasas de las reacciones
+        codigo = 'def campo(y,cte,out=None):\n'
+        codigo += '    %s, = y\n' % variables + constantes
+        codigo += '    if out is None:\n        out = np.empty(np.shape(y))\n'
+        for j,r in enumerate(reacciones):
+            codigo += '    r%d = %s\n' % (j,self._producto(r['tasa'],r['exponentes']))
+
+        #Derivada de cada especie: lo que gana menos lo que pierde
+        for i,x in enumerate(self.especies):
+            gana = ['r%d' % j for j,r in enumerate(reacciones) if r['a']==x]
+            pierde = ['r%d' % j for j,r in enumerate(reacciones) if r['de']==x]
+            termino = ' + '.join(gana) if gana else '0*y%d' % i
+            codigo += '    out[%d] = %s\n' % (i,termino+''.join(' - '+p for p in pierde))
+        codigo += '    return out\n\n'
+
+        #Derivadas de las tasas respecto a cada especie
+        codigo += 'def jacobiano(y,cte):\n'
+        codigo += '    %s, = y\n' % variables + constantes
+        codigo += '    J = np.zeros((%d,%d)+np.shape(y0))\n' % (n,n)
+        for j,r in enumerate(reacciones):
+            de = self.especies.index(r['de']); a = self.especies.index(r['a'])
+            for x,p in r['exponentes'].items():
+                if p==0:
+                    continue
+                k = self.especies.index(x)
+                resto = self._producto(r['tasa'],r['exponentes'],sin=x)
+                if type(p)==str:
+                    resto += '*%s*y%d**(%s-1)' % (self._valor(p),k,self._valor(p))
+                elif p==2:
+                    resto += '*2*y%d' % k
+                elif p!=1:
+                    resto += '*%r*y%d**%r' % (p,k,p-1)
+                codigo += '    d = %s\n' % resto
+                codigo += '    J[%d,%d] += d; J[%d,%d] -= d\n' % (a,k,de,k)
+        codigo += '    return J\n'
+
+        return codigo
+
+    def iniciales(self,cte):
+
+        #Especies con valor inicial
+        valores = {x:cte[x+'0'] for x in self.especies if x+'0' in cte}
+        faltan = [x for x in self.especies if x not in valores]
+        assert len(faltan)<=1
+
+        #La que falta completa la masa total (restando en orden, como
+        #s0=1-a0-m0)
+        if faltan:
+            resto = 1
+            for x in self.especies:
+                if x in valores:
+                    resto = resto-valores[x]
+            valores[faltan[0]] = resto
+        return [valores[x] for x in self.especies]
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función solucion_red()
+
+  Motivación
+  - Resolver una red con solve_ivp, como solucion_RKF() con el
+    modelo de tres fases.
+
+  Parámetros
+  - red (Red): red compilada
+  - T (int): extremo superior del intervalo a analizar
+  - dt (float): paso de tiempo de la salida
+  - cte (dict): diccionario con constantes usadas (números)
+  - metodo (str): método de solve_ivp
+  - rtol, atol (float): tolerancias de solve_ivp
+
+  Funcionamiento
+  - Es solucion_RKF(T,dt,cte,red=red,...): se entregan el tiempo y
+    un arreglo por especie, en el orden de red.especies, en los N+1
+    múltiplos de dt entre 0 y T. Los métodos implícitos reciben
+    red.jacobiano().
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def solucion_red(red,T,dt,cte,metodo='RK45',rtol=1e-3,atol=1e-6):
+
+    #Condiciones de los parámetros
+    assert isinstance(red,Red)
+    assert type(T)==int
+    assert type(dt)==float
+    assert type(cte)==dict
+
+    return solucion_RKF(T,dt,cte,metodo=metodo,rtol=rtol,atol=atol,red=red)
@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+
+# Tarea numérica - Ecuaciones Diferenciales Ordinarias
+
+# Nombre: Diego Alonso Sánchez Manríquez
+# RUT: 19.957.060-9
+
+# Módulo con un método de Runge-Kutta explícito general, definido por
+# su tabla de Butcher. No ejecuta nada al ser importado.
+
+#Librerías importadas
+import numpy as np #usada para resolver vectorialmente
+from integradores import campo #lado derecho del sistema con arreglos
+from integradores import MOTIVOS, _salud_conjunto, _tolerancias #revisión de los estados
+from analisis import periodo #usada para medir el efecto de la precisión
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ diccionario TABLAS
+
+  Motivación
+  - Reunir las tablas de Butcher de los métodos disponibles, para
+    elegir el método por su nombre sin escribir un ciclo nuevo.
+
+  Funcionamiento
+  - Cada tabla es un diccionario con 'A' (matriz triangular inferior
+    estricta de coeficientes), 'b' (pesos), 'c' (nodos, la suma de
+    cada fila de A) y 'orden' (orden del método).
+
+  Consideración
+  - Tablas disponibles: 'euler' (orden 1), 'heun' y 'ralston'
+    (orden 2), 'rk3' (Kutta, orden 3), 'rk4' (clásico, orden 4),
+    'rk38' (regla 3/8, orden 4) y 'rk6' (Butcher, 7 etapas, orden 6).
+  - 'rk4' usa las etapas acopladas del método clásico, por lo que no
+    reproduce los valores de runge_kutta4(), que usa etapas por
+    componente.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _tabla(A,b,orden):
+
+    #Se completa A como matriz cuadrada
+    etapas = len(b)
+    matriz = np.zeros((etapas,etapas))
+    for i,fila in enumerate(A):
+        matriz[i,:len(fila)] = fila
+
+    return {'A':matriz,'b':np.array(b,dtype=float),\
+            'c':matriz.sum(axis=1),'orden':orden}
+
+TABLAS = {'euler':_tabla([[]],[1],1),
+
+          'heun':_tabla([[],[1]],[1/2,1/2],2),
+
+          'ralston':_tabla([[],[2/3]],[1/4,3/4],2),
+
+          'rk3':_tabla([[],[1/2],[-1,2]],[1/6,2/3,1/6],3),
+
+          'rk4':_tabla([[],[1/2],[0,1/2],[0,0,1]],\
+                       [1/6,1/3,1/3,1/6],4),
+
+          'rk38':_tabla([[],[1/3],[-1/3,1],[1,-1,1]],\
+                        [1/8,3/8,3/8,1/8],4),
+
+          'rk6':_tabla([[],
+                        [1/3],
+                        [0,2/3],
+                        [1/12,1/3,-1/12],
+                        [-1/16,9/8,-3/16,-3/8],
+                        [0,9/8,-3/8,-3/4,1/2],
+                        [9/44,-9/11,63/44,18/11,0,-16/11]],\
+                       [11/120,0,27/40,27/40,-4/15,-4/15,11/120],6)}
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función _cantidad_sistemas()
+
+  Motivación
+  - Saber cuántos sistemas se integran a la vez según las constantes.
+
+  Parámetros
+  - cte (dict): diccionario con constantes usadas
+
+  Funcionamiento
+  - Se entrega n, el largo común de las constantes que son arreglos,
+    o None si todas son números (un solo sistema).
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _cantidad_sistemas(cte):
+
+    forma = np.broadcast_shapes(*(np.shape(x) for x in cte.values()))
+    assert len(forma)<=1
+
+    return forma[0] if len(forma)==1 else None
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función runge_kutta()
+
+  Motivación
+  - Resolver el sistema de EDO's asociado a las funciones a(t), m(t)
+    y s(t) con cualquier método de Runge-Kutta explícito, usando un
+    solo ciclo para todos, y para muchos sistemas a la vez.
+
+  Parámetros
+  - T (int): extremo superior del intervalo a analizar
+  - dt (float): paso de tiempo (medido en millones de años)
+  - cte (dict): diccionario con constantes usadas. Las constantes
+    (incluidas a0 y m0) pueden ser arreglos de largo n para integrar
+    n sistemas a la vez
+  - tabla (str o dict): nombre de una tabla de TABLAS, o una tabla
+    con la misma forma
+  - precision (str): 'float64' o 'float32'
+  - registro (dict): con precision='float32', recibe la desviación
+    del periodo respecto a float64, y con "vigilar" los sistemas
+    detenidos (opcional)
+  - vigilar (float o tuple): tolerancia del rango, o (rango,
+    deriva), para detener los sistemas cuya solución falla
+    (opcional)
+  - red (Red): red compilada de redes.py, para integrar otro modelo
+    en lugar del de tres fases (opcional)
+
+  Funcionamiento
+  - Al llamar la función, se entregan cuatro arreglos (t,a,m,s) que
+    corresponden a la solución numérica del sistema de EDO's. Si se
+    integran n sistemas, a, m y s tienen forma (N+1,n).
+  - Las etapas se guardan en un arreglo reservado una sola vez, y
+    cada etapa se arma con un único producto entre la fila de A y
+    las etapas anteriores, para todas las variables y sistemas.
+  - Con precision='float32' las etapas, las constantes y la solución
+    entregada son float32, por lo que caben el doble de sistemas en
+    la misma memoria. El estado que se va sumando paso a paso sigue
+    en float64, pues los incrementos son del orden de dt y en
+    float32 se perderían al sumarlos.
+  - Si además se entrega registro, se vuelven a integrar en float64
+    hasta 8 sistemas repartidos en el conjunto y se guarda en
+    registro['desviacion'] la mayor diferencia relativa de sus
+    periodos, y en registro['muestra'] los índices usados.
+  - Con "vigilar", después de cada paso se revisan todos los
+    sistemas con _salud_conjunto() (ver _tolerancias() en
+    integradores.py). Un sistema con alguna etapa negativa cuyo
+    estado queda en nan se informa como 'complejo', igual que en
+    runge_kutta4(). Los que fallan se sacan de los
+    arreglos de trabajo, por lo que los pasos siguientes cuestan
+    solo lo de los sistemas restantes, y su solución queda en nan
+    desde ese paso. En registro['fallas'] se guarda, para cada uno,
+    un diccionario con 'sistema' (índice), 'motivo', 't', 'paso' y
+    'estado', como el diagnóstico de FallaNumerica.
+
+  - Con "red" se usan red.campo() y red.iniciales() en lugar de
+    campo() y de a0, m0, y se entrega el tiempo seguido de un arreglo
+    por especie, en el orden de red.especies. La desviación de
+    float32 se mide en la última especie.
+
+  Consideración
+  - Como la función entrega cuatro arreglos, se deben "recibir" con
+    una asignación múltiple de la forma t,a,m,s=runge_kutta().
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def runge_kutta(T,dt,cte,tabla='rk4',precision='float64',registro=None,\
+                vigilar=None,red=None):
+
+    #Se busca la tabla si se entregó su nombre
+    if type(tabla)==str:
+        tabla = TABLAS[tabla]
+
+    #Condiciones de los parámetros
+    assert type(T)==int
+    assert type(dt)==float
+    assert type(cte)==dict
+    assert type(tabla)==dict
+    assert precision in ('float64','float32')
+    assert vigilar is None or _tolerancias(vigilar) is not None
+
+    A = tabla['A']; b = tabla['b']
+    etapas = len(b)
+
+    #Cantidad de puntos y de sistemas
+    N = int(T/dt)
+    n = _cantidad_sistemas(cte)
+    ancho = 1 if n is None else n
+
+    #Lado derecho y cantidad de variables
+    derivadas = campo if red is None else red.campo
+    v = 3 if red is None else len(red.especies)
+
+    #Condiciones iniciales (el estado que se acumula es float64)
+    y = np.empty((v,ancho))
+    if red is None:
+        y[0] = cte['a0']; y[1] = cte['m0']; y[2] = 1-y[0]-y[1]
+    else:
+        for j,x in enumerate(red.iniciales(cte)):
+            y[j] = x
+
+    #Constantes y coeficientes en la precisión pedida
+    original = cte
+    cte = {x:np.asarray(y,dtype=precision) for x,y in cte.items()}
+    A = A.astype(precision); b = b.astype(precision)
+
+    #Arreglos reservados para las etapas y la solución
+    K = np.empty((etapas,v,ancho),dtype=precision)
+    Y = np.empty((v,ancho),dtype=precision)
+    suma = np.empty(v*ancho,dtype=precision)
+    sol = np.empty((N+1,v,ancho),dtype=precision)
+    sol[0] = y
+
+    #Vistas planas de las etapas y la suma, para los productos
+    K_plano = K.reshape(etapas,-1)
+    suma_forma = suma.reshape(v,ancho)
+
+    #Sistemas que siguen integrándose (None si son todos)
+    activos = None
+    tolerancias = _tolerancias(vigilar)
+    if registro is not None and vigilar is not None:
+        registro['fallas'] = []
+
+    #Se aplica el método guardando los valores
+    for i in range(N):
+
+        #Etapas
+        for e in range(etapas):
+            if e==0:
+                np.copyto(Y,y)
+            else:
+                np.dot(A[e,:e],K_plano[:e],out=suma)
+                np.multiply(suma_forma,dt,out=Y)
+                Y += y
+            derivadas(Y,cte,out=K[e])
+
+            #Etapas con fracciones negativas (su nan es un complejo)
+            if vigilar is not None:
+                negativos = (Y<0).any(axis=0) if e==0 else negativos|(Y<0).any(axis=0)
+
+        #Combinación de las etapas
+        np.dot(b,K_plano,out=suma)
+        suma *= dt
+        y += suma_forma
+
+        #Sistemas cuya solución falla
+        if vigilar is not None:
+            motivo = _salud_conjunto(y,*tolerancias,negativos=negativos)
+            if (motivo>=0).any():
+                indices = np.arange(ancho) if activos is None else activos
+                buenos = motivo<0
+                if registro is not None:
+                    registro['fallas'] += [{'sistema':int(indices[j]),\
+                        'motivo':MOTIVOS[motivo[j]],'t':(i+1)*dt,'paso':i+1,\
+                        'estado':tuple(float(x) for x in y[:,j])} \
+                        for j in np.nonzero(~buenos)[0]]
+                sol[i+1:,:,indices[~buenos]] = np.nan
+
+                #Se sacan de los arreglos de trabajo
+                activos = indices[buenos]
+                if len(activos)==0:
+                    break
+                y = y[:,buenos]
+                cte = {x:(z[buenos] if np.ndim(z)==1 else z) for x,z in cte.items()}
+                K = np.empty((etapas,v,len(activos)),dtype=precision)
+                Y = np.empty((v,len(activos)),dtype=precision)
+                suma = np.empty(v*len(activos),dtype=precision)
+                K_plano = K.reshape(etapas,-1)
+                suma_forma = suma.reshape(v,len(activos))
+
+        if activos is None:
+            sol[i+1] = y
+        else:
+            sol[i+1][:,activos] = y
+
+    #Tiempos
+    t = np.arange(N+1)*dt
+
+    #Desviación del periodo en una muestra integrada en float64
+    if registro is not None and precision=='float32':
+        muestra = np.unique(np.linspace(0,ancho-1,min(8,ancho)).round().astype(int))
+        registro['muestra'] = muestra
+        registro['desviacion'] = _desviacion(T,dt,original,tabla,t,\
+                                             sol[:,v-1,muestra],muestra,red)
+
+    #Se entregan las soluciones al sistema de EDO's
+    if n is None:
+        return (t,)+tuple(sol[:,j,0] for j in range(v))
+    return (t,)+tuple(sol[:,j] for j in range(v))
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función _desviacion()
+
+  Motivación
+  - Medir cuánto cambia el periodo al integrar en float32, para saber
+    si la precisión alcanza en un barrido.
+
+  Parámetros
+  - T (int), dt (float), cte (dict), tabla (dict): los de la corrida
+  - t (array): tiempos de la corrida
+  - s (array): s(t) en float32 de los sistemas de la muestra, de
+    forma (N+1,k)
+  - muestra (array): índices de esos sistemas
+  - red (Red): red de la corrida (o None)
+
+  Funcionamiento
+  - Se integran en float64 solo los sistemas de la muestra y se
+    entrega la mayor diferencia relativa entre los periodos. Los
+    sistemas sin periodo (menos de dos máximos) no se consideran, y
+    si ninguno lo tiene se entrega nan.
+  - Los periodos se obtienen con refinar='parabola' y promediando
+    hasta 5 ciclos. Con los máximos en la malla, ambos periodos
+    serían diferencias de tiempos de la malla y la desviación solo
+    podría ser 0 o un múltiplo de dt/P, muy por sobre 1e-5.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _desviacion(T,dt,cte,tabla,t,s,muestra,red=None):
+
+    #Constantes de la muestra
+    cte = {x:(np.asarray(y)[muestra] if np.ndim(y)==1 else y) \
+           for x,y in cte.items()}
+
+    #Referencia en float64
+    s64 = runge_kutta(T,dt,cte,tabla,red=red)[-1]
+    s64 = s64.reshape(len(t),-1)
+
+    desviaciones = []
+    for j in range(len(muestra)):
+        try:
+            p32 = periodo(t,s[:,j],refinar='parabola',ciclos=5)
+            p64 = periodo(t,s64[:,j],refinar='parabola',ciclos=5)
+        except (IndexError,AssertionError):
+            continue
+        desviaciones += [abs(p32-p64)/p64]
+
+    return float(max(desviaciones)) if desviaciones else float('nan')
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+
+# Tarea numérica - Ecuaciones Diferenciales Ordinarias
+
+# Nombre: Diego Alonso Sánchez Manríquez
+# RUT: 19.957.060-9
+
+# Módulo con el análisis de sensibilidad del modelo respecto a sus
+# constantes k1, k2 y alpha. No ejecuta nada al ser importado.
+
+#Librerías importadas
+import numpy as np #usada para resolver vectorialmente
+from scipy.integrate import solve_ivp #usada para resolver el sistema ampliado
+from integradores import campo, jacobiano #lado derecho y sus derivadas
+
+#Constantes respecto a las que se deriva
+PARAMETROS = ('k1','k2','alpha')
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función jacobiano_parametros()
+
+  Motivación
+  - Obtener las derivadas parciales del lado derecho del sistema
+    respecto a las constantes, que son el término forzante de las
+    ecuaciones variacionales.
+
+  Parámetros
+  - a (float): fracción de masa de gas atómico
+  - m (float): fracción de masa de gas molecular
+  - s (float): fracción de masa de estrellas activas
+  - cte (dict): diccionario con constantes usadas
+
+  Funcionamiento
+  - Se entrega la matriz de 3x3 (np.array) cuya fila i y columna j
+    es la derivada de la EDO i (da/dt, dm/dt, ds/dt) respecto a la
+    constante j (k1, k2, alpha).
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def jacobiano_parametros(a,m,s,cte):
+
+    #Condiciones de los parámetros
+    assert type(cte)==dict
+
+    k2 = cte['k2']; alpha = cte['alpha']
+
+    #Términos que se repiten
+    am2 = a*m**2
+    m_alpha = m**alpha
+    log_m = np.log(m) if m>0 else 0.0
+
+    #Se entrega la matriz
+    return np.array([[-am2, 0.0, 0.0],
+                     [am2, -s*m_alpha, -k2*s*m_alpha*log_m],
+                     [0.0, s*m_alpha, k2*s*m_alpha*log_m]])
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ funciones _F_variacional() _maximo_s()
+
+  Motivación
+  - Lado derecho del sistema ampliado con las ecuaciones
+    variacionales, y evento de solve_ivp para los máximos de s(t).
+
+  Parámetros
+  - t (float): tiempo (no se usa, el sistema es autónomo)
+  - y (array): estado (a,m,s) seguido de la matriz de sensibilidades
+    S (3x3, por filas), con S[i,j] = d(variable i)/d(constante j)
+  - cte (dict): diccionario con constantes usadas
+
+  Funcionamiento
+  - Las sensibilidades cumplen dS/dt = J*S + Jp, donde J es el
+    jacobiano respecto al estado y Jp el de las constantes. Como a0 y
+    m0 no dependen de las constantes, S(0)=0.
+  - _maximo_s() es ds/dt, que pasa de positivo a negativo en cada
+    máximo de s(t).
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def _F_variacional(t,y,cte):
+
+    a,m,s = y[:3]
+    S = y[3:].reshape(3,3)
+
+    #Derivadas del estado y de las sensibilidades
+    dS = jacobiano(a,m,s,cte)@S + jacobiano_parametros(a,m,s,cte)
+
+    return np.concatenate((campo(y[:3],cte),dS.ravel()))
+
+def _maximo_s(t,y,cte):
+
+    return campo(y[:3],cte)[2]
+
+_maximo_s.direction = -1
+
+#%%
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+  @ función sensibilidad()
+
+  Motivación
+  - Saber cuánto cambian la solución y el periodo límite al cambiar
+    k1, k2 o alpha, con una sola integración en lugar de repetir la
+    simulación con constantes perturbadas (2p+1 corridas).
+
+  Parámetros
+  - T (int): extremo superior del intervalo a analizar
+  - cte (dict): diccionario con constantes usadas
+  - dt (float): separación de los tiempos entregados (opcional, por
+    omisión se entregan los pasos de solve_ivp)
+  - metodo (str): método de solve_ivp
+  - rtol, atol (float): tolerancias de solve_ivp
+
+  Funcionamiento
+  - Se integra el estado junto a las ecuaciones variacionales y se
+    entrega un diccionario con:
+    't': tiempos
+    'estado': arreglo (3,len(t)) con a, m y s
+    'S': arreglo (3,3,len(t)) con d(a,m,s)/d(k1,k2,alpha)
+    'periodo': último periodo de s(t)
+    'dperiodo': diccionario con d(periodo)/d(constante)
+  - Los máximos de s(t) se encuentran con un evento de solve_ivp en
+    ds/dt=0 y se filtran como en periodo(), dejando los cercanos al
+    mayor. En un máximo g=ds/dt vale 0, por lo que su tiempo t* cambia
+    según dt*/dp = -(dg/dy*S + dg/dp)/(dg/dt), y la sensibilidad del
+    periodo es la diferencia entre las de los dos últimos máximos.
+
+  Consideración
+  - En un ciclo límite las sensibilidades del estado crecen con el
+    tiempo, pues un cambio en el periodo desfasa la solución cada
+    vez más. Eso es esperable y no afecta a la del periodo.
+  - Si hay menos de dos máximos, 'periodo' y 'dperiodo' son None.
+
+"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+
+def sensibilidad(T,cte,dt=None,metodo='DOP853',rtol=1e-8,atol=1e-10):
+
+    #Condiciones de los parámetros
+    assert type(T)==int
+    assert type(cte)==dict
+    assert dt is None or type(dt)==float
+
+    #Estado inicial ampliado, con S(0)=0
+    y0 = np.zeros(12)
+    y0[:3] = cte['a0'],cte['m0'],1-cte['a0']-cte['m0']
+
+    #Se integra el sistema ampliado buscando los máximos de s
+    sol = solve_ivp(_F_variacional,(0,T),y0,method=metodo,rtol=rtol,\
+          atol=atol,events=_maximo_s,args=(cte,),\
+          t_eval=None if dt is None else np.arange(int(T/dt)+1)*dt)
+
+    resultado = {'t':sol.t,'estado':sol.y[:3],\
+                 'S':sol.y[3:].reshape(3,3,-1),\
+                 'periodo':None,'dperiodo':None}
+
+    #Máximos cercanos al mayor, como en periodo()
+    tiempos = sol.t_events[0]; estados = sol.y_events[0]
+    if len(tiempos)==0:
+        return resultado
+    cercanos = [i for i in range(len(tiempos)) \
+                if round(abs(estados[:,2].max()-estados[i,2]),1)==0]
+    if len(cercanos)<2:
+        return resultado
+
+    #Sensibilidad del tiempo de cada uno de los dos últimos máximos
+    dtiempos = []
+    for i in cercanos[-2:]:
+        a,m,s = estados[i,:3]
+        S = estados[i,3:].reshape(3,3)
+        J = jacobiano(a,m,s,cte)
+        Jp = jacobiano_parametros(a,m,s,cte)
+        dgdt = J[2]@campo(estados[i,:3],cte)
+        dtiempos += [-(J[2]@S + Jp[2])/dgdt]
+
+    resultado['periodo'] = float(tiempos[cercanos[-1]]-tiempos[cercanos[-2]])
+    resultado['dperiodo'] = {x:float(y) for x,y in \
+                             zip(PARAMETROS,dtiempos[1]-dtiempos[0])}
+
+    return resultado
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+
+# Los módulos de Código se importan por su nombre, igual que en los
+# scripts de cada parte.
+
+import os
+import sys
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
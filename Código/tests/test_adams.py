@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+from adams import adams_bashforth_moulton
+from integradores import solucion_RKF
+
+#Caso 4 (alpha=1.9), con una solución suave
+CTE = {'k1':8.0,'k2':15.0,'alpha':1.9,'a0':0.4,'m0':0.3}
+
+@pytest.mark.parametrize('modo',['PECE','PEC'])
+def test_orden_observado(modo):
+
+    #Estado final con dt, dt/2 y dt/4
+    y = [np.array(adams_bashforth_moulton(10,dt,CTE,modo=modo)[1:])[:,-1] \
+         for dt in (0.01,0.005,0.0025)]
+    orden = np.log2(np.max(np.abs(y[0]-y[1]))/np.max(np.abs(y[1]-y[2])))
+    assert abs(orden-4) < 0.3
+
+def test_paso_variable_llega_a_T():
+
+    t,a,m,s = adams_bashforth_moulton(100,0.3,CTE,variable=True,tol=1e-8)
+    assert t[-1] == 100.0 and np.all(np.diff(t) > 0)
+
+    referencia = solucion_RKF(100,None,CTE,rtol=1e-10,atol=1e-12)
+    assert abs(s[-1]-referencia[3][-1]) < 1e-5
+
+def test_paso_variable_rechaza_nan():
+
+    #Con pasos grandes m queda negativo y m**alpha es nan
+    cte = dict(CTE,alpha=1.5)
+    with np.errstate(invalid='ignore'):
+        t,a,m,s = adams_bashforth_moulton(100,2.0,cte,variable=True,tol=1e-3)
+        assert t[-1] == 100.0 and np.isfinite(s).all()
+
+        #Con tol=0.1 se acepta un paso que deja m negativo, y desde ahí
+        #ningún paso es finito
+        with pytest.raises(FloatingPointError):
+            adams_bashforth_moulton(100,2.0,cte,variable=True,tol=1e-1)
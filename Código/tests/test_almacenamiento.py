@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+import io
+import numpy as np
+import pytest
+from analisis import periodo
+from almacenamiento import SalidaAnillo, SalidaMemmap, exportar, importar, _escribir_cabecera
+from integradores import euler_progresivo, reanudar, runge_kutta4
+
+#Constantes del caso 1, con tipos de numpy
+CTE = {'k1':np.int64(10),'k2':np.float32(5.0),'alpha':np.float64(1.5),
+       'a0':np.array([0.5,0.4]),'m0':0.2}
+
+def test_exportar_constantes_numpy(tmp_path):
+
+    t,a,m,s = runge_kutta4(1,0.01,{'k1':10.0,'k2':5.0,'alpha':1.5,\
+                                   'a0':0.5,'m0':0.2})
+
+    for ruta in (str(tmp_path/'corrida.npz'),str(tmp_path/'corrida')):
+        exportar(ruta,t,a,m,s,CTE,'RK4',np.float64(0.01),1,np.float32(2.5))
+        (t2,a2,m2,s2),meta = importar(ruta)
+
+        assert np.array_equal(t2,t) and np.array_equal(s2,s)
+        assert meta['cte'] == {'k1':10,'k2':5.0,'alpha':1.5,\
+                               'a0':[0.5,0.4],'m0':0.2}
+        assert meta['dt'] == 0.01 and meta['T'] == 1
+        assert meta['periodo'] == 2.5 and meta['largo'] == len(t)
+
+def test_cabecera_no_cambia_de_largo():
+
+    #La cabecera tiene el mismo largo con cualquier cantidad de valores
+    largos = set()
+    for n in (0,1,10**3,10**9,10**15):
+        with io.BytesIO() as archivo:
+            largos.add(_escribir_cabecera(archivo,n))
+    assert len(largos) == 1
+
+def test_memmap_crece_y_continua(tmp_path):
+
+    carpeta = str(tmp_path/'salida')
+    valores = np.arange(4*100,dtype=float).reshape(4,100)
+
+    #Puntos sueltos (varios bloques) y un bloque completo
+    salida = SalidaMemmap(carpeta,bloque=7)
+    for x in valores[:,:60].T:
+        salida.agregar(*x)
+    salida.agregar_bloque(*valores[:,60:])
+    assert salida.largo == 100
+    for vista,fila in zip(salida.vistas(),valores):
+        assert np.array_equal(vista,fila)
+        assert np.array_equal(np.load(vista.filename),fila)
+
+    #Al continuar se descartan los valores posteriores
+    salida = SalidaMemmap(carpeta,bloque=7,continuar=40)
+    assert salida.largo == 40 and salida.ultimo() == tuple(valores[:,39])
+    for vista,fila in zip(salida.vistas(),valores):
+        assert np.array_equal(vista,fila[:40])
+    salida.agregar(*valores[:,40])
+    assert all(len(x)==41 for x in salida.vistas())
+
+@pytest.mark.parametrize('integrador',[euler_progresivo,runge_kutta4])
+def test_memmap_igual_a_memoria(integrador,tmp_path):
+
+    cte = {'k1':10.0,'k2':5.0,'alpha':1.5,'a0':0.5,'m0':0.2}
+    esperado = integrador(20,0.01,cte)
+
+    #Corrida completa en disco
+    salida = SalidaMemmap(str(tmp_path/'completa'),bloque=64)
+    obtenido = integrador(20,0.01,cte,salida=salida)
+    assert all(np.array_equal(x,y) for x,y in zip(obtenido,esperado))
+
+    #Corrida interrumpida y reanudada en disco
+    ruta = str(tmp_path/'punto.pkl')
+    salida = SalidaMemmap(str(tmp_path/'reanudada'),bloque=64)
+    integrador(10,0.01,cte,cada=300,ruta=ruta,salida=salida)
+    obtenido = reanudar(ruta,20)
+    assert all(np.array_equal(x,y) for x,y in zip(obtenido,esperado))
+
+@pytest.mark.parametrize('integrador',[euler_progresivo,runge_kutta4])
+def test_anillo_igual_a_periodo(integrador):
+
+    cte = {'k1':8.0,'k2':15.0,'alpha':1.9,'a0':0.4,'m0':0.3}
+    t,a,m,s = integrador(40,0.001,cte)
+
+    #El anillo guarda unos 2.6 periodos y da varias vueltas
+    salida = SalidaAnillo(largo=10000)
+    cola = integrador(40,0.001,cte,salida=salida)
+    assert salida.largo == len(t) > 4*salida.bloque
+    assert np.array_equal(cola[3],s[-10000:])
+
+    #periodo() sobre los mismos valores que conserva el anillo
+    esperado = periodo(t[-10000:],s[-10000:],refinar='parabola')
+    assert salida.resumen()['periodo'] == esperado
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+from analisis import _extrapolar, periodo, periodo_espectral, richardson
+from integradores import campo, euler_progresivo, runge_kutta4, solucion_RKF
+
+CASO3 = {'k1':8,'k2':15,'alpha':1.5,'a0':0.4,'m0':0.3}
+CASO4 = dict(CASO3,alpha=1.9)
+
+def test_richardson_orden_del_periodo():
+
+    resultado = richardson(euler_progresivo,100,0.01,CASO3)
+
+    assert resultado['error'] is None
+    assert abs(resultado['periodo']['orden']-1) < 0.1
+
+def test_richardson_informa_corrida_fallida():
+
+    resultado = richardson(runge_kutta4,100,0.01,CASO3)
+
+    assert resultado['periodo'] is None and resultado['final'] is None
+    assert resultado['error'].startswith('dt=0.01, AssertionError')
+
+@pytest.mark.parametrize('integrador,dt,orden,opciones',
+                         [(euler_progresivo,0.01,1,{}),
+                          (runge_kutta4,0.04,4,{'positivo':True})])
+def test_orden_observado_del_estado_final(integrador,dt,orden,opciones):
+
+    #Con positivo=True, RK4 usa las etapas acopladas del método clásico
+    resultado = richardson(integrador,5,dt,CASO4,**opciones)
+    assert resultado['final']['confiable']
+    assert abs(resultado['final']['orden']-orden) < 0.1
+
+@pytest.mark.parametrize('q',[(1.0,2.0,3.0),(1.0,1.5,2.5)])
+def test_extrapolar_sin_orden_confiable(q):
+
+    #Diferencias iguales (p=0) o que crecen (p<0)
+    resultado = _extrapolar(*q)
+    assert not resultado['confiable']
+    assert resultado['extrapolado'] == q[2] and resultado['error'] == 1.0
+    assert np.isfinite(resultado['orden'])
+
+@pytest.mark.parametrize('cte',[CASO3,CASO4])
+def test_periodo_refinado(cte):
+
+    #Trayectoria de referencia, sin el transiente
+    t,a,m,s = (x[20000:] for x in solucion_RKF(100,0.001,cte,rtol=1e-11,atol=1e-13))
+    esperado = periodo(t,s,refinar='parabola',ciclos=5)
+
+    #Los mismos valores cada 50 pasos (dt=0.05)
+    t,a,m,s = (x[::50] for x in (t,a,m,s))
+    ds = campo(np.vstack((a,m,s)),cte)[2]
+    malla = abs(periodo(t,s,ciclos=5)-esperado)
+
+    for refinar in ('parabola','hermite'):
+        registro = {}
+        error = abs(periodo(t,s,refinar=refinar,ds=ds,ciclos=5,registro=registro)-esperado)
+        assert registro['ciclos'] == 5
+        assert error < 1e-4 and error < malla/20
+
+def test_periodo_con_maximo_del_transiente():
+
+    #Con alpha=1.9 el primer máximo es el mayor y solo queda el siguiente
+    t,a,m,s = solucion_RKF(60,0.001,CASO4)
+    registro = {}
+    periodo(t,s,refinar='parabola',ciclos=5,registro=registro)
+    assert registro['ciclos'] == 1 and np.isnan(registro['error'])
+    assert registro['picos'][0] < 1
+
+    #Sin el transiente se usan los cinco periodos
+    registro = {}
+    periodo(t[20000:],s[20000:],refinar='parabola',ciclos=5,registro=registro)
+    assert registro['ciclos'] == 5 and np.isfinite(registro['error'])
+
+@pytest.mark.parametrize('P',[0.93,3.7,10.47])
+def test_periodo_espectral_seno(P):
+
+    #Cola sin un número entero de ciclos, con y sin armónicos
+    t = np.arange(20001)*0.01
+    w = 2*np.pi/P
+    for x in (np.sin(w*t+0.3),np.sin(w*t)+0.9*np.sin(2*w*t+1),np.sin(w*t)**9):
+        obtenido,confianza = periodo_espectral(t,x)
+        assert abs(obtenido/P-1) < 1e-6 and confianza > 0.999
+
+    #Varias columnas, una sin oscilación
+    x = np.column_stack((np.sin(w*t),np.sin(w*t/2),np.ones_like(t)))
+    periodos,confianzas = periodo_espectral(t,x)
+    assert np.allclose(periodos[:2],(P,2*P),rtol=1e-6)
+    assert np.isnan(periodos[2]) and np.isnan(confianzas[2])
+
+def test_periodo_espectral_del_modelo():
+
+    #Misma cola que se usa por omisión (la segunda mitad)
+    t,a,m,s = solucion_RKF(200,0.01,CASO3,rtol=1e-10,atol=1e-12)
+    esperado = periodo(t[10000:],s[10000:],refinar='parabola',ciclos=5)
+    obtenido,confianza = periodo_espectral(t,s)
+    assert abs(obtenido-esperado) < 1e-4 and confianza > 0.99
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+from comparacion import _correr, comparar, tabla_periodos
+
+#Un caso que oscila y otro que llega a un punto fijo (sin dos máximos)
+CASOS = {'oscila':{'k1':8.0,'k2':15.0,'alpha':1.9,'a0':0.4,'m0':0.3},
+         'estable':{'k1':1.0,'k2':1.0,'alpha':1.0,'a0':0.4,'m0':0.3}}
+METODOS = ('EP','RK4','RKF')
+
+def _sin_segundos(resultado):
+    return {x:y for x,y in resultado.items() if x!='segundos'}
+
+def test_comparar_igual_a_serie():
+
+    resultados = list(comparar(CASOS,METODOS,T=20,dt=0.01,procesos=2))
+
+    #Una corrida por par (método, caso), con los mismos valores
+    obtenido = {(r['metodo'],r['caso']):_sin_segundos(r) for r in resultados}
+    assert len(resultados) == len(obtenido) == 6
+    for caso,cte in CASOS.items():
+        for metodo in METODOS:
+            esperado = _sin_segundos(_correr(metodo,caso,20,0.01,cte))
+            assert obtenido[(metodo,caso)] == esperado
+
+    #Las corridas sin periodo tienen su propio error y no detienen al resto
+    for r in resultados:
+        assert r['final'] is not None and r['segundos'] > 0
+        if r['caso']=='estable':
+            assert r['periodo'] is None and r['error'].startswith('IndexError')
+        else:
+            assert r['periodo'] > 0 and r['error'] is None
+
+    tabla = tabla_periodos(resultados,CASOS)
+    assert all(x[1] is None and x[0] > 0 for x in tabla.values())
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+import importlib
+import sys
+from construccion import Nodo, construir, nodos_partes
+from escenarios import cargar_manifiesto
+
+def _duplicar(x):
+    return auxiliar.factor*x
+
+def test_cambio_de_modulo_invalida_nodo(tmp_path,monkeypatch):
+
+    global auxiliar
+    monkeypatch.syspath_prepend(str(tmp_path))
+    (tmp_path/'auxiliar.py').write_text('factor = 2\n')
+    auxiliar = importlib.import_module('auxiliar')
+
+    nodo = Nodo('doble',_duplicar,{'x':3},modulos=[auxiliar])
+    assert construir([nodo],str(tmp_path/'r')) == ['doble']
+    assert construir([nodo],str(tmp_path/'r')) == []
+
+    #El código de la función no cambia, pero sí el del módulo que llama
+    (tmp_path/'auxiliar.py').write_text('factor = 3\n')
+    auxiliar = importlib.reload(auxiliar)
+    nodo = Nodo('doble',_duplicar,{'x':3},modulos=[auxiliar])
+    assert construir([nodo],str(tmp_path/'r')) == ['doble']
+
+    del sys.modules['auxiliar']
+
+def _escribir(titulo,ruta):
+    with open(ruta,'w') as archivo:
+        archivo.write(titulo)
+
+def test_volver_a_una_version_anterior(tmp_path):
+
+    figura = str(tmp_path/'figura.txt')
+    A = Nodo('figura',_escribir,{'titulo':'titulo A'},archivo=figura)
+    B = Nodo('figura',_escribir,{'titulo':'titulo B'},archivo=figura)
+
+    assert construir([A],str(tmp_path/'r')) == ['figura']
+    assert construir([B],str(tmp_path/'r')) == ['figura']
+
+    #El resultado de A está guardado, pero el archivo es el de B
+    assert construir([A],str(tmp_path/'r')) == ['figura']
+    assert open(figura).read() == 'titulo A'
+    assert construir([A],str(tmp_path/'r')) == []
+
+def test_nodos_del_manifiesto():
+
+    manifiesto = cargar_manifiesto()
+    nodos = nodos_partes(manifiesto,imagenes='Imágenes')
+
+    #Figuras de A, B y C por caso, y una de periodos en C, D y E
+    assert len(nodos) == 6+6+7+3
+    titulos = {x.nombre:x.argumentos.get('titulo') for x in nodos}
+    assert titulos['D figura de periodos'] == \
+           manifiesto['partes']['D']['salidas'][0]['titulo']
+
+    #Las simulaciones de EP y RK4 de D y E son las mismas
+    simulaciones = {}
+    for nodo in nodos:
+        if nodo.nombre.endswith('figura de periodos'):
+            simulaciones[nodo.nombre[0]] = {y.clave() for x in nodo.dependencias \
+                                            for y in x.dependencias}
+    assert len(simulaciones['D'] & simulaciones['E']) == 14
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import escenarios
+from escenarios import cargar_manifiesto, ejecutar_manifiesto, planificar
+
+CTE = {'k1':8,'k2':15,'alpha':1.5,'a0':0.4,'m0':0.3}
+
+#Las partes D y E piden EP y RK4 con el mismo caso, T y dt
+MANIFIESTO = {'casos':{'Caso 3':CTE,'Caso 3 (float)':{x:float(y) for x,y in CTE.items()}},
+              'partes':{'A':{'metodos':['EP'],'T':100,'dt':0.1,\
+                             'casos':['Caso 3'],'salidas':[]},
+                        'D':{'metodos':['EP','RK4'],'T':100,'dt':0.001,\
+                             'casos':['Caso 3'],'salidas':[]},
+                        'E':{'metodos':['EP','RK4','RKF','ABM'],'T':100,\
+                             'dt':0.001,'casos':['Caso 3 (float)'],'salidas':[]}}}
+
+def test_deduplicacion_del_manifiesto():
+
+    #EP y RK4 de la parte D se repiten en la parte E
+    trabajos = planificar(cargar_manifiesto())
+    assert sum(len(x['usos']) for x in trabajos) == 54
+    assert len(trabajos) == 40
+
+def test_orden_de_despacho(monkeypatch,tmp_path):
+
+    #Se registran las simulaciones corridas, con una trayectoria falsa
+    corridas = []
+    def _simular(integrador,T,dt,cte):
+        corridas.append((integrador.__name__,dt))
+        t = np.arange(0,T,0.01)
+        return t,t,t,np.sin(t)
+    monkeypatch.setattr(escenarios,'_simular',_simular)
+
+    resultado = ejecutar_manifiesto(MANIFIESTO,imagenes=str(tmp_path))
+
+    #Cada simulación distinta una vez, de la más larga a la más corta
+    #(medidas: ABM 2.3 s, RK4 0.46 s, EP 0.12 s, RKF 0.02 s y EP con
+    #dt=0.1 0.0013 s)
+    assert resultado['pedidas'] == 7 and resultado['trabajos'] == 5
+    assert corridas == [('adams_bashforth_moulton',0.001),('runge_kutta4',0.001),\
+                        ('euler_progresivo',0.001),('solucion_RKF',0.001),\
+                        ('euler_progresivo',0.1)]
+    assert resultado['periodos'][('D','EP','Caso 3')] == \
+           resultado['periodos'][('E','EP','Caso 3 (float)')]
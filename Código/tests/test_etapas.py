@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+import os
+from construccion import FIGURAS, _simular
+from etapas import _periodo_o_nada, ejecutar
+from integradores import euler_progresivo, runge_kutta4, solucion_RKF
+
+#Casos que oscilan y uno que llega a un punto fijo (sin periodo)
+CASOS = {'alpha 1.5':{'k1':8.0,'k2':15.0,'alpha':1.5,'a0':0.4,'m0':0.3},
+         'alpha 1.9':{'k1':8.0,'k2':15.0,'alpha':1.9,'a0':0.4,'m0':0.3},
+         'estable':{'k1':1.0,'k2':1.0,'alpha':1.0,'a0':0.4,'m0':0.3}}
+METODOS = {'EP':euler_progresivo,'RK4':runge_kutta4,'RKF':solucion_RKF}
+
+def test_etapas_igual_a_serie(tmp_path):
+
+    trabajos = []
+    for metodo,integrador in METODOS.items():
+        for caso,cte in CASOS.items():
+            trabajo = {'nombre':'%s (%s)' % (metodo,caso),'integrador':integrador,\
+                       'T':40,'dt':0.01,'cte':cte}
+            #Solo algunos trabajos tienen figura
+            if metodo=='RK4':
+                trabajo.update({'figura':FIGURAS['C'],'argumentos':{'caso':caso},\
+                                'ruta':str(tmp_path/('%s.png' % caso))})
+            trabajos += [trabajo]
+
+    #Colas de largo 1, para que las etapas se esperen entre sí
+    terminados = ejecutar(trabajos,procesos=2,limite=1)
+    assert sorted(x['nombre'] for x in terminados) == sorted(x['nombre'] for x in trabajos)
+
+    obtenido = {x['nombre']:x for x in terminados}
+    for trabajo in trabajos:
+        x = obtenido[trabajo['nombre']]
+        esperado = _periodo_o_nada(_simular(trabajo['integrador'],40,0.01,trabajo['cte']))
+        assert x['periodo'] == esperado
+        assert 'trayectoria' not in x
+        if 'figura' in trabajo:
+            assert x['ruta'] == trabajo['ruta'] and os.path.exists(x['ruta'])
+        else:
+            assert x['ruta'] is None
+
+    assert obtenido['EP (estable)']['periodo'] is None
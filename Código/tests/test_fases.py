@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+from fases import nulclinas, puntos_fijos
+from integradores import campo
+from runge_kutta import runge_kutta
+
+#Caso 3 (ciclo límite) y un caso con un foco que atrae
+OSCILA = {'k1':8.0,'k2':15.0,'alpha':1.5}
+ATRAE = {'k1':1.0,'k2':2.0,'alpha':1.0}
+
+def _reducido(a,m,cte):
+    return campo(np.array([a,m,1-a-m]),cte)[:2]
+
+@pytest.mark.parametrize('cte',[OSCILA,ATRAE])
+def test_nulclinas(cte):
+
+    n = nulclinas(cte)
+    m = n['m']
+    assert np.allclose(campo(np.stack((n['da'],m,1-n['da']-m)),cte)[0],0,atol=1e-14)
+    assert np.allclose(campo(np.stack((n['dm'],m,1-n['dm']-m)),cte)[1],0,atol=1e-14)
+
+@pytest.mark.parametrize('cte',[OSCILA,ATRAE])
+def test_puntos_fijos(cte):
+
+    puntos = puntos_fijos(cte)
+    assert [(p['a'],p['m']) for p in puntos][:2] == [(1.0,0.0),(0.0,1.0)]
+    assert len(puntos) == 3
+
+    for p in puntos:
+        assert np.allclose(campo(np.array([p['a'],p['m'],p['s']]),cte),0,atol=1e-14)
+
+        #Valores propios del jacobiano reducido con diferencias hacia
+        #adelante (en m=0 no se puede evaluar m**alpha a la izquierda)
+        h = 1e-8
+        J = np.column_stack([(_reducido(p['a']+h*x,p['m']+h*y,cte)-\
+                              _reducido(p['a'],p['m'],cte))/h \
+                             for x,y in ((1,0),(0,1))])
+        esperado = np.sort_complex(np.linalg.eigvals(J))
+        assert np.allclose(np.sort_complex(p['valores']),esperado,atol=1e-5)
+
+def test_tipos_de_puntos_fijos():
+
+    #En a=1, m=0 un valor propio es 0 y en a=0, m=1 hay uno de cada signo
+    tipos = [p['tipo'] for p in puntos_fijos(OSCILA)]
+    assert tipos == ['no hiperbólico','silla','repulsor']
+    assert puntos_fijos(ATRAE)[2]['tipo'] == 'atractor'
+
+    #Las trayectorias llegan al atractor y se alejan del repulsor
+    p = puntos_fijos(ATRAE)[2]
+    t,a,m,s = runge_kutta(200,0.01,dict(ATRAE,a0=0.3,m0=0.3))
+    assert abs(a[-1]-p['a'])+abs(m[-1]-p['m']) < 1e-3
+
+    p = puntos_fijos(OSCILA)[2]
+    t,a,m,s = runge_kutta(50,0.01,dict(OSCILA,a0=p['a']+1e-3,m0=p['m']))
+    assert abs(a[-1]-p['a'])+abs(m[-1]-p['m']) > 1e-2
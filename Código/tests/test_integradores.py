@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+
+import pickle
+import numpy as np
+import pytest
+from analisis import periodo
+from integradores import FallaNumerica, SalidaDensa, euler_progresivo, runge_kutta4, solucion_RKF
+from integradores import cargar_punto_control, reanudar, _paso_RK4
+from integradores import _paso_EP_positivo, _paso_RK4_positivo, _proyectar
+from runge_kutta import runge_kutta
+
+#Casos en que el paso estable dejaba m negativo o complejo
+CASOS = [{'k1':8,'k2':15,'alpha':1.3,'a0':0.4,'m0':0.2},
+         {'k1':10,'k2':10,'alpha':1.0,'a0':0.15,'m0':0.15},
+         {'k1':8,'k2':15,'alpha':1.5,'a0':0.4,'m0':0.3}]
+
+#Caso 3 y el mismo caso con alpha=1.9 (periodo de 10.47 y 3.91)
+PERIODICOS = [CASOS[2],dict(CASOS[2],alpha=1.9)]
+
+@pytest.mark.parametrize('integrador',[euler_progresivo,runge_kutta4])
+@pytest.mark.parametrize('cte',PERIODICOS)
+def test_paso_automatico_preciso(integrador,cte):
+
+    registro = {}
+    solucion = integrador(100,'auto',cte,registro=registro)
+    t,a,m,s = solucion
+    assert solucion.dt == registro['dt'] > 0
+
+    #Periodo de referencia con tolerancias estrictas
+    referencia = solucion_RKF(100,0.001,cte,rtol=1e-10,atol=1e-12)
+    esperado = periodo(referencia[0],referencia[3],refinar='parabola',ciclos=5)
+    obtenido = periodo(t,s,refinar='parabola',ciclos=5)
+    assert abs(obtenido-esperado) < 0.02*esperado
+
+def test_paso_automatico_no_cambia_el_metodo():
+
+    #Sin positivo=True se integra con el paso de siempre
+    cte = PERIODICOS[1]
+    solucion = runge_kutta4(20,'auto',cte)
+    esperado = runge_kutta4(20,solucion.dt,cte)
+    assert all(x == y for x,y in zip(solucion,esperado))
+
+    #Con positivo=True el paso validado es el de las etapas acopladas
+    solucion = runge_kutta4(20,'auto',cte,positivo=True)
+    esperado = runge_kutta4(20,solucion.dt,cte,positivo=True)
+    assert all(x == y for x,y in zip(solucion,esperado))
+
+def test_vigilar_no_detiene_soluciones_sanas():
+
+    #Las etapas por componente de RK4 no conservan a+m+s (deriva ~0.08
+    #y a llega a 1.04)
+    cte = CASOS[2]
+    t,a,m,s = runge_kutta4(100,0.001,cte,vigilar=0.05)
+    assert len(t) == 100001
+
+    registro = {}
+    with pytest.raises(FallaNumerica):
+        runge_kutta4(100,0.001,cte,vigilar=(1e-2,1e-3),registro=registro)
+    assert registro['falla']['motivo'] == 'deriva'
+
+def test_vigilar_masa_fuera_de_rango():
+
+    #Con alpha=1.4 y dt=0.01, RK4 deja a, m o s sobre 1.6 sin fallar
+    registro = {}
+    with pytest.raises(FallaNumerica):
+        runge_kutta4(100,0.01,dict(CASOS[2],alpha=1.4),vigilar=0.05,\
+                     registro=registro)
+    assert registro['falla']['motivo'] == 'fuera'
+    assert max(registro['falla']['estado']) > 1.05
+
+def test_vigilar_diagnostico_del_primer_paso_fallido():
+
+    #Se revisa cada paso, y el estado va con su propio tiempo y paso
+    cte = dict(CASOS[2],alpha=1.4)
+    t,a,m,s = runge_kutta4(100,0.01,cte)
+    y = np.array([a,m,s])
+    i = int(np.argmax((y>1.05).any(axis=0)|(y<-0.05).any(axis=0)))
+
+    registro = {}
+    with pytest.raises(FallaNumerica):
+        runge_kutta4(100,0.01,cte,vigilar=0.05,registro=registro)
+    falla = registro['falla']
+    assert falla['paso'] == i and falla['t'] == t[i]
+    assert falla['estado'] == (a[i],m[i],s[i])
+
+    #Con un complejo, el estado es desde el que falla el paso siguiente
+    registro = {}
+    with pytest.raises(FallaNumerica):
+        runge_kutta4(100,0.1,CASOS[2],vigilar=10.0,registro=registro)
+    falla = registro['falla']
+    assert falla['motivo'] == 'complejo'
+    assert falla['t'] == pytest.approx(falla['paso']*0.1)
+    with pytest.raises(AssertionError):
+        _paso_RK4(0.1,*falla['estado'],CASOS[2])
+
+def test_vigilar_conjunto_complejo():
+
+    #Con arreglos, la base negativa de m**alpha deja nan
+    cte = dict(CASOS[2],alpha=np.array([1.0,1.3]))
+    registro = {}
+    with np.errstate(invalid='ignore'):
+        runge_kutta(100,0.3,cte,tabla='euler',vigilar=0.05,registro=registro)
+    motivos = {x['sistema']:x['motivo'] for x in registro['fallas']}
+    assert motivos[1] == 'complejo'
+
+def test_vigilar_RKF():
+
+    registro = {}
+    solucion_RKF(100,0.01,CASOS[2],vigilar=1e-2)
+    with pytest.raises(FallaNumerica):
+        solucion_RKF(100,0.01,CASOS[0],vigilar=1e-9,registro=registro)
+    assert registro['falla']['metodo'] == 'RKF'
+
+def test_malla_RKF(tmp_path):
+
+    #La misma malla de una vez y por tramos con puntos de control
+    cte = PERIODICOS[1]
+    t,a,m,s = solucion_RKF(10,0.01,cte,rtol=1e-8,atol=1e-10)
+    t2,a2,m2,s2 = solucion_RKF(10,0.01,cte,cada=300,ruta=str(tmp_path/'p.pkl'),\
+                               rtol=1e-8,atol=1e-10)
+
+    assert np.array_equal(t,np.arange(1001)*0.01) and np.array_equal(t,t2)
+    assert np.allclose(s,s2,atol=1e-6)
+
+@pytest.mark.parametrize('integrador',[euler_progresivo,runge_kutta4])
+def test_reanudar_identico(integrador,tmp_path):
+
+    cte = PERIODICOS[1]
+    ruta = str(tmp_path/'punto.pkl')
+    esperado = integrador(20,0.01,cte)
+
+    integrador(10,0.01,cte,cada=300,ruta=ruta)
+    obtenido = reanudar(ruta,20)
+    assert all(x == y for x,y in zip(obtenido,esperado))
+
+def test_diario_de_la_trayectoria(tmp_path):
+
+    cte = PERIODICOS[1]
+    ruta = str(tmp_path/'punto.pkl')
+    euler_progresivo(10,0.01,cte,cada=300,ruta=ruta)
+
+    #Un tramo por punto de control (3 periódicos y el final)
+    with open(ruta+'.tray','rb') as archivo:
+        previo = archivo.read()
+    tramos = []
+    with open(ruta+'.tray','rb') as archivo:
+        while archivo.tell()<len(previo):
+            tramos += [pickle.load(archivo)]
+    assert [x.shape[1] for x in tramos] == [301,300,300,100]
+    assert cargar_punto_control(ruta)['diario']['largo'] == 1001
+
+    #Al reanudar en el mismo archivo solo se agregan valores
+    reanudar(ruta,20,cada=300,ruta=ruta)
+    with open(ruta+'.tray','rb') as archivo:
+        assert archivo.read(len(previo)) == previo
+    t,a,m,s = cargar_punto_control(ruta)['trayectoria']
+    assert np.array_equal(t,euler_progresivo(20,0.01,cte)[0])
+
+def test_reanudar_RKF_misma_malla(tmp_path):
+
+    cte = PERIODICOS[1]
+    ruta = str(tmp_path/'punto.pkl')
+    solucion_RKF(10,0.01,cte,cada=300,ruta=ruta)
+    t,a,m,s = reanudar(ruta,20)
+
+    assert np.array_equal(t,solucion_RKF(20,0.01,cte)[0])
+
+@pytest.mark.parametrize('integrador',[euler_progresivo,runge_kutta4])
+@pytest.mark.parametrize('dt',[0.5,2.0])
+def test_positivo_paso_grande(integrador,dt):
+
+    #Con pasos así sin positivo=True las fracciones salen de [0,1]
+    t,a,m,s = map(np.array,integrador(100,dt,PERIODICOS[1],positivo=True))
+
+    assert min(a.min(),m.min(),s.min()) >= 0
+    assert np.allclose(a+m+s,1,rtol=0,atol=1e-12)
+
+def test_positivo_recurre_a_patankar():
+
+    cte = PERIODICOS[1]
+    estado = (0.05,0.9,0.05)
+
+    #El paso completo de RK4 deja una fracción negativa
+    registro = {}
+    _paso_RK4_positivo(2.0,*estado,cte,registro)
+    assert registro['rechazos'] > 0
+
+    #Tras 20 divisiones se da el paso de Patankar, sin contar rechazos
+    registro = {}
+    obtenido = _paso_RK4_positivo(2.0,*estado,cte,registro,divisiones=20)
+    assert obtenido == _paso_EP_positivo(2.0,*estado,cte)
+    assert registro == {}
+
+@pytest.mark.parametrize('a,m',[(0.3,0.5),(-0.2,0.5),(0.4,-1e-9),(1.3,0.2),
+                                (0.7,0.6),(-0.1,1.4),(2.0,3.0),(0.0,0.0)])
+def test_proyectar_al_simplex(a,m):
+
+    a,m,s = _proyectar(a,m)
+    assert min(a,m,s) >= 0
+    assert abs(a+m+s-1) < 1e-15
+
+@pytest.mark.parametrize('integrador,completo,dt',[(euler_progresivo,euler_progresivo,0.001),
+                                                 (runge_kutta4,runge_kutta,0.01)])
+def test_reducido_igual_a_completo(integrador,completo,dt):
+
+    #RK4 reducido usa las etapas acopladas, como runge_kutta()
+    cte = PERIODICOS[0]
+    esperado = completo(20,dt,cte)
+    obtenido = integrador(20,dt,cte,reducido=True)
+
+    for x,y in zip(obtenido,esperado):
+        assert np.allclose(x,y,rtol=0,atol=1e-12)
+
+@pytest.mark.parametrize('pendientes,orden',[('campo',4),('datos',2)])
+def test_orden_de_la_salida_densa(pendientes,orden):
+
+    #Puntos casi exactos, para medir solo el error del polinomio
+    cte = PERIODICOS[0]
+    t,a,m,s = solucion_RKF(20,0.0125,cte,rtol=1e-13,atol=1e-14)
+    y = np.vstack((a,m,s))
+
+    #Error en la mitad de cada intervalo con dt=0.05 y dt=0.025
+    errores = []
+    for paso in (4,2):
+        denso = SalidaDensa(t[::paso],a[::paso],m[::paso],s[::paso],cte,pendientes)
+        medio = np.arange(paso//2,len(t)-1,paso)
+        errores += [np.max(np.abs(denso(t[medio])-y[:,medio]))]
+
+    assert abs(np.log2(errores[0]/errores[1])-orden) < 0.25
+
+def test_salida_densa_de_orden_1():
+
+    cte = {'k1':8,'k2':15,'alpha':1.3,'a0':0.4,'m0':0.2}
+    registro = {}
+    t,a,m,s = euler_progresivo(100,0.05,cte,positivo=True,denso=True,\
+                               registro=registro)
+
+    #Con las derivadas del sistema aparecen máximos falsos
+    tf,af,mf,sf = SalidaDensa(t,a,m,s,cte,pendientes='campo').malla(0.001)
+    assert periodo(tf,sf) < 0.05
+
+    #Con las pendientes de los puntos se mantiene el periodo de la malla
+    tf,af,mf,sf = registro['denso'].malla(0.001)
+    assert abs(periodo(tf,sf)-periodo(t,s)) < 0.05
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+import os
+import numpy as np
+import pytest
+from mapa import mapa_parametros
+
+#Plano pequeño de alpha y k2 en teselas de 2x2 (la última incompleta)
+CTE = {'k1':8.0,'a0':0.4,'m0':0.3}
+EJE_X = ('alpha',[1.0,1.3,1.5,1.7,1.9])
+EJE_Y = ('k2',[5.0,10.0,15.0])
+
+def _mapa(carpeta,**opciones):
+    return mapa_parametros(str(carpeta),CTE,EJE_X,EJE_Y,T=30,tesela=2,**opciones)
+
+def test_mapa_retomado_igual(tmp_path):
+
+    esperado = _mapa(tmp_path/'completo')
+    assert (esperado['regimen']>=0).all()
+
+    #Se borran dos teselas, como si la corrida se hubiera interrumpido
+    carpeta = tmp_path/'retomado'
+    _mapa(carpeta)
+    os.remove(carpeta/'tesela_0_1.npz')
+    os.remove(carpeta/'tesela_1_2.npz')
+    obtenido = _mapa(carpeta)
+
+    for nombre in ('periodo','amplitud','regimen'):
+        assert np.array_equal(obtenido[nombre],esperado[nombre],equal_nan=True)
+
+def test_mapa_con_otros_datos(tmp_path):
+
+    _mapa(tmp_path)
+    antes = sorted(os.listdir(tmp_path))
+
+    with pytest.raises(ValueError,match='T, dt'):
+        mapa_parametros(str(tmp_path),CTE,EJE_X,EJE_Y,T=40,dt=0.02,tesela=2)
+    assert sorted(os.listdir(tmp_path)) == antes
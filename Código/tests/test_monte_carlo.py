@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+from scipy.stats import norm
+from monte_carlo import muestrear
+
+#Intervalos de k1, k2 y alpha, con a0 y m0 fijos
+DISTRIBUCIONES = {'k1':(6.0,10.0),'k2':(12.0,18.0),'alpha':(1.3,1.9),
+                  'a0':0.4,'m0':0.3}
+
+@pytest.mark.parametrize('muestreo,n',[('lhs',50),('sobol',64)])
+def test_muestras_forma_y_limites(muestreo,n):
+
+    cte = muestrear(DISTRIBUCIONES,n,muestreo,semilla=1)
+    assert cte['a0'] == 0.4 and cte['m0'] == 0.3
+
+    for x in ('k1','k2','alpha'):
+        minimo,maximo = DISTRIBUCIONES[x]
+        assert cte[x].shape == (n,)
+        assert minimo <= cte[x].min() and cte[x].max() <= maximo
+
+        #Con hipercubo latino hay una muestra en cada uno de los n tramos
+        if muestreo=='lhs':
+            tramos = np.floor((cte[x]-minimo)/(maximo-minimo)*n).astype(int)
+            assert sorted(tramos) == list(range(n))
+
+def test_muestras_listas_y_distribuciones():
+
+    #Una lista se toma igual que una tupla (como al leer un JSON)
+    listas = dict(DISTRIBUCIONES,k1=[6.0,10.0])
+    cte = muestrear(listas,32,semilla=2)
+    esperado = muestrear(DISTRIBUCIONES,32,semilla=2)
+    assert all(np.array_equal(cte[x],esperado[x]) for x in cte)
+
+    cte = muestrear(dict(DISTRIBUCIONES,alpha=norm(1.5,0.05)),32,semilla=2)
+    assert np.isfinite(cte['alpha']).all()
+
+@pytest.mark.parametrize('distribucion',[[6.0,8.0,10.0],(10.0,6.0),'uniforme'])
+def test_muestras_distribucion_invalida(distribucion):
+
+    with pytest.raises(AssertionError):
+        muestrear(dict(DISTRIBUCIONES,k1=distribucion),8)
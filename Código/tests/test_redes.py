@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+from adams import adams_bashforth_moulton
+from integradores import solucion_RKF
+from redes import MODELO, Red, solucion_red
+
+CTE = {'k1':8.0,'k2':15.0,'alpha':1.5,'a0':0.4,'m0':0.3}
+
+def test_adams_con_red():
+
+    esperado = adams_bashforth_moulton(10,0.01,CTE)
+    obtenido = adams_bashforth_moulton(10,0.01,CTE,red=Red(MODELO))
+
+    for x,y in zip(esperado,obtenido):
+        assert np.array_equal(x,y)
+
+def test_solucion_red():
+
+    t,a,m,s = solucion_red(Red(MODELO),10,0.01,CTE,metodo='Radau')
+
+    #Múltiplos de dt entre 0 y T
+    assert len(t) == 1001 and t[-1] == 10.0
+    assert np.allclose(t,np.arange(1001)*0.01)
+
+    #Misma solución que el modelo de tres fases
+    referencia = solucion_RKF(10,0.01,CTE,metodo='Radau',rtol=1e-8,atol=1e-10)
+    t,a,m,s = solucion_red(Red(MODELO),10,0.01,CTE,metodo='Radau',\
+                           rtol=1e-8,atol=1e-10)
+    assert np.allclose(s[-1],referencia[3][-1],atol=1e-6)
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+from runge_kutta import TABLAS, runge_kutta
+
+def test_desviacion_float32():
+
+    cte = {'k1':8.0,'k2':15.0,'alpha':np.array([1.5,1.6,1.7]),\
+           'a0':0.4,'m0':0.3}
+    registro = {}
+    runge_kutta(100,0.01,cte,precision='float32',registro=registro)
+
+    #Con los máximos refinados la desviación no queda limitada a la malla
+    assert 0 < registro['desviacion'] < 1e-5
+
+@pytest.mark.parametrize('nombre,orden',[('euler',1),('heun',2),('ralston',2),
+                                         ('rk3',3),('rk4',4),('rk38',4),('rk6',6)])
+def test_orden_de_las_tablas(nombre,orden):
+
+    cte = {'k1':8.0,'k2':15.0,'alpha':1.5,'a0':0.4,'m0':0.3}
+    assert TABLAS[nombre]['orden'] == orden
+
+    #Estado final con dt, dt/2 y dt/4
+    finales = [np.array([x[-1] for x in runge_kutta(2,dt,cte,tabla=nombre)[1:]]) \
+               for dt in (0.04,0.02,0.01)]
+
+    #Orden observado sin solución de referencia
+    observado = np.log2(np.max(np.abs(finales[0]-finales[1]))/\
+                        np.max(np.abs(finales[1]-finales[2])))
+    assert abs(observado-orden) < 0.3
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+from sensibilidad import PARAMETROS, sensibilidad
+
+#Caso 3 y tolerancias con las que las diferencias finitas sirven
+CTE = {'k1':8.0,'k2':15.0,'alpha':1.5,'a0':0.4,'m0':0.3}
+TOLERANCIAS = {'rtol':1e-12,'atol':1e-14}
+
+def _diferencia_central(funcion,x,h):
+
+    return (funcion(dict(CTE,**{x:CTE[x]+h}))-funcion(dict(CTE,**{x:CTE[x]-h})))/(2*h)
+
+def test_sensibilidad_del_estado():
+
+    S = sensibilidad(5,CTE,dt=0.5,**TOLERANCIAS)['S'][:,:,-1]
+
+    for j,x in enumerate(PARAMETROS):
+        esperado = _diferencia_central(lambda c: sensibilidad(5,c,dt=0.5,\
+                   **TOLERANCIAS)['estado'][:,-1],x,1e-5*CTE[x])
+        assert np.allclose(S[:,j],esperado,rtol=1e-7,atol=1e-7*np.abs(esperado).max())
+
+def test_sensibilidad_del_periodo():
+
+    dperiodo = sensibilidad(40,CTE,**TOLERANCIAS)['dperiodo']
+
+    for x in PARAMETROS:
+        esperado = _diferencia_central(lambda c: sensibilidad(40,c,\
+                   **TOLERANCIAS)['periodo'],x,1e-5*CTE[x])
+        assert abs(dperiodo[x]/esperado-1) < 1e-7